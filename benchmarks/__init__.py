@@ -0,0 +1,3 @@
+"""
+Benchmark suite for flopy_owhm_interface; see run_benchmarks.py.
+"""
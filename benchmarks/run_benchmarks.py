@@ -0,0 +1,251 @@
+"""
+Benchmark runner for the OWHM package writers and output parsers.
+Generates a synthetic model (see synthetic_model.py), times every writer, write_input_files,
+every parser, read_outputs and reading one layer of a binary head file, and records wall time, peak traced memory and bytes/sec.
+Also times importing the package in a fresh interpreter, which short-lived workers pay on every start.
+Results are saved as JSON; compared against a baseline JSON from another commit,
+slower or more memory-hungry cases are reported as regressions.
+
+Usage:
+    python -m benchmarks.run_benchmarks --size small --output results.json
+    python -m benchmarks.run_benchmarks --size small --baseline results.json --output new.json
+"""
+import argparse
+import datetime
+import fnmatch
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import numpy as np
+import pandas as pd
+from flopy_owhm_interface.owhm_interface import OWHMInterface
+from flopy_owhm_interface.registry import OUTPUT_PARSERS
+from flopy_owhm_interface.validation import GridBounds
+from flopy_owhm_interface.binary_outputs import HeadFile
+from .synthetic_model import SIZES, ModelSize, make_model, write_heads, write_outputs
+
+# Default relative slowdown / memory growth reported as a regression
+TIME_THRESHOLD = 0.25
+MEMORY_THRESHOLD = 0.25
+# Cases faster than this in both runs are too noisy to compare
+MIN_SECONDS = 0.005
+
+# (case name, statement) of the import-time cases, each run in a fresh interpreter
+IMPORT_CASES = [
+    ('import:package', 'import flopy_owhm_interface'),
+    ('import:OWHMInterface', 'from flopy_owhm_interface import OWHMInterface'),
+]
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def measure(func, repeat=3):
+    """
+    Run func repeat times and return (best wall time in seconds, peak traced memory in bytes).
+    Memory is measured in one extra run under tracemalloc, so tracing does not slow the timed runs.
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return best, peak
+
+def measure_import(statement, repeat=3):
+    """
+    Return the best wall time in seconds of running statement in a fresh interpreter,
+    less the best time of starting an interpreter that runs nothing.
+    """
+    def best(code):
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            subprocess.run([sys.executable, '-c', code], cwd=_ROOT, check=True)
+            times.append(time.perf_counter() - start)
+        return min(times)
+    return max(0.0, best(statement) - best('pass'))
+
+def _result(seconds, peak, nbytes):
+    return {
+        'seconds': seconds,
+        'peak_bytes': peak,
+        'bytes': nbytes,
+        'bytes_per_sec': nbytes / seconds if seconds > 0 else None,
+    }
+
+def _tree_size(path):
+    return sum(os.path.getsize(os.path.join(root, name)) for root, _, names in os.walk(path) for name in names)
+
+def _selected(name, patterns):
+    return not patterns or any(fnmatch.fnmatch(name, pattern) for pattern in patterns)
+
+def run_benchmarks(size='small', columnar=False, repeat=3, patterns=None, workspace=None):
+    """
+    Run every benchmark case on a synthetic model and return the results dict.
+    size: a ModelSize or the name of one of synthetic_model.SIZES.
+    columnar: if True, list-based boundary periods are NumPy structured arrays.
+    patterns: optional fnmatch patterns of case names to run, e.g. ['write:GHB', 'parse:*'].
+    workspace: directory to write files to (default: a temporary directory).
+    Case names are 'import:<name>' (see IMPORT_CASES), 'write:<PKG>', 'write_input_files', 'parse:<key>',
+    'read_outputs' and 'read:heads-layer' (open, index and sum the last layer of the last period of a head file;
+    its bytes are those of the layer). Import cases have no memory or byte counts.
+    """
+    if isinstance(size, str):
+        size = SIZES[size]
+    if workspace is None:
+        with tempfile.TemporaryDirectory() as tmp:
+            return run_benchmarks(size, columnar, repeat, patterns, tmp)
+    model, water_accounting = make_model(size, columnar=columnar)
+    interface = OWHMInterface(owhm_exe_path='owhm')
+    interface.logger.disabled = True
+    results = {}
+    for name, statement in IMPORT_CASES:
+        if _selected(name, patterns):
+            results[name] = _result(measure_import(statement, repeat), 0, 0)
+
+    input_dir = os.path.join(workspace, 'input')
+    os.makedirs(input_dir, exist_ok=True)
+    grid = GridBounds.from_model(model)
+    for label, output_path, writer, args, kwargs in interface._collect_write_jobs(
+            model, input_dir, water_accounting, grid):
+        name = f'write:{label.upper()}'
+        if _selected(name, patterns):
+            seconds, peak = measure(lambda: writer(*args, **kwargs), repeat)
+            results[name] = _result(seconds, peak, os.path.getsize(output_path))
+    if _selected('write_input_files', patterns):
+        full_dir = os.path.join(workspace, 'full')
+        os.makedirs(full_dir, exist_ok=True)
+        seconds, peak = measure(lambda: interface.write_input_files(model, full_dir, water_accounting), repeat)
+        results['write_input_files'] = _result(seconds, peak, _tree_size(full_dir))
+
+    output_dir = os.path.join(workspace, 'output')
+    os.makedirs(output_dir, exist_ok=True)
+    if any(_selected(f'parse:{key}', patterns) for key, _, _, _ in OUTPUT_PARSERS) or \
+            _selected('read_outputs', patterns):
+        paths = write_outputs(output_dir, size)
+        for key, _, parser, _ in OUTPUT_PARSERS:
+            name = f'parse:{key}'
+            if _selected(name, patterns):
+                seconds, peak = measure(lambda: parser(paths[key]), repeat)
+                results[name] = _result(seconds, peak, os.path.getsize(paths[key]))
+        if _selected('read_outputs', patterns):
+            seconds, peak = measure(lambda: interface.read_outputs(output_dir), repeat)
+            results['read_outputs'] = _result(seconds, peak, _tree_size(output_dir))
+    if _selected('read:heads-layer', patterns):
+        heads_path = write_heads(output_dir, size)
+
+        def read_layer():
+            with HeadFile(heads_path) as heads:
+                return float(heads.get_data(layer=size.nlay).sum())
+        seconds, peak = measure(read_layer, repeat)
+        results['read:heads-layer'] = _result(seconds, peak, size.nrow * size.ncol * 4)
+    return results
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def make_report(results, size, columnar, repeat):
+    """
+    Wrap benchmark results with the environment and model parameters they were measured with.
+    """
+    if isinstance(size, str):
+        size = SIZES[size]
+    return {
+        'created': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+        'commit': _git_commit(),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'platform': platform.platform(),
+        'size': size.to_dict(),
+        'columnar': columnar,
+        'repeat': repeat,
+        'results': results,
+    }
+
+def compare(baseline, current, time_threshold=TIME_THRESHOLD, memory_threshold=MEMORY_THRESHOLD,
+            min_seconds=MIN_SECONDS):
+    """
+    Compare two reports and return a list of regression messages.
+    A case regresses if it is more than time_threshold slower or uses more than memory_threshold
+    more peak memory than in baseline. Cases faster than min_seconds in both runs are not timed against
+    each other. Reports measured with different model parameters are not comparable (ValueError).
+    """
+    if baseline.get('size') != current.get('size') or baseline.get('columnar') != current.get('columnar'):
+        raise ValueError("Baseline was measured on a different synthetic model; rerun it with the same size.")
+    regressions = []
+    for name, new in current['results'].items():
+        old = baseline['results'].get(name)
+        if old is None:
+            continue
+        if max(old['seconds'], new['seconds']) >= min_seconds and \
+                new['seconds'] > old['seconds'] * (1 + time_threshold):
+            regressions.append(f"{name}: {old['seconds']:.4f}s -> {new['seconds']:.4f}s "
+                               f"({new['seconds'] / old['seconds'] - 1:+.0%})")
+        if old['peak_bytes'] and new['peak_bytes'] > old['peak_bytes'] * (1 + memory_threshold):
+            regressions.append(f"{name}: peak memory {old['peak_bytes']} -> {new['peak_bytes']} bytes "
+                               f"({new['peak_bytes'] / old['peak_bytes'] - 1:+.0%})")
+    return regressions
+
+def format_results(results):
+    """
+    Return the results as a fixed-width text table.
+    """
+    lines = [f"{'case':<24} {'seconds':>10} {'peak MiB':>10} {'MiB/s':>10}"]
+    for name, result in results.items():
+        rate = result['bytes_per_sec']
+        lines.append(f"{name:<24} {result['seconds']:>10.4f} {result['peak_bytes'] / 2**20:>10.2f} "
+                     f"{(rate or 0) / 2**20:>10.2f}")
+    return '\n'.join(lines)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--size', default='small', choices=sorted(SIZES), help='synthetic model preset')
+    for field in ('nlay', 'nrow', 'ncol', 'nper', 'nfarms', 'nreaches', 'nwells', 'output_rows', 'seed'):
+        parser.add_argument(f'--{field}', type=int, help=f'override {field} of the preset')
+    parser.add_argument('--boundary-fraction', type=float, help='override boundary_fraction of the preset')
+    parser.add_argument('--columnar', action='store_true', help='give boundary periods as structured arrays')
+    parser.add_argument('--repeat', type=int, default=3, help='timed runs per case; the best is kept')
+    parser.add_argument('--only', action='append', help='fnmatch pattern of cases to run (repeatable)')
+    parser.add_argument('--output', help='JSON file to save the results to')
+    parser.add_argument('--baseline', help='JSON results of an earlier run to compare against')
+    parser.add_argument('--time-threshold', type=float, default=TIME_THRESHOLD)
+    parser.add_argument('--memory-threshold', type=float, default=MEMORY_THRESHOLD)
+    args = parser.parse_args(argv)
+
+    overrides = {field: getattr(args, field) for field in ModelSize.__dataclass_fields__
+                 if getattr(args, field, None) is not None}
+    size = ModelSize(**{**SIZES[args.size].to_dict(), **overrides})
+    results = run_benchmarks(size, args.columnar, args.repeat, args.only)
+    report = make_report(results, size, args.columnar, args.repeat)
+    print(format_results(results))
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(baseline, report, args.time_threshold, args.memory_threshold)
+        for message in regressions:
+            print(f'REGRESSION {message}')
+        if regressions:
+            return 1
+        print(f"No regressions against {baseline.get('commit') or args.baseline}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
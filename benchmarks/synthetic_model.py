@@ -0,0 +1,230 @@
+"""
+Synthetic OWHM model generator for benchmarks.
+Builds a FloPy-like model object whose packages scale with the grid size, number
+of stress periods, farms, reaches and wells, and matching OWHM output files.
+Generation is seeded, so the same parameters always give the same model.
+"""
+import os
+import random
+from dataclasses import asdict, dataclass
+import numpy as np
+
+@dataclass
+class ModelSize:
+    """
+    Parameters of a synthetic model.
+    boundary_fraction: fraction of the cells of layer 1 holding a GHB, CHD, RIV, DRN, DRT, ETS or RES boundary.
+    output_rows: number of rows of each synthetic output CSV.
+    """
+    nlay: int = 3
+    nrow: int = 100
+    ncol: int = 100
+    nper: int = 12
+    nfarms: int = 50
+    nreaches: int = 1000
+    nwells: int = 200
+    boundary_fraction: float = 0.05
+    output_rows: int = 100000
+    seed: int = 0
+
+    def to_dict(self):
+        return asdict(self)
+
+# Named presets for the benchmark runner
+SIZES = {
+    'tiny': ModelSize(nlay=1, nrow=10, ncol=10, nper=2, nfarms=3, nreaches=10, nwells=5, output_rows=100),
+    'small': ModelSize(),
+    'medium': ModelSize(nlay=5, nrow=250, ncol=250, nper=24, nfarms=200, nreaches=5000, nwells=1000,
+                        output_rows=1000000),
+    'large': ModelSize(nlay=10, nrow=500, ncol=500, nper=60, nfarms=1000, nreaches=20000, nwells=5000,
+                       output_rows=5000000),
+}
+
+# Boundary packages whose writers accept structured-array periods
+COLUMNAR_PACKAGES = ('ghb', 'chd', 'riv', 'drn', 'drt', 'ets')
+
+class SyntheticPackage:
+    """
+    Plain attribute holder standing in for a FloPy package.
+    """
+    def __init__(self, **attrs):
+        self.__dict__.update(attrs)
+
+class SyntheticModel:
+    """
+    Plain attribute holder standing in for a FloPy model; each package is an attribute.
+    """
+    def __init__(self, size):
+        self.size = size
+
+def _cells(rng, size, count):
+    """
+    Return count distinct 1-based (layer, row, col) cells of layer 1.
+    """
+    count = min(count, size.nrow * size.ncol)
+    flat = rng.sample(range(size.nrow * size.ncol), count)
+    return [(1, idx // size.ncol + 1, idx % size.ncol + 1) for idx in sorted(flat)]
+
+def _boundary_periods(rng, size, cells, fields, columnar):
+    """
+    Build stress_period_data for a list-based boundary package.
+    fields: (name, low, high) of the value fields, drawn uniformly per cell and period.
+    columnar: if True, each period is a NumPy structured array instead of a list of dicts.
+    """
+    periods = {}
+    for per in range(size.nper):
+        rows = [(k, i, j) + tuple(round(rng.uniform(low, high), 4) for _, low, high in fields)
+                for k, i, j in cells]
+        if columnar:
+            dtype = [('k', 'i4'), ('i', 'i4'), ('j', 'i4')] + [(name, 'f8') for name, _, _ in fields]
+            periods[per] = np.array(rows, dtype=dtype)
+        else:
+            names = ('k', 'i', 'j') + tuple(name for name, _, _ in fields)
+            periods[per] = [dict(zip(names, row)) for row in rows]
+    return periods
+
+def _grid_periods(np_rng, size, low, high):
+    """
+    Return one dense (nrow, ncol) float array per stress period.
+    """
+    return {per: np_rng.uniform(low, high, (size.nrow, size.ncol)) for per in range(size.nper)}
+
+def make_model(size=None, columnar=False):
+    """
+    Build a synthetic model with DIS, BAS6, FMP, MAW, SFR, SWR, LAK, RES, GHB, CHD, RIV, DRN, DRT,
+    ETS, MNW2, RCH, EVT and UZF packages, plus matching water accounting data.
+    size: a ModelSize, or the name of one of SIZES (default 'small').
+    columnar: if True, the periods of COLUMNAR_PACKAGES are NumPy structured arrays instead of lists of dicts.
+    Returns (model, water_accounting).
+    """
+    if size is None or isinstance(size, str):
+        size = SIZES[size or 'small']
+    rng = random.Random(size.seed)
+    np_rng = np.random.default_rng(size.seed)
+    model = SyntheticModel(size)
+    model.dis = SyntheticPackage(nlay=size.nlay, nrow=size.nrow, ncol=size.ncol)
+    model.bas6 = SyntheticPackage(ibound=np.ones((size.nlay, size.nrow, size.ncol), dtype=np.int32))
+
+    farm_ids = list(range(1, size.nfarms + 1))
+    well_cells = _cells(rng, size, size.nwells)
+    wells_by_farm = {farm_id: [] for farm_id in farm_ids}
+    for n, (k, i, j) in enumerate(well_cells):
+        wells_by_farm[farm_ids[n % len(farm_ids)]].append({'well_id': n + 1, 'layer': k, 'row': i, 'col': j})
+    model.fmp = SyntheticPackage(
+        farm_dict={farm_id: {'area': round(rng.uniform(10.0, 1000.0), 2), 'name': f'Farm{farm_id}'}
+                   for farm_id in farm_ids},
+        stress_period_data={per: {farm_id: round(rng.uniform(0.0, 50.0), 3) for farm_id in farm_ids}
+                            for per in range(size.nper)},
+        crop_data={1: {'name': 'Alfalfa', 'et': 1.2, 'root_depth': 1.5},
+                   2: {'name': 'Corn', 'et': 0.9, 'root_depth': 1.0}},
+        well_data=wells_by_farm,
+    )
+
+    model.maw = SyntheticPackage(
+        well_info={n + 1: {'layer': k, 'row': i, 'col': j, 'screen_top': 50.0, 'screen_bottom': 10.0,
+                           'diameter': 0.3} for n, (k, i, j) in enumerate(well_cells)},
+        stress_period_data={per: {n + 1: {'rate': round(rng.uniform(-500.0, 0.0), 2), 'status': 'ACTIVE'}
+                                  for n in range(len(well_cells))} for per in range(size.nper)},
+    )
+
+    # Streams are chains of 10 reaches per segment, each segment flowing into the next
+    reach_cells = _cells(rng, size, size.nreaches)
+    nsegments = max(1, (len(reach_cells) + 9) // 10)
+    model.sfr = SyntheticPackage(
+        segments={seg: {'upstream': seg - 1 if seg > 1 else -1, 'downstream': seg + 1 if seg < nsegments else -1,
+                        'length': 1000.0} for seg in range(1, nsegments + 1)},
+        reaches={n + 1: {'segment': n // 10 + 1, 'layer': k, 'row': i, 'col': j, 'length': 100.0}
+                 for n, (k, i, j) in enumerate(reach_cells)},
+    )
+    model.swr = SyntheticPackage(
+        reaches={n + 1: {'layer': k, 'row': i, 'col': j, 'length': 100.0} for n, (k, i, j) in enumerate(reach_cells)},
+        connections=[{'reach1': n, 'reach2': n + 1, 'type': 1} for n in range(1, len(reach_cells))],
+    )
+    lake_cells = _cells(rng, size, max(1, size.nreaches // 100))
+    model.lak = SyntheticPackage(
+        lakes={n + 1: {'layer': k, 'row': i, 'col': j, 'area': 5000.0} for n, (k, i, j) in enumerate(lake_cells)},
+        outlets=[{'lake_id': n + 1, 'outlet_id': n + 1, 'type': 'SPILLWAY'} for n in range(len(lake_cells))],
+    )
+
+    nboundary = max(1, int(size.boundary_fraction * size.nrow * size.ncol))
+    boundaries = {
+        'ghb': (('bhead', 90.0, 110.0), ('cond', 100.0, 1000.0)),
+        'chd': (('shead', 90.0, 110.0), ('ehead', 90.0, 110.0)),
+        'riv': (('stage', 95.0, 105.0), ('cond', 100.0, 1000.0), ('rbot', 85.0, 95.0)),
+        'drn': (('elevation', 80.0, 100.0), ('conductance', 10.0, 100.0)),
+        'drt': (('elev', 80.0, 100.0), ('cond', 10.0, 100.0), ('return_fraction', 0.0, 1.0)),
+        'ets': (('surf', 95.0, 105.0), ('pxdp', 1.0, 5.0), ('petm', 0.1, 1.0), ('pet', 0.001, 0.01)),
+        'res': (('stage', 95.0, 105.0), ('area', 100.0, 10000.0)),
+    }
+    for attr, fields in boundaries.items():
+        cells = _cells(rng, size, nboundary)
+        setattr(model, attr, SyntheticPackage(
+            stress_period_data=_boundary_periods(rng, size, cells, fields, columnar and attr in COLUMNAR_PACKAGES)))
+    model.mnw2 = SyntheticPackage(stress_period_data={
+        per: [{'wellid': f'W{n + 1}', 'k': k, 'i': i, 'j': j, 'qdes': round(rng.uniform(-500.0, 0.0), 2)}
+              for n, (k, i, j) in enumerate(well_cells)] for per in range(size.nper)})
+
+    model.rch = SyntheticPackage(stress_period_data=_grid_periods(np_rng, size, 0.0, 0.01))
+    model.evt = SyntheticPackage(stress_period_data={
+        per: {'surf': 100.0, 'evtr': evtr} for per, evtr in _grid_periods(np_rng, size, 0.0, 0.005).items()})
+    model.uzf = SyntheticPackage(stress_period_data=_grid_periods(np_rng, size, 0.0, 0.01))
+
+    water_accounting = {
+        'FARM': [{'object_id': farm_id, 'period': per, 'value': round(rng.uniform(0.0, 100.0), 3)}
+                 for per in range(size.nper) for farm_id in farm_ids],
+    }
+    return model, water_accounting
+
+# (file name, header columns) of every synthetic output, matching OWHMInterface.read_outputs
+OUTPUT_FILES = {
+    'fmp': ('FMPWB.CSV', ('PER', 'STP', 'FARM', 'DEMAND', 'SUPPLY', 'DEFICIT')),
+    'maw': ('MAW.CSV', ('PER', 'STP', 'WELL', 'RATE', 'HEAD')),
+    'sfr': ('SFR.CSV', ('PER', 'STP', 'REACH', 'FLOW_IN', 'FLOW_OUT', 'STAGE')),
+    'swr': ('SWR.CSV', ('PER', 'STP', 'REACH', 'STAGE', 'FLOW')),
+    'lak': ('LAK.CSV', ('PER', 'STP', 'LAKE', 'STAGE', 'VOLUME')),
+    'drn': ('DRN.CSV', ('PER', 'STP', 'CELL', 'FLOW')),
+    'res': ('RES.CSV', ('PER', 'STP', 'RES', 'STAGE', 'STORAGE')),
+    'accounting': ('ACCOUNTING.CSV', ('PER', 'STP', 'OBJECT', 'VALUE')),
+}
+
+def write_outputs(workspace, size=None):
+    """
+    Write synthetic OWHM output CSVs (see OUTPUT_FILES) of size.output_rows rows each to workspace.
+    Returns a dict mapping each output key to its file path.
+    """
+    if size is None or isinstance(size, str):
+        size = SIZES[size or 'small']
+    np_rng = np.random.default_rng(size.seed)
+    paths = {}
+    for key, (filename, columns) in OUTPUT_FILES.items():
+        path = os.path.join(workspace, filename)
+        nvalues = len(columns) - 3
+        index = np.arange(size.output_rows)
+        table = np.column_stack([index // 1000 + 1, index % 10 + 1, index % 1000 + 1,
+                                 np_rng.uniform(0.0, 1000.0, (size.output_rows, nvalues))])
+        with open(path, 'w') as f:
+            f.write(f'# Synthetic {key.upper()} output\n')
+            f.write(','.join(columns) + '\n')
+            np.savetxt(f, table, fmt=['%d'] * 3 + ['%.6g'] * nvalues, delimiter=',')
+        paths[key] = path
+    return paths
+
+def write_heads(workspace, size=None, filename='HEADS.HDS'):
+    """
+    Write a synthetic single-precision MF-OWHM binary head file with one record per layer,
+    one time step per stress period, to workspace. Returns its path.
+    """
+    if size is None or isinstance(size, str):
+        size = SIZES[size or 'small']
+    np_rng = np.random.default_rng(size.seed)
+    path = os.path.join(workspace, filename)
+    layer_heads = np_rng.uniform(0.0, 100.0, (size.nrow, size.ncol)).astype('<f4')
+    with open(path, 'wb') as f:
+        for kper in range(1, size.nper + 1):
+            for k in range(1, size.nlay + 1):
+                f.write(np.array([1, kper], '<i4').tobytes())
+                f.write(np.array([1.0, float(kper)], '<f4').tobytes())
+                f.write(b'            HEAD')
+                f.write(np.array([size.ncol, size.nrow, k], '<i4').tobytes())
+                f.write((layer_heads - k).tobytes())
+    return path
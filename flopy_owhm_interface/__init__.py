@@ -1,3 +1,8 @@
-from .owhm_interface import OWHMInterface
+__all__ = ["OWHMInterface"]
 
-__all__ = ["OWHMInterface"] 
\ No newline at end of file
+def __getattr__(name):
+    # Import the interface on first use, so importing the package stays cheap
+    if name == "OWHMInterface":
+        from .owhm_interface import OWHMInterface
+        return OWHMInterface
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -3,16 +3,18 @@ ADV input file writer for OWHM.
 Extracts advection data from a FloPy ADV package if possible.
 Performs input validation and provides clear error messages.
 """
+from .package_file import PackageFile
 
 def _require_field(obj, field, context):
     if field not in obj:
         raise ValueError(f"Missing required field '{field}' in {context}.")
     return obj[field]
 
-def write_adv_input(adv_package, output_path):
+def write_adv_input(adv_package, output_path, float_precision=None):
     """
     Convert a FloPy ADV package object to an OWHM-compatible ADV input file.
     Performs input validation and provides clear error messages.
+    float_precision: significant digits for float values; None writes them as str() does.
     """
     advs = getattr(adv_package, 'parameters', None)
     if advs is None:
@@ -31,11 +33,8 @@ def write_adv_input(adv_package, output_path):
     if not isinstance(nadvfd, int):
         raise ValueError(f"nadvfd must be an integer in ADV parameters. Got: {nadvfd}")
 
-    with open(output_path, 'w') as f:
-        f.write('# OWHM ADV Input File (auto-generated)\n')
+    with PackageFile(output_path, 'ADV', float_precision) as f:
         # ADV block
-        f.write('BEGIN ADV\n')
-        f.write('  # MIXELM   PERCEL   NADVFD\n')
-        f.write(f'  {mixelm}   {percel}   {nadvfd}\n')
-        f.write('END ADV\n\n')
+        with f.block('ADV', 'MIXELM   PERCEL   NADVFD'):
+            f.rows([(mixelm, percel, nadvfd)])
         # TODO: Add more ADV blocks as needed (with validation) 
\ No newline at end of file
@@ -0,0 +1,128 @@
+"""
+Ensemble / batch runner for OWHM.
+Writes, runs and parses many MF-OWHM realizations, each in its own workspace,
+across a pool of local worker processes.
+"""
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+import pandas as pd
+
+CONSOLE_LOG_NAME = 'owhm_console.log'
+
+def _require_field(obj, field, context):
+    if field not in obj:
+        raise ValueError(f"Missing required field '{field}' in {context}.")
+    return obj[field]
+
+def _status_record(realization: dict, error: Optional[BaseException] = None) -> dict:
+    """
+    Return a new 'failed' status record for a realization, with error as its message if given.
+    """
+    return {'name': realization['name'], 'workspace': realization['workspace'], 'status': 'failed',
+            'attempts': 0, 'seconds': 0.0, 'error': None if error is None else f"{type(error).__name__}: {error}",
+            'outputs': None}
+
+def _run_realization(owhm_exe_path: str, realization: dict, retries: int, read_outputs: bool) -> dict:
+    """
+    Write, run and parse one realization. Runs in a worker process.
+    Returns a status record; parsed outputs are included under 'outputs'.
+    """
+    from .owhm_interface import OWHMInterface
+
+    name = realization['name']
+    workspace = realization['workspace']
+    record = _status_record(realization)
+    start = time.perf_counter()
+    interface = OWHMInterface(owhm_exe_path)
+    try:
+        os.makedirs(workspace, exist_ok=True)
+        flopy_model = realization.get('flopy_model')
+        if flopy_model is not None:
+            interface.write_input_files(flopy_model, workspace=workspace,
+                                        water_accounting=realization.get('water_accounting'))
+        for attempt in range(1, retries + 2):
+            record['attempts'] = attempt
+            try:
+                # Console output goes to a per-realization log file rather than the shared logger
+                interface.run_model(workspace=workspace, line_callback=lambda line, stream: None,
+                                    log_file=os.path.join(workspace, CONSOLE_LOG_NAME))
+                break
+            except Exception as e:
+                record['error'] = f"{type(e).__name__}: {e}"
+                if attempt > retries:
+                    raise
+                interface.logger.warning(f"Realization {name} failed (attempt {attempt}); retrying.")
+        record['error'] = None
+        if read_outputs:
+            record['outputs'] = interface.read_outputs(workspace=workspace)
+        record['status'] = 'ok'
+    except Exception as e:
+        record['error'] = f"{type(e).__name__}: {e}"
+    record['seconds'] = time.perf_counter() - start
+    return record
+
+def run_ensemble(owhm_exe_path: str, realizations: List[dict], max_workers: Optional[int] = None,
+                 retries: int = 1, read_outputs: bool = True,
+                 executor: Optional[Executor] = None) -> Tuple[pd.DataFrame, Dict[str, pd.DataFrame]]:
+    """
+    Run many MF-OWHM realizations concurrently in local worker processes.
+    realizations: list of dicts with 'name' and 'workspace', and optionally 'flopy_model'
+        (written with write_input_files before the run) and 'water_accounting'.
+    max_workers: number of worker processes; capped at the number of available cores.
+    retries: how many times a failed model run is retried before the realization is marked failed.
+    read_outputs: if True, parse each realization's outputs with read_outputs and aggregate them.
+    executor: optional concurrent.futures executor to use instead of a new process pool; it is not shut down.
+    Returns (status, outputs): a DataFrame with one row per realization (name, workspace, status,
+    attempts, seconds, error), and a dict of output DataFrames concatenated across realizations
+    with a leading 'realization' column.
+    """
+    names = set()
+    for idx, realization in enumerate(realizations):
+        name = _require_field(realization, 'name', f'realizations[{idx}]')
+        _require_field(realization, 'workspace', f'realizations[{idx}]')
+        if name in names:
+            raise ValueError(f"Duplicate realization name {name} in realizations[{idx}].")
+        names.add(name)
+    if not (isinstance(retries, int) and retries >= 0):
+        raise ValueError(f"retries must be a non-negative integer. Got: {retries}")
+
+    records = []
+    if realizations:
+        own_executor = executor is None
+        if own_executor:
+            cores = os.cpu_count() or 1
+            workers = min(max_workers or cores, cores, len(realizations))
+            executor = ProcessPoolExecutor(max_workers=workers)
+        try:
+            futures = []
+            for realization in realizations:
+                try:
+                    futures.append(executor.submit(_run_realization, owhm_exe_path, realization, retries,
+                                                   read_outputs))
+                except Exception as e:
+                    futures.append(e)
+            for realization, future in zip(realizations, futures):
+                # A crashed worker (BrokenProcessPool), or a realization that cannot be sent to one,
+                # fails only its own realizations
+                try:
+                    if isinstance(future, Exception):
+                        raise future
+                    records.append(future.result())
+                except Exception as e:
+                    records.append(_status_record(realization, e))
+        finally:
+            if own_executor:
+                executor.shutdown()
+
+    outputs = {}
+    for record in records:
+        for key, df in (record.pop('outputs') or {}).items():
+            if df is not None:
+                outputs.setdefault(key, []).append(df.assign(realization=record['name']))
+    outputs = {key: pd.concat(frames, ignore_index=True) for key, frames in outputs.items()}
+    for key, df in outputs.items():
+        outputs[key] = df[['realization'] + [col for col in df.columns if col != 'realization']]
+    status = pd.DataFrame(records, columns=['name', 'workspace', 'status', 'attempts', 'seconds', 'error'])
+    return status, outputs
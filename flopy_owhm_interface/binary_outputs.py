@@ -0,0 +1,294 @@
+"""
+Memory-mapped readers for MF-OWHM binary head (.hds) and cell-by-cell budget (.cbc) files.
+On open, each reader walks the record headers once to build an index of (period, step,
+text label, byte offset) without touching the data in between. Requested arrays are
+returned as read-only NumPy views into the memory map, so reading one layer at one time
+only pages in that layer.
+"""
+import mmap
+import os
+import numpy as np
+
+PRECISIONS = ('auto', 'single', 'double')
+
+_REAL_TYPES = {'single': np.dtype('<f4'), 'double': np.dtype('<f8')}
+_INT = np.dtype('<i4')
+
+def _header_dtype(precision):
+    real = _REAL_TYPES[precision]
+    return np.dtype([('kstp', _INT), ('kper', _INT), ('pertim', real), ('totim', real), ('text', 'S16'),
+                     ('ncol', _INT), ('nrow', _INT), ('ilay', _INT)])
+
+_BUDGET_HEADER = np.dtype([('kstp', _INT), ('kper', _INT), ('text', 'S16'),
+                           ('ncol', _INT), ('nrow', _INT), ('nlay', _INT)])
+
+def _budget_header2(precision):
+    real = _REAL_TYPES[precision]
+    return np.dtype([('imeth', _INT), ('delt', real), ('pertim', real), ('totim', real)])
+
+# Fields of the record index of each reader
+HEAD_INDEX_DTYPE = np.dtype([('kper', 'i4'), ('kstp', 'i4'), ('pertim', 'f8'), ('totim', 'f8'), ('text', 'U16'),
+                             ('layer', 'i4'), ('nrow', 'i4'), ('ncol', 'i4'), ('offset', 'i8')])
+BUDGET_INDEX_DTYPE = np.dtype([('kper', 'i4'), ('kstp', 'i4'), ('totim', 'f8'), ('text', 'U16'), ('imeth', 'i4'),
+                               ('nlay', 'i4'), ('nrow', 'i4'), ('ncol', 'i4'), ('offset', 'i8'),
+                               ('count', 'i8'), ('naux', 'i4'), ('aux_offset', 'i8')])
+
+def _text(raw):
+    """
+    Decode a 16-byte record label, or return None if it is not printable ASCII.
+    """
+    if not all(32 <= byte < 127 for byte in raw):
+        return None
+    return raw.decode('ascii').strip()
+
+class _BinaryFile:
+    """
+    Shared memory-map handling of the binary readers, usable as a context manager.
+    """
+    def __init__(self, path, precision='auto'):
+        if precision not in PRECISIONS:
+            raise ValueError(f"precision must be one of {', '.join(PRECISIONS)}. Got: {precision}")
+        self.path = path
+        self._file = open(path, 'rb')
+        self.size = os.fstat(self._file.fileno()).st_size
+        # mmap cannot map an empty file
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if self.size else b''
+        try:
+            self.precision, self.index = self._detect_index(precision)
+        except Exception:
+            self.close()
+            raise
+        self.real = _REAL_TYPES[self.precision]
+
+    def _detect_index(self, precision):
+        for candidate in (('single', 'double') if precision == 'auto' else (precision,)):
+            records = self._build_index(candidate)
+            if records is not None:
+                return candidate, records
+        raise ValueError(f"{self.path} is not a {self.kind} file of {precision} precision.")
+
+    def _header(self, dtype, offset):
+        if offset + dtype.itemsize > self.size:
+            return None
+        return np.frombuffer(self._mm, dtype, 1, offset)[0]
+
+    def _view(self, dtype, count, offset):
+        return np.frombuffer(self._mm, dtype, count, offset)
+
+    def times(self):
+        """
+        Return the distinct (kper, kstp) pairs of the file, in file order.
+        """
+        return list(dict.fromkeys(zip(self.index['kper'].tolist(), self.index['kstp'].tolist())))
+
+    def _select(self, mask, kper, kstp, totim):
+        """
+        Narrow a boolean index mask to one time: (kper, kstp), totim, or the last time if neither is given.
+        """
+        if totim is not None:
+            mask &= np.isclose(self.index['totim'], totim)
+        elif kper is not None:
+            mask &= self.index['kper'] == kper
+            if kstp is not None:
+                mask &= self.index['kstp'] == kstp
+            elif mask.any():
+                mask &= self.index['kstp'] == self.index['kstp'][mask].max()
+        elif mask.any():
+            last = np.flatnonzero(mask)[-1]
+            mask &= (self.index['kper'] == self.index['kper'][last]) & (self.index['kstp'] == self.index['kstp'][last])
+        return np.flatnonzero(mask)
+
+    def close(self):
+        """
+        Release the memory map and file. Views returned earlier must not be used afterwards.
+        """
+        if isinstance(self._mm, mmap.mmap):
+            try:
+                self._mm.close()
+            except BufferError:
+                # Views still refer to the map; it is released when they are garbage collected
+                pass
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def __len__(self):
+        return len(self.index)
+
+class HeadFile(_BinaryFile):
+    """
+    Memory-mapped MF-OWHM binary head (or drawdown) file.
+    path: the .hds file. precision: 'single', 'double' or 'auto' (detected from the record layout).
+    index: structured array of every record: kper, kstp (1-based, as in the file), pertim, totim, text,
+    layer (1-based), nrow, ncol and the byte offset of its data.
+    """
+    kind = 'binary head'
+
+    def _build_index(self, precision):
+        header = _header_dtype(precision)
+        itemsize = _REAL_TYPES[precision].itemsize
+        records = []
+        offset = 0
+        while offset < self.size:
+            h = self._header(header, offset)
+            if h is None:
+                return None
+            text = _text(h['text'])
+            if text is None or h['ncol'] <= 0 or h['nrow'] <= 0 or h['ilay'] <= 0:
+                return None
+            data = offset + header.itemsize
+            records.append((h['kper'], h['kstp'], h['pertim'], h['totim'], text, h['ilay'], h['nrow'], h['ncol'], data))
+            offset = data + int(h['nrow']) * int(h['ncol']) * itemsize
+        if offset != self.size:
+            return None
+        return np.array(records, dtype=HEAD_INDEX_DTYPE)
+
+    def get_data(self, kper=None, kstp=None, totim=None, layer=None, text=None):
+        """
+        Return the heads at one time as a read-only view into the file.
+        kper, kstp: 1-based stress period and time step (kstp defaults to the last step of kper);
+        totim: simulation time instead of kper/kstp; the last time in the file if neither is given.
+        layer: 1-based layer for a (nrow, ncol) view; all layers give a (nlay, nrow, ncol) array, which is a
+            view when the layer records are evenly spaced (the usual layout) and a copy otherwise.
+        text: record label to select, e.g. 'DRAWDOWN', when the file holds more than one.
+        Raises KeyError if no record matches.
+        """
+        mask = np.ones(len(self.index), dtype=bool)
+        if text is not None:
+            mask &= self.index['text'] == text.strip().upper()
+        if layer is not None:
+            mask &= self.index['layer'] == layer
+        rows = self._select(mask, kper, kstp, totim)
+        if rows.size == 0:
+            raise KeyError(f"No head record for kper={kper}, kstp={kstp}, totim={totim}, layer={layer} in {self.path}")
+        records = self.index[rows]
+        nrow, ncol = int(records['nrow'][0]), int(records['ncol'][0])
+        if layer is not None:
+            return self._view(self.real, nrow * ncol, int(records['offset'][0])).reshape(nrow, ncol)
+        records = records[np.argsort(records['layer'], kind='stable')]
+        offsets = records['offset']
+        steps = np.diff(offsets)
+        if len(offsets) == 1 or (steps > 0).all() and (steps == steps[0]).all():
+            stride = int(steps[0]) if len(steps) else nrow * ncol * self.real.itemsize
+            return np.ndarray((len(records), nrow, ncol), dtype=self.real, buffer=self._mm, offset=int(offsets[0]),
+                              strides=(stride, ncol * self.real.itemsize, self.real.itemsize))
+        return np.stack([self._view(self.real, nrow * ncol, int(offset)).reshape(nrow, ncol) for offset in offsets])
+
+class BudgetFile(_BinaryFile):
+    """
+    Memory-mapped MF-OWHM cell-by-cell budget file, in full (IMETH 0/1) or compact (IMETH 2-5) form.
+    path: the .cbc file. precision: 'single', 'double' or 'auto' (detected from the record layout).
+    index: structured array of every record: kper, kstp (1-based), totim (NaN for full records), text,
+    imeth, nlay, nrow, ncol, the byte offset of its data, its entry count and auxiliary variable count.
+    """
+    kind = 'cell-by-cell budget'
+
+    def _build_index(self, precision):
+        header2 = _budget_header2(precision)
+        itemsize = _REAL_TYPES[precision].itemsize
+        records = []
+        offset = 0
+        while offset < self.size:
+            h = self._header(_BUDGET_HEADER, offset)
+            if h is None:
+                return None
+            text = _text(h['text'])
+            ncol, nrow, nlay = int(h['ncol']), int(h['nrow']), int(h['nlay'])
+            if text is None or ncol <= 0 or nrow <= 0 or nlay == 0:
+                return None
+            offset += _BUDGET_HEADER.itemsize
+            ncells = nrow * ncol
+            imeth, totim, naux, aux_offset = 0, np.nan, 0, 0
+            if nlay < 0:
+                nlay = -nlay
+                h2 = self._header(header2, offset)
+                if h2 is None:
+                    return None
+                imeth, totim = int(h2['imeth']), float(h2['totim'])
+                offset += header2.itemsize
+            if imeth in (0, 1):
+                count, data = nlay * ncells, offset
+                offset += count * itemsize
+            elif imeth == 2:
+                count = self._count(offset)
+                data = offset + _INT.itemsize
+                offset = data + count * (_INT.itemsize + itemsize)
+            elif imeth == 3:
+                count, data = ncells, offset
+                offset += ncells * (_INT.itemsize + itemsize)
+            elif imeth == 4:
+                count, data = ncells, offset
+                offset += ncells * itemsize
+            elif imeth == 5:
+                nval = self._count(offset)
+                if nval is None or nval < 1:
+                    return None
+                naux = nval - 1
+                aux_offset = offset + _INT.itemsize
+                offset = aux_offset + naux * 16
+                count = self._count(offset)
+                data = offset + _INT.itemsize
+                if count is not None:
+                    offset = data + count * (_INT.itemsize + nval * itemsize)
+            else:
+                return None
+            if count is None or count < 0 or offset > self.size:
+                return None
+            records.append((h['kper'], h['kstp'], totim, text, imeth, nlay, nrow, ncol, data, count, naux, aux_offset))
+        return np.array(records, dtype=BUDGET_INDEX_DTYPE)
+
+    def _count(self, offset):
+        h = self._header(_INT, offset)
+        return None if h is None else int(h)
+
+    def terms(self):
+        """
+        Return the distinct budget term labels of the file, e.g. ['STORAGE', 'CONSTANT HEAD', ...].
+        """
+        return list(dict.fromkeys(self.index['text'].tolist()))
+
+    def aux_names(self, record):
+        """
+        Return the auxiliary variable names of one IMETH 5 index record.
+        """
+        names = self._view(np.dtype('S16'), int(record['naux']), int(record['aux_offset']))
+        return [name.decode('ascii').strip().lower() for name in names]
+
+    def get_data(self, text, kper=None, kstp=None, totim=None):
+        """
+        Return one budget term at one time as read-only views into the file.
+        text: budget term label, e.g. 'FLOW RIGHT FACE' (case and padding are ignored).
+        kper, kstp: 1-based stress period and time step (kstp defaults to the last step of kper);
+        totim: simulation time (compact records only); the last time of the term if neither is given.
+        Returns, by record layout:
+            IMETH 0/1: (nlay, nrow, ncol) array.
+            IMETH 2: structured array of ('node', 'q') with 1-based cell numbers.
+            IMETH 3: (layer, values) pair of (nrow, ncol) arrays of layer numbers and values.
+            IMETH 4: (nrow, ncol) array of layer 1 values.
+            IMETH 5: structured array of ('node', 'q', <aux names>...).
+        Raises KeyError if no record matches.
+        """
+        mask = self.index['text'] == text.strip().upper()
+        rows = self._select(mask, kper, kstp, totim)
+        if rows.size == 0:
+            raise KeyError(f"No budget record '{text}' for kper={kper}, kstp={kstp}, totim={totim} in {self.path}")
+        record = self.index[rows[0]]
+        imeth, nlay, nrow, ncol = (int(record[field]) for field in ('imeth', 'nlay', 'nrow', 'ncol'))
+        offset, count = int(record['offset']), int(record['count'])
+        if imeth in (0, 1):
+            return self._view(self.real, count, offset).reshape(nlay, nrow, ncol)
+        if imeth == 2:
+            return self._view(np.dtype([('node', _INT), ('q', self.real)]), count, offset)
+        if imeth == 3:
+            layers = self._view(_INT, count, offset).reshape(nrow, ncol)
+            values = self._view(self.real, count, offset + count * _INT.itemsize).reshape(nrow, ncol)
+            return layers, values
+        if imeth == 4:
+            return self._view(self.real, count, offset).reshape(nrow, ncol)
+        fields = [('node', _INT), ('q', self.real)] + [(name, self.real) for name in self.aux_names(record)]
+        return self._view(np.dtype(fields), count, offset)
@@ -3,21 +3,53 @@ CHD input file writer for OWHM.
 Extracts constant head boundary data from a FloPy CHD package if possible.
 Performs input validation and provides clear error messages.
 """
+import functools
+import operator
+from .columnar import (
+    stress_period_items, is_columnar, require_columns,
+    check_column, check_cell_columns, write_columns, REUSE_MARKER, repeated_periods,
+)
+from .shards import remove_shards, write_shards
+from .package_file import PackageFile, write_rows
+
+CHD_COLUMNS = ('k', 'i', 'j', 'shead', 'ehead')
 
 def _require_field(obj, field, context):
     if field not in obj:
         raise ValueError(f"Missing required field '{field}' in {context}.")
     return obj[field]
 
-def write_chd_input(chd_package, output_path):
+def _write_period(f, chd_list):
+    """
+    Write the rows of one stress period.
+    """
+    if is_columnar(chd_list):
+        write_columns(f, chd_list, CHD_COLUMNS)
+    else:
+        write_rows(f, map(operator.itemgetter(*CHD_COLUMNS), chd_list))
+
+def write_chd_input(chd_package, output_path, reuse_periods=False, shard=False, max_workers=None,
+                    float_precision=None):
     """
     Convert a FloPy CHD package object to an OWHM-compatible CHD input file.
     Performs input validation and provides clear error messages.
+    reuse_periods: if True, each period starts with a 'PERIOD n' line, and a period identical to the one
+        before it is written as a reuse marker under its header.
+    shard: if True, each period is written to its own file (see shards.write_shards), referenced by OPEN/CLOSE;
+        shards are written concurrently on max_workers threads and only rewritten when their content changes.
+    float_precision: significant digits for float values; None writes them as str() does.
     """
     chds = getattr(chd_package, 'stress_period_data', None)
     if chds is None:
         raise ValueError("CHD package is missing 'stress_period_data'.")
-    for per, chd_list in chds.items():
+    for per, chd_list in stress_period_items(chds):
+        if is_columnar(chd_list):
+            context = f'stress_period_data[{per}]'
+            require_columns(chd_list, CHD_COLUMNS, context)
+            check_cell_columns(chd_list, context)
+            check_column(chd_list, 'shead', context, "shead must be a number")
+            check_column(chd_list, 'ehead', context, "ehead must be a number")
+            continue
         for idx, chd in enumerate(chd_list):
             _require_field(chd, 'k', f'stress_period_data[{per}][{idx}]')
             _require_field(chd, 'i', f'stress_period_data[{per}][{idx}]')
@@ -40,18 +72,29 @@ def write_chd_input(chd_package, output_path):
             if not isinstance(ehead, (int, float)):
                 raise ValueError(f"ehead must be a number in stress_period_data[{per}][{idx}]. Got: {ehead}")
 
-    with open(output_path, 'w') as f:
-        f.write('# OWHM CHD Input File (auto-generated)\n')
+    # Periods identical to the previous one, found by hashing each period's values
+    repeated = set()
+    if reuse_periods:
+        repeated = repeated_periods(stress_period_items(chds), CHD_COLUMNS)
+    shards = {}
+    if shard:
+        blocks = [(per, functools.partial(_write_period, chd_list=chd_list))
+                  for per, chd_list in stress_period_items(chds) if per not in repeated]
+        shards = write_shards(output_path, blocks, max_workers, float_precision)
+
+    with PackageFile(output_path, 'CHD', float_precision) as f:
         # CHD block
-        f.write('BEGIN CHD\n')
-        f.write('  # LAYER   ROW   COL   SHEAD   EHEAD\n')
-        for per, chd_list in chds.items():
-            for chd in chd_list:
-                layer = chd['k']
-                row = chd['i']
-                col = chd['j']
-                shead = chd['shead']
-                ehead = chd['ehead']
-                f.write(f'  {layer}   {row}   {col}   {shead}   {ehead}\n')
-        f.write('END CHD\n\n')
-        # TODO: Add more CHD blocks as needed (with validation) 
\ No newline at end of file
+        with f.block('CHD', 'LAYER   ROW   COL   SHEAD   EHEAD'):
+            for per, chd_list in stress_period_items(chds):
+                if reuse_periods:
+                    f.line(f'PERIOD {per}')
+                if per in repeated:
+                    f.write(REUSE_MARKER)
+                elif shard:
+                    f.line(f'OPEN/CLOSE {shards[per]}')
+                else:
+                    _write_period(f, chd_list)
+        # TODO: Add more CHD blocks as needed (with validation)
+    if not shard:
+        # Shards of an earlier sharded write are no longer referenced
+        remove_shards(output_path)
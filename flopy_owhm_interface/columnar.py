@@ -0,0 +1,186 @@
+"""
+Columnar helpers for OWHM list-based writers.
+Lets stress period data be given as NumPy structured arrays (or FloPy MfList
+recarrays) instead of lists of dicts, validated with vectorized masks and
+written with a single bulk formatter per block.
+"""
+import hashlib
+import numpy as np
+from numpy.lib.recfunctions import repack_fields
+from .instrumentation import count_records
+
+# Buffer size used when opening package files for writing (1 MiB)
+WRITE_BUFFER_SIZE = 1 << 20
+
+# Written under the 'PERIOD n' header of a stress period identical to the one before it
+REUSE_MARKER = '  REUSE PREVIOUS PERIOD\n'
+
+# Cell index fields that FloPy MfList recarrays hold 0-based
+MFLIST_INDEX_FIELDS = ('k', 'i', 'j')
+
+_DTYPE_KINDS = {
+    'int': 'iu',
+    'number': 'iuf',
+}
+
+def stress_period_items(stress_period_data):
+    """
+    Return the (period, records) pairs of stress period data.
+    Accepts a dict of periods or a FloPy MfList, whose 'data' attribute holds the dict;
+    MfList periods are returned with their 0-based k/i/j made 1-based (see one_based).
+    Grid-based writers also accept a callable returning an iterable of (period, data) pairs,
+    which is consumed lazily, and an unstructured array whose first axis is the period.
+    """
+    if callable(stress_period_data):
+        return stress_period_data()
+    if isinstance(stress_period_data, np.ndarray) and stress_period_data.dtype.names is None:
+        return enumerate(stress_period_data)
+    if not hasattr(stress_period_data, 'items') and hasattr(stress_period_data, 'data'):
+        return ((per, one_based(records)) for per, records in stress_period_data.data.items())
+    return stress_period_data.items()
+
+def one_based(records):
+    """
+    Return a copy of a FloPy MfList period with its 0-based k/i/j fields made 1-based, like dict records.
+    Periods without those fields (or that are not structured arrays) are returned unchanged.
+    """
+    if not is_columnar(records):
+        return records
+    fields = [field for field in MFLIST_INDEX_FIELDS if field in records.dtype.names]
+    if not fields:
+        return records
+    records = records.copy()
+    for field in fields:
+        records[field] += 1
+    return records
+
+def is_columnar(records):
+    """
+    Return True if a period's records are a NumPy structured array or recarray.
+    """
+    return isinstance(records, np.ndarray) and records.dtype.names is not None
+
+def require_columns(records, fields, context):
+    """
+    Check that a structured array has every required field.
+    """
+    for field in fields:
+        if field not in records.dtype.names:
+            raise ValueError(f"Missing required field '{field}' in {context}.")
+
+def check_column(records, field, context, message, kind='number', condition=None):
+    """
+    Validate one column of a structured array with vectorized masks.
+    kind: 'int' or 'number', the accepted dtype family of the column.
+    condition: optional callable returning a boolean mask of valid values.
+    Raises ValueError naming the first offending row index.
+    """
+    values = records[field]
+    if values.dtype.kind not in _DTYPE_KINDS[kind]:
+        raise ValueError(f"{message} in {context}. Got dtype: {values.dtype}")
+    if condition is not None:
+        bad = np.flatnonzero(~condition(values))
+        if bad.size:
+            idx = bad[0]
+            raise ValueError(f"{message} in {context}[{idx}]. Got: {values[idx]}")
+
+def check_cell_columns(records, context, fields=('k', 'i', 'j')):
+    """
+    Validate that layer/row/col columns hold positive integers.
+    """
+    labels = ('Layer', 'Row', 'Col')
+    for label, field in zip(labels[-len(fields):], fields):
+        check_column(records, field, context, f"{label} must be a positive integer",
+                     kind='int', condition=lambda v: v > 0)
+
+def column_formats(dtype, fields, float_precision=None):
+    """
+    Return the printf formats of the given fields: '%s', or '%.Ng' for float fields when float_precision is set.
+    """
+    if float_precision is None:
+        return ['%s'] * len(fields)
+    return [f'%.{float_precision}g' if dtype[field].kind == 'f' else '%s' for field in fields]
+
+def write_columns(f, records, fields):
+    """
+    Write the given fields of a structured array as one block of rows.
+    Each row is indented and space separated like the list-based writers.
+    f may be a PackageFile, whose float_precision applies.
+    """
+    if len(records) == 0:
+        return
+    fmt = '  ' + '   '.join(column_formats(records.dtype, fields, getattr(f, 'float_precision', None)))
+    np.savetxt(f, records[list(fields)], fmt=fmt)
+    count_records(len(records))
+
+def as_records(data):
+    """
+    Return data as a NumPy structured array if it is columnar (a structured array,
+    recarray or DataFrame), or None for dict/list data.
+    """
+    if is_columnar(data):
+        return data
+    if hasattr(data, 'to_records') and hasattr(data, 'columns'):
+        return data.to_records(index=False)
+    return None
+
+def add_id_column(records, name, start=1):
+    """
+    Return records with a leading integer ID column numbered from start, unless it already has one.
+    """
+    if name in records.dtype.names:
+        return records
+    out = np.empty(len(records), dtype=[(name, np.int64)] + [(field, records.dtype[field]) for field in records.dtype.names])
+    out[name] = np.arange(start, start + len(records))
+    for field in records.dtype.names:
+        out[field] = records[field]
+    return out
+
+def check_unique(records, field, context, message):
+    """
+    Validate that a column has no repeated values, naming the first repeated row.
+    """
+    values = records[field]
+    order = np.argsort(values, kind='stable')
+    repeated = np.flatnonzero(values[order][1:] == values[order][:-1])
+    if repeated.size:
+        idx = order[repeated + 1].min()
+        raise ValueError(f"{message} in {context}[{idx}]. Got: {values[idx]}")
+
+def check_membership(records, field, valid_ids, context, message):
+    """
+    Validate with np.isin that every value of a column is one of valid_ids, naming the first offending row.
+    """
+    values = records[field]
+    bad = np.flatnonzero(~np.isin(values, valid_ids))
+    if bad.size:
+        idx = bad[0]
+        raise ValueError(f"{message} in {context}[{idx}]. Got: {values[idx]}")
+
+def period_digest(records, fields):
+    """
+    Return a digest of the given fields of one period's records (dicts or a structured array).
+    Structured arrays are hashed from their packed bytes without formatting any row.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    if is_columnar(records):
+        packed = repack_fields(records[list(fields)])
+        h.update(str(packed.dtype.descr).encode())
+        h.update(np.ascontiguousarray(packed).tobytes())
+    else:
+        h.update(repr([tuple(record[field] for field in fields) for record in records]).encode())
+    return h.digest()
+
+def repeated_periods(items, fields):
+    """
+    Return the set of periods whose records are identical to the period before them.
+    items: (period, records) pairs in file order.
+    """
+    repeated = set()
+    previous = None
+    for per, records in items:
+        digest = period_digest(records, fields)
+        if digest == previous:
+            repeated.add(per)
+        previous = digest
+    return repeated
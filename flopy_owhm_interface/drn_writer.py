@@ -3,22 +3,54 @@ DRN input file writer for OWHM.
 Extracts drain data from a FloPy DRN package if possible.
 Performs input validation and provides clear error messages.
 """
+import functools
+import operator
+from .columnar import (
+    stress_period_items, is_columnar, require_columns,
+    check_column, check_cell_columns, write_columns, REUSE_MARKER, repeated_periods,
+)
+from .shards import remove_shards, write_shards
+from .package_file import PackageFile, write_rows
+
+DRN_COLUMNS = ('k', 'i', 'j', 'elevation', 'conductance')
 
 def _require_field(obj, field, context):
     if field not in obj:
         raise ValueError(f"Missing required field '{field}' in {context}.")
     return obj[field]
 
-def write_drn_input(drn_package, output_path):
+def _write_period(f, drain_list):
+    """
+    Write the rows of one stress period.
+    """
+    if is_columnar(drain_list):
+        write_columns(f, drain_list, DRN_COLUMNS)
+    else:
+        write_rows(f, map(operator.itemgetter(*DRN_COLUMNS), drain_list))
+
+def write_drn_input(drn_package, output_path, reuse_periods=False, shard=False, max_workers=None,
+                    float_precision=None):
     """
     Convert a FloPy DRN package object to an OWHM-compatible DRN input file.
     This version writes basic DRN blocks, extracting what is possible from FloPy.
     Performs input validation and provides clear error messages.
+    reuse_periods: if True, each period starts with a 'PERIOD n' line, and a period identical to the one
+        before it is written as a reuse marker under its header.
+    shard: if True, each period is written to its own file (see shards.write_shards), referenced by OPEN/CLOSE;
+        shards are written concurrently on max_workers threads and only rewritten when their content changes.
+    float_precision: significant digits for float values; None writes them as str() does.
     """
     drains = getattr(drn_package, 'stress_period_data', None)
     if drains is None:
         raise ValueError("DRN package is missing 'stress_period_data'.")
-    for per, drain_list in drains.items():
+    for per, drain_list in stress_period_items(drains):
+        if is_columnar(drain_list):
+            context = f'stress_period_data[{per}]'
+            require_columns(drain_list, DRN_COLUMNS, context)
+            check_cell_columns(drain_list, context)
+            check_column(drain_list, 'elevation', context, "Elevation must be a number")
+            check_column(drain_list, 'conductance', context, "Conductance must be positive", condition=lambda v: v > 0)
+            continue
         for idx, drain in enumerate(drain_list):
             _require_field(drain, 'k', f'stress_period_data[{per}][{idx}]')
             _require_field(drain, 'i', f'stress_period_data[{per}][{idx}]')
@@ -41,18 +73,29 @@ def write_drn_input(drn_package, output_path):
             if not (isinstance(conductance, (int, float)) and conductance > 0):
                 raise ValueError(f"Conductance must be positive in stress_period_data[{per}][{idx}]. Got: {conductance}")
 
-    with open(output_path, 'w') as f:
-        f.write('# OWHM DRN Input File (auto-generated)\n')
+    # Periods identical to the previous one, found by hashing each period's values
+    repeated = set()
+    if reuse_periods:
+        repeated = repeated_periods(stress_period_items(drains), DRN_COLUMNS)
+    shards = {}
+    if shard:
+        blocks = [(per, functools.partial(_write_period, drain_list=drain_list))
+                  for per, drain_list in stress_period_items(drains) if per not in repeated]
+        shards = write_shards(output_path, blocks, max_workers, float_precision)
+
+    with PackageFile(output_path, 'DRN', float_precision) as f:
         # DRAINS block
-        f.write('BEGIN DRAINS\n')
-        f.write('  # LAYER   ROW   COL   ELEVATION   CONDUCTANCE   ETC\n')
-        for per, drain_list in drains.items():
-            for drain in drain_list:
-                layer = drain['k']
-                row = drain['i']
-                col = drain['j']
-                elevation = drain['elevation']
-                conductance = drain['conductance']
-                f.write(f'  {layer}   {row}   {col}   {elevation}   {conductance}\n')
-        f.write('END DRAINS\n\n')
-        # TODO: Add more DRN blocks as needed (with validation) 
\ No newline at end of file
+        with f.block('DRAINS', 'LAYER   ROW   COL   ELEVATION   CONDUCTANCE   ETC'):
+            for per, drain_list in stress_period_items(drains):
+                if reuse_periods:
+                    f.line(f'PERIOD {per}')
+                if per in repeated:
+                    f.write(REUSE_MARKER)
+                elif shard:
+                    f.line(f'OPEN/CLOSE {shards[per]}')
+                else:
+                    _write_period(f, drain_list)
+        # TODO: Add more DRN blocks as needed (with validation)
+    if not shard:
+        # Shards of an earlier sharded write are no longer referenced
+        remove_shards(output_path)
@@ -3,21 +3,38 @@ DRT input file writer for OWHM.
 Extracts drain return data from a FloPy DRT package if possible.
 Performs input validation and provides clear error messages.
 """
+import operator
+from .columnar import (
+    stress_period_items, is_columnar, require_columns,
+    check_column, check_cell_columns,
+)
+from .package_file import PackageFile
+
+DRT_COLUMNS = ('k', 'i', 'j', 'elev', 'cond', 'return_fraction')
 
 def _require_field(obj, field, context):
     if field not in obj:
         raise ValueError(f"Missing required field '{field}' in {context}.")
     return obj[field]
 
-def write_drt_input(drt_package, output_path):
+def write_drt_input(drt_package, output_path, float_precision=None):
     """
     Convert a FloPy DRT package object to an OWHM-compatible DRT input file.
     Performs input validation and provides clear error messages.
+    float_precision: significant digits for float values; None writes them as str() does.
     """
     drts = getattr(drt_package, 'stress_period_data', None)
     if drts is None:
         raise ValueError("DRT package is missing 'stress_period_data'.")
-    for per, drt_list in drts.items():
+    for per, drt_list in stress_period_items(drts):
+        if is_columnar(drt_list):
+            context = f'stress_period_data[{per}]'
+            require_columns(drt_list, DRT_COLUMNS, context)
+            check_cell_columns(drt_list, context)
+            check_column(drt_list, 'elev', context, "elev must be a number")
+            check_column(drt_list, 'cond', context, "cond must be a number")
+            check_column(drt_list, 'return_fraction', context, "return_fraction must be a number between 0 and 1", condition=lambda v: (v >= 0) & (v <= 1))
+            continue
         for idx, drt in enumerate(drt_list):
             _require_field(drt, 'k', f'stress_period_data[{per}][{idx}]')
             _require_field(drt, 'i', f'stress_period_data[{per}][{idx}]')
@@ -44,19 +61,12 @@ def write_drt_input(drt_package, output_path):
             if not isinstance(return_fraction, (int, float)) or not (0 <= return_fraction <= 1):
                 raise ValueError(f"return_fraction must be a number between 0 and 1 in stress_period_data[{per}][{idx}]. Got: {return_fraction}")
 
-    with open(output_path, 'w') as f:
-        f.write('# OWHM DRT Input File (auto-generated)\n')
+    with PackageFile(output_path, 'DRT', float_precision) as f:
         # DRT block
-        f.write('BEGIN DRT\n')
-        f.write('  # LAYER   ROW   COL   ELEV   COND   RETURN_FRACTION\n')
-        for per, drt_list in drts.items():
-            for drt in drt_list:
-                layer = drt['k']
-                row = drt['i']
-                col = drt['j']
-                elev = drt['elev']
-                cond = drt['cond']
-                return_fraction = drt['return_fraction']
-                f.write(f'  {layer}   {row}   {col}   {elev}   {cond}   {return_fraction}\n')
-        f.write('END DRT\n\n')
+        with f.block('DRT', 'LAYER   ROW   COL   ELEV   COND   RETURN_FRACTION'):
+            for per, drt_list in stress_period_items(drts):
+                if is_columnar(drt_list):
+                    f.columns(drt_list, DRT_COLUMNS)
+                else:
+                    f.rows(map(operator.itemgetter(*DRT_COLUMNS), drt_list))
         # TODO: Add more DRT blocks as needed (with validation) 
\ No newline at end of file
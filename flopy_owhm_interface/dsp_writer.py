@@ -3,16 +3,18 @@ DSP input file writer for OWHM.
 Extracts dispersion data from a FloPy DSP package if possible.
 Performs input validation and provides clear error messages.
 """
+from .package_file import PackageFile
 
 def _require_field(obj, field, context):
     if field not in obj:
         raise ValueError(f"Missing required field '{field}' in {context}.")
     return obj[field]
 
-def write_dsp_input(dsp_package, output_path):
+def write_dsp_input(dsp_package, output_path, float_precision=None):
     """
     Convert a FloPy DSP package object to an OWHM-compatible DSP input file.
     Performs input validation and provides clear error messages.
+    float_precision: significant digits for float values; None writes them as str() does.
     """
     dsps = getattr(dsp_package, 'parameters', None)
     if dsps is None:
@@ -34,11 +36,8 @@ def write_dsp_input(dsp_package, output_path):
     if not isinstance(dmcoef, (int, float)):
         raise ValueError(f"dmcoef must be a number in DSP parameters. Got: {dmcoef}")
 
-    with open(output_path, 'w') as f:
-        f.write('# OWHM DSP Input File (auto-generated)\n')
+    with PackageFile(output_path, 'DSP', float_precision) as f:
         # DSP block
-        f.write('BEGIN DSP\n')
-        f.write('  # AL   TRPT   TRPV   DMCOEF\n')
-        f.write(f'  {al}   {trpt}   {trpv}   {dmcoef}\n')
-        f.write('END DSP\n\n')
+        with f.block('DSP', 'AL   TRPT   TRPV   DMCOEF'):
+            f.rows([(al, trpt, trpv, dmcoef)])
         # TODO: Add more DSP blocks as needed (with validation) 
\ No newline at end of file
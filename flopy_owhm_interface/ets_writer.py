@@ -3,21 +3,39 @@ ETS input file writer for OWHM.
 Extracts evapotranspiration segment data from a FloPy ETS package if possible.
 Performs input validation and provides clear error messages.
 """
+import operator
+from .columnar import (
+    stress_period_items, is_columnar, require_columns,
+    check_column, check_cell_columns,
+)
+from .package_file import PackageFile
+
+ETS_COLUMNS = ('k', 'i', 'j', 'surf', 'pxdp', 'petm', 'pet')
 
 def _require_field(obj, field, context):
     if field not in obj:
         raise ValueError(f"Missing required field '{field}' in {context}.")
     return obj[field]
 
-def write_ets_input(ets_package, output_path):
+def write_ets_input(ets_package, output_path, float_precision=None):
     """
     Convert a FloPy ETS package object to an OWHM-compatible ETS input file.
     Performs input validation and provides clear error messages.
+    float_precision: significant digits for float values; None writes them as str() does.
     """
     etss = getattr(ets_package, 'stress_period_data', None)
     if etss is None:
         raise ValueError("ETS package is missing 'stress_period_data'.")
-    for per, ets_list in etss.items():
+    for per, ets_list in stress_period_items(etss):
+        if is_columnar(ets_list):
+            context = f'stress_period_data[{per}]'
+            require_columns(ets_list, ETS_COLUMNS, context)
+            check_cell_columns(ets_list, context)
+            check_column(ets_list, 'surf', context, "surf must be a number")
+            check_column(ets_list, 'pxdp', context, "pxdp must be a number")
+            check_column(ets_list, 'petm', context, "petm must be a number")
+            check_column(ets_list, 'pet', context, "pet must be a number")
+            continue
         for idx, ets in enumerate(ets_list):
             _require_field(ets, 'k', f'stress_period_data[{per}][{idx}]')
             _require_field(ets, 'i', f'stress_period_data[{per}][{idx}]')
@@ -48,20 +66,12 @@ def write_ets_input(ets_package, output_path):
             if not isinstance(pet, (int, float)):
                 raise ValueError(f"pet must be a number in stress_period_data[{per}][{idx}]. Got: {pet}")
 
-    with open(output_path, 'w') as f:
-        f.write('# OWHM ETS Input File (auto-generated)\n')
+    with PackageFile(output_path, 'ETS', float_precision) as f:
         # ETS block
-        f.write('BEGIN ETS\n')
-        f.write('  # LAYER   ROW   COL   SURF   PXDP   PETM   PET\n')
-        for per, ets_list in etss.items():
-            for ets in ets_list:
-                layer = ets['k']
-                row = ets['i']
-                col = ets['j']
-                surf = ets['surf']
-                pxdp = ets['pxdp']
-                petm = ets['petm']
-                pet = ets['pet']
-                f.write(f'  {layer}   {row}   {col}   {surf}   {pxdp}   {petm}   {pet}\n')
-        f.write('END ETS\n\n')
+        with f.block('ETS', 'LAYER   ROW   COL   SURF   PXDP   PETM   PET'):
+            for per, ets_list in stress_period_items(etss):
+                if is_columnar(ets_list):
+                    f.columns(ets_list, ETS_COLUMNS)
+                else:
+                    f.rows(map(operator.itemgetter(*ETS_COLUMNS), ets_list))
         # TODO: Add more ETS blocks as needed (with validation) 
\ No newline at end of file
@@ -3,55 +3,100 @@ EVT input file writer for OWHM.
 Extracts evapotranspiration data from a FloPy EVT package if possible.
 Performs input validation and provides clear error messages.
 """
+import operator
+from .columnar import (
+    stress_period_items, is_columnar, require_columns,
+    check_column, check_cell_columns,
+)
+from .grid_arrays import (
+    is_grid_period, grid_fields, check_grid_period, write_grid_period, write_array_period,
+)
+from .package_file import PackageFile
+
+# Value checks applied to grid periods as they are streamed
+_GRID_CONDITIONS = {'evtr': ("evtr must be non-negative", lambda v: v >= 0)}
+
+EVT_COLUMNS = ('k', 'i', 'j', 'surf', 'evtr')
 
 def _require_field(obj, field, context):
     if field not in obj:
         raise ValueError(f"Missing required field '{field}' in {context}.")
     return obj[field]
 
-def write_evt_input(evt_package, output_path):
+def _validate_period(per, evt_list):
+    """
+    Validate one stress period given as records, a structured array or surf/evtr grid arrays.
+    """
+    context = f'stress_period_data[{per}]'
+    if is_grid_period(evt_list, ('surf', 'evtr')):
+        check_grid_period(grid_fields(evt_list, ('surf', 'evtr'), context), context)
+        return
+    if is_columnar(evt_list):
+        require_columns(evt_list, EVT_COLUMNS, context)
+        check_cell_columns(evt_list, context)
+        check_column(evt_list, 'surf', context, "surf must be a number")
+        check_column(evt_list, 'evtr', context, "evtr must be non-negative", condition=lambda v: v >= 0)
+        return
+    for idx, evt in enumerate(evt_list):
+        _require_field(evt, 'k', f'stress_period_data[{per}][{idx}]')
+        _require_field(evt, 'i', f'stress_period_data[{per}][{idx}]')
+        _require_field(evt, 'j', f'stress_period_data[{per}][{idx}]')
+        _require_field(evt, 'surf', f'stress_period_data[{per}][{idx}]')
+        _require_field(evt, 'evtr', f'stress_period_data[{per}][{idx}]')
+        layer = evt['k']
+        row = evt['i']
+        col = evt['j']
+        surf = evt['surf']
+        evtr = evt['evtr']
+        if not (isinstance(layer, int) and layer > 0):
+            raise ValueError(f"Layer must be a positive integer in stress_period_data[{per}][{idx}]. Got: {layer}")
+        if not (isinstance(row, int) and row > 0):
+            raise ValueError(f"Row must be a positive integer in stress_period_data[{per}][{idx}]. Got: {row}")
+        if not (isinstance(col, int) and col > 0):
+            raise ValueError(f"Col must be a positive integer in stress_period_data[{per}][{idx}]. Got: {col}")
+        if not isinstance(surf, (int, float)):
+            raise ValueError(f"surf must be a number in stress_period_data[{per}][{idx}]. Got: {surf}")
+        if not (isinstance(evtr, (int, float)) and evtr >= 0):
+            raise ValueError(f"evtr must be non-negative in stress_period_data[{per}][{idx}]. Got: {evtr}")
+
+def write_evt_input(evt_package, output_path, array_output='auto', grid_shape=None, float_precision=None):
     """
     Convert a FloPy EVT package object to an OWHM-compatible EVT input file.
     Performs input validation and provides clear error messages.
+    Periods may also be dicts of 'surf' and 'evtr' grid arrays (2-D for layer 1, or 3-D), memory-mapped
+    '.npy' paths or scalars, or come from a callable yielding (period, data) pairs; grid periods are
+    streamed a block of rows at a time and their evtr values are checked as they are written.
+    array_output: 'auto' (default), 'list', 'array' or 'external'; see grid_arrays.write_array_period.
+        'auto' writes a period as dense SURF/EVTR array blocks when it covers most of the model grid
+        and every written cell has a surf value; cells without evtr are written as 0.0.
+    grid_shape: (nlay, nrow, ncol) of the model, needed to write list periods as arrays.
+    float_precision: significant digits for float values; None writes them as str() does.
     """
     evts = getattr(evt_package, 'stress_period_data', None)
     if evts is None:
         raise ValueError("EVT package is missing 'stress_period_data'.")
-    for per, evt_list in evts.items():
-        for idx, evt in enumerate(evt_list):
-            _require_field(evt, 'k', f'stress_period_data[{per}][{idx}]')
-            _require_field(evt, 'i', f'stress_period_data[{per}][{idx}]')
-            _require_field(evt, 'j', f'stress_period_data[{per}][{idx}]')
-            _require_field(evt, 'surf', f'stress_period_data[{per}][{idx}]')
-            _require_field(evt, 'evtr', f'stress_period_data[{per}][{idx}]')
-            layer = evt['k']
-            row = evt['i']
-            col = evt['j']
-            surf = evt['surf']
-            evtr = evt['evtr']
-            if not (isinstance(layer, int) and layer > 0):
-                raise ValueError(f"Layer must be a positive integer in stress_period_data[{per}][{idx}]. Got: {layer}")
-            if not (isinstance(row, int) and row > 0):
-                raise ValueError(f"Row must be a positive integer in stress_period_data[{per}][{idx}]. Got: {row}")
-            if not (isinstance(col, int) and col > 0):
-                raise ValueError(f"Col must be a positive integer in stress_period_data[{per}][{idx}]. Got: {col}")
-            if not isinstance(surf, (int, float)):
-                raise ValueError(f"surf must be a number in stress_period_data[{per}][{idx}]. Got: {surf}")
-            if not (isinstance(evtr, (int, float)) and evtr >= 0):
-                raise ValueError(f"evtr must be non-negative in stress_period_data[{per}][{idx}]. Got: {evtr}")
+    # Periods from a callable are produced one at a time, so they are validated as they are written
+    streamed = callable(evts)
+    if not streamed:
+        for per, evt_list in stress_period_items(evts):
+            _validate_period(per, evt_list)
 
-    with open(output_path, 'w') as f:
-        f.write('# OWHM EVT Input File (auto-generated)\n')
+    with PackageFile(output_path, 'EVT', float_precision) as f:
         # EVT block
-        f.write('BEGIN EVT\n')
-        f.write('  # LAYER   ROW   COL   SURF   EVTR   ETC\n')
-        for per, evt_list in evts.items():
-            for evt in evt_list:
-                layer = evt['k']
-                row = evt['i']
-                col = evt['j']
-                surf = evt['surf']
-                evtr = evt['evtr']
-                f.write(f'  {layer}   {row}   {col}   {surf}   {evtr}\n')
-        f.write('END EVT\n\n')
+        with f.block('EVT', 'LAYER   ROW   COL   SURF   EVTR   ETC'):
+            for per, evt_list in stress_period_items(evts):
+                if streamed:
+                    _validate_period(per, evt_list)
+                context = f'stress_period_data[{per}]'
+                if write_array_period(f, per, evt_list, ('k', 'i', 'j'), ('surf', 'evtr'), context, array_output,
+                                      grid_shape, output_path, conditions=_GRID_CONDITIONS,
+                                      fill_fields=('evtr',)):
+                    continue
+                if is_grid_period(evt_list, ('surf', 'evtr')):
+                    write_grid_period(f, grid_fields(evt_list, ('surf', 'evtr'), context), ('k', 'i', 'j'),
+                                      ('surf', 'evtr'), context, conditions=_GRID_CONDITIONS)
+                elif is_columnar(evt_list):
+                    f.columns(evt_list, EVT_COLUMNS)
+                else:
+                    f.rows(map(operator.itemgetter(*EVT_COLUMNS), evt_list))
         # TODO: Add more EVT blocks as needed (with validation) 
\ No newline at end of file
@@ -0,0 +1,172 @@
+"""
+Content fingerprints for incremental OWHM input regeneration.
+Hashes the data a package writer reads so unchanged packages can be skipped,
+and stores the hashes in a small JSON manifest in the model workspace.
+Memory-mapped arrays and '.npy' paths are identified by their file's size and
+mtime rather than read; other arrays are hashed in place without a copy.
+A callable stress_period_data is identified by its 'owhm_fingerprint' attribute,
+set by the caller to a value that changes when its output changes; a callable
+without one cannot be fingerprinted, so its package is always rewritten.
+"""
+import hashlib
+import json
+import os
+import numpy as np
+
+MANIFEST_NAME = 'owhm_manifest.json'
+
+# Package attributes read by the writers; only these contribute to a fingerprint
+FINGERPRINT_ATTRS = [
+    'stress_period_data', 'irrigation', 'farm_dict', 'supply',
+    'crop_data', 'cropinfo', 'crop_dict', 'soil_data', 'soilinfo', 'soil_dict',
+    'well_data', 'wellinfo', 'well_dict', 'well_info', 'static_data',
+    'delivery', 'water_rights', 'auxiliary',
+    'segments', 'reaches', 'connections', 'lakes', 'outlets',
+    'parameters', 'observation_data',
+]
+
+# Bytes of a non-contiguous array hashed per update
+HASH_CHUNK_BYTES = 1 << 24
+
+class Unfingerprintable(Exception):
+    """
+    Raised while hashing data that has no stable fingerprint, such as a callable without 'owhm_fingerprint'.
+    """
+
+def _memmap_region(obj):
+    """
+    Return (path, byte offset in the file) of the data a memory-mapped array (or a view of one) starts at,
+    or None if obj is not backed by a file.
+    """
+    if not isinstance(obj, np.memmap) or obj.filename is None:
+        return None
+    root = obj
+    while isinstance(root.base, np.ndarray):
+        root = root.base
+    if not isinstance(root, np.memmap):
+        return None
+    start = obj.__array_interface__['data'][0] - root.__array_interface__['data'][0]
+    return obj.filename, root.offset + start
+
+def _update_array_bytes(h, obj):
+    """
+    Feed the bytes of a numeric array into h without copying it whole.
+    """
+    if obj.flags.c_contiguous:
+        h.update(obj.reshape(-1).view(np.uint8))
+        return
+    rows = max(1, HASH_CHUNK_BYTES // max(1, obj[0].nbytes))
+    for start in range(0, len(obj), rows):
+        h.update(np.ascontiguousarray(obj[start:start + rows]).reshape(-1).view(np.uint8))
+
+def _update(h, obj):
+    """
+    Feed a canonical byte representation of obj into the hash h.
+    """
+    if isinstance(obj, np.ndarray):
+        h.update(b'ndarray')
+        h.update(str(obj.dtype.descr).encode())
+        h.update(str(obj.shape).encode())
+        region = _memmap_region(obj)
+        if obj.dtype.hasobject:
+            # Object arrays hold pointers; hash their values instead
+            _update(h, obj.tolist())
+        elif region is not None:
+            # Memory-mapped input: hash where it lies in which file version rather than reading it
+            path, offset = region
+            stat = os.stat(path)
+            h.update(f'memmap:{path}:{stat.st_size}:{stat.st_mtime_ns}:{offset}:{obj.strides}'.encode())
+        else:
+            _update_array_bytes(h, obj)
+    elif hasattr(obj, 'to_numpy') and hasattr(obj, 'index'):
+        # pandas DataFrame / Series: hash labels and values rather than the truncated repr
+        h.update(type(obj).__name__.encode())
+        _update(h, list(getattr(obj, 'columns', [])))
+        _update(h, np.asarray(obj.index))
+        _update(h, obj.to_numpy())
+    elif isinstance(obj, str) and obj.endswith('.npy') and os.path.isfile(obj):
+        # Memory-mapped grid input given by path: hash its size and mtime rather than reading it
+        stat = os.stat(obj)
+        h.update(f'npy:{obj}:{stat.st_size}:{stat.st_mtime_ns}'.encode())
+    elif callable(obj):
+        # Generated periods: only the caller knows when their output changes
+        key = getattr(obj, 'owhm_fingerprint', None)
+        if key is None:
+            raise Unfingerprintable(f"{obj!r} has no 'owhm_fingerprint' attribute")
+        h.update(b'callable')
+        _update(h, key)
+    elif isinstance(obj, dict):
+        h.update(b'dict')
+        for key in sorted(obj, key=repr):
+            h.update(repr(key).encode())
+            _update(h, obj[key])
+    elif isinstance(obj, (set, frozenset)):
+        h.update(b'set')
+        for item in sorted(obj, key=repr):
+            _update(h, item)
+    elif isinstance(obj, (list, tuple)):
+        h.update(b'list' if isinstance(obj, list) else b'tuple')
+        h.update(str(len(obj)).encode())
+        for item in obj:
+            _update(h, item)
+    elif hasattr(obj, 'data') and not isinstance(obj, (str, bytes)) and isinstance(getattr(obj, 'data'), dict):
+        # FloPy MfList and similar containers keep their periods in 'data'
+        _update(h, obj.data)
+    elif hasattr(obj, '__dict__') and not callable(obj):
+        # Plain helper objects (e.g. a ValidationIndex): hash their state, not their address
+        h.update(type(obj).__name__.encode())
+        _update(h, vars(obj))
+    else:
+        h.update(type(obj).__name__.encode())
+        h.update(repr(obj).encode())
+
+def fingerprint_package(writer, package, extra=None):
+    """
+    Return a hex digest identifying a writer and the package data it would write.
+    writer: the writer function (its module and name are part of the digest).
+    package: a package object, or plain data such as a water accounting dict.
+    extra: optional additional writer inputs (e.g. keyword arguments).
+    Returns None if the data cannot be fingerprinted (see Unfingerprintable); such packages are always rewritten.
+    """
+    h = hashlib.sha256()
+    h.update(f'{writer.__module__}.{writer.__name__}'.encode())
+    try:
+        if isinstance(package, (dict, list)):
+            _update(h, package)
+        else:
+            for attr in FINGERPRINT_ATTRS:
+                value = getattr(package, attr, None)
+                if value is not None:
+                    h.update(attr.encode())
+                    _update(h, value)
+        if extra:
+            _update(h, extra)
+    except Unfingerprintable:
+        return None
+    return h.hexdigest()
+
+def manifest_path(workspace=None):
+    """
+    Return the path of the fingerprint manifest for a workspace.
+    """
+    return MANIFEST_NAME if workspace is None else os.path.join(workspace, MANIFEST_NAME)
+
+def load_manifest(path):
+    """
+    Load a fingerprint manifest, returning an empty dict if it is missing or unreadable.
+    """
+    try:
+        with open(path, 'r') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return manifest if isinstance(manifest, dict) else {}
+
+def save_manifest(path, manifest):
+    """
+    Atomically write a fingerprint manifest.
+    """
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(tmp_path, path)
@@ -3,18 +3,92 @@ FMP input file writer for OWHM.
 Extracts all major FMP blocks from a FloPy FMP package if possible.
 Performs input validation and provides clear error messages.
 """
+import functools
+import numpy as np
+from .validation import ValidationIndex, raise_if_errors
+from .columnar import write_columns
+from .shards import remove_shards, write_shards
+from .package_file import PackageFile, write_rows
+
+DEMAND_COLUMNS = ('per', 'farm_id', 'demand')
 
 def _require_field(obj, field, context):
     if field not in obj:
         raise ValueError(f"Missing required field '{field}' in {context}.")
     return obj[field]
 
-def write_fmp_input(fmp_package, output_path, water_accounting=None):
+def _demand_records(sp_data, farm_ids):
+    """
+    Validate a periods x farms demand matrix and flatten it to (per, farm_id, demand) records.
+    sp_data: a DataFrame indexed by stress period with one column per farm ID, or a 2-D
+    NumPy array with one row per stress period (0, 1, ...) and columns in farm_dict order.
+    Missing (NaN) and negative demands are reported for the first offending period and farm.
+    """
+    if hasattr(sp_data, 'columns'):
+        columns = set(sp_data.columns)
+        for farm_id in farm_ids:
+            if farm_id not in columns:
+                raise ValueError(f"Missing demand for farm {farm_id} in all stress periods.")
+        periods = np.asarray(sp_data.index)
+        values = np.asarray(sp_data[farm_ids])
+    else:
+        values = np.asarray(sp_data)
+        if values.ndim != 2 or values.shape[1] != len(farm_ids):
+            raise ValueError(f"Demand array must have shape (periods, {len(farm_ids)} farms). Got: {values.shape}")
+        periods = np.arange(values.shape[0])
+    if values.dtype.kind not in 'iuf':
+        raise ValueError(f"Demand values must be numeric. Got dtype: {values.dtype}")
+
+    missing = np.argwhere(np.isnan(values)) if values.dtype.kind == 'f' else np.empty((0, 2), dtype=int)
+    if len(missing):
+        row, col = missing[0]
+        raise ValueError(f"Missing demand for farm {farm_ids[col]} in stress period {periods[row]}.")
+    negative = np.argwhere(values < 0)
+    if len(negative):
+        row, col = negative[0]
+        raise ValueError(f"Demand for farm {farm_ids[col]} in stress period {periods[row]} must be non-negative. Got: {values[row, col]}")
+
+    farm_array = np.asarray(farm_ids)
+    records = np.empty(values.size, dtype=[('per', periods.dtype), ('farm_id', farm_array.dtype), ('demand', values.dtype)])
+    records['per'] = np.repeat(periods, len(farm_ids))
+    records['farm_id'] = np.tile(farm_array, len(periods))
+    records['demand'] = values.ravel()
+    return records
+
+def _demand_periods(sp_data, demand_records, farm_ids):
+    """
+    Return (period, rows) pairs of the DEMAND block, where rows are demand records or (per, farm_id, demand) tuples.
+    """
+    if demand_records is None:
+        return [(per, [(per, farm_id, farm_demands[farm_id]) for farm_id in farm_ids])
+                for per, farm_demands in sp_data.items()]
+    # Records are period-major with one row per farm
+    n_farms = len(farm_ids)
+    return [(demand_records['per'][start].item(), demand_records[start:start + n_farms])
+            for start in range(0, len(demand_records), n_farms)]
+
+def _write_demand_period(f, rows):
+    """
+    Write the DEMAND rows of one stress period.
+    """
+    if isinstance(rows, np.ndarray):
+        write_columns(f, rows, DEMAND_COLUMNS)
+    else:
+        write_rows(f, rows)
+
+def write_fmp_input(fmp_package, output_path, water_accounting=None, validation_index=None, shard=False,
+                    max_workers=None, float_precision=None):
     """
     Convert a FloPy FMP package object to an OWHM-compatible FMP input file.
     This version writes all major FMP blocks, extracting what is possible from FloPy.
     Performs input validation and provides clear error messages.
-    Optionally checks water accounting farm IDs for consistency.
+    Optionally checks water accounting farm IDs for consistency, using validation_index
+    (a ValidationIndex shared across writers) if given; all unknown IDs are reported at once.
+    Demand may be a dict of {period: {farm_id: demand}}, or a periods x farms DataFrame
+    or 2-D NumPy array, which is validated and written in bulk.
+    shard: if True, the DEMAND rows of each period are written to their own file (see shards.write_shards),
+        referenced by OPEN/CLOSE; shards are written concurrently on max_workers threads.
+    float_precision: significant digits for float values; None writes them as str() does.
     """
     # FARM block
     farm_dict = getattr(fmp_package, 'farm_dict', None)
@@ -34,22 +108,28 @@ def write_fmp_input(fmp_package, output_path, water_accounting=None):
         sp_data = getattr(fmp_package, 'irrigation', None)
     if sp_data is None:
         raise ValueError("FMP package is missing 'stress_period_data' or 'irrigation'.")
-    for per, farm_demands in sp_data.items():
-        for farm_id in farm_ids:
-            if farm_id not in farm_demands:
-                raise ValueError(f"Missing demand for farm {farm_id} in stress period {per}.")
-            demand = farm_demands[farm_id]
-            if not (isinstance(demand, (int, float)) and demand >= 0):
-                raise ValueError(f"Demand for farm {farm_id} in stress period {per} must be non-negative. Got: {demand}")
+    demand_records = None
+    if hasattr(sp_data, 'columns') or isinstance(sp_data, np.ndarray):
+        demand_records = _demand_records(sp_data, farm_ids)
+    else:
+        for per, farm_demands in sp_data.items():
+            for farm_id in farm_ids:
+                if farm_id not in farm_demands:
+                    raise ValueError(f"Missing demand for farm {farm_id} in stress period {per}.")
+                demand = farm_demands[farm_id]
+                if not (isinstance(demand, (int, float)) and demand >= 0):
+                    raise ValueError(f"Demand for farm {farm_id} in stress period {per} must be non-negative. Got: {demand}")
 
     # Cross-check: water accounting farm IDs must exist in FMP
     if water_accounting and isinstance(water_accounting, dict):
+        if validation_index is None or not validation_index.has('farm'):
+            validation_index = ValidationIndex(farm_ids=farm_ids)
+        errors = []
         for acc_type, records in water_accounting.items():
             if acc_type.upper() == 'FARM':
-                for rec in records:
-                    farm_id = rec.get('object_id', None)
-                    if farm_id not in farm_ids:
-                        raise ValueError(f"Water accounting refers to unknown farm_id {farm_id} not in FMP farm_dict.")
+                object_ids = [rec.get('object_id', None) for rec in records]
+                errors.extend(validation_index.check('farm', object_ids, f'Water accounting {acc_type}'))
+        raise_if_errors(errors)
 
     # SUPPLY block
     supply_data = getattr(fmp_package, 'supply', None)
@@ -84,123 +164,90 @@ def write_fmp_input(fmp_package, output_path, water_accounting=None):
     # AUXILIARY block
     auxiliary_data = getattr(fmp_package, 'auxiliary', None)
 
-    with open(output_path, 'w') as f:
-        f.write('# OWHM FMP Input File (auto-generated)\n')
+    demand_periods = _demand_periods(sp_data, demand_records, farm_ids)
+    shards = {}
+    if shard:
+        blocks = [(per, functools.partial(_write_demand_period, rows=rows)) for per, rows in demand_periods]
+        shards = write_shards(output_path, blocks, max_workers, float_precision)
+
+    with PackageFile(output_path, 'FMP', float_precision) as f:
 
         # FARM block
-        f.write('BEGIN FARM\n')
-        f.write('  # ID   AREA   NAME\n')
-        for farm_id in farm_ids:
-            info = farm_dict[farm_id]
-            area = info['area']
-            name = info['name']
-            f.write(f'  {farm_id}   {area}   {name}\n')
-        f.write('END FARM\n\n')
+        with f.block('FARM', 'ID   AREA   NAME'):
+            f.rows((farm_id, farm_dict[farm_id]['area'], farm_dict[farm_id]['name']) for farm_id in farm_ids)
 
         # DEMAND block
-        f.write('BEGIN DEMAND\n')
-        f.write('  # PER   FARM_ID   DEMAND\n')
-        for per, farm_demands in sp_data.items():
-            for farm_id in farm_ids:
-                demand = farm_demands[farm_id]
-                f.write(f'  {per}   {farm_id}   {demand}\n')
-        f.write('END DEMAND\n\n')
+        with f.block('DEMAND', 'PER   FARM_ID   DEMAND'):
+            if shard:
+                for per, _ in demand_periods:
+                    f.line(f'OPEN/CLOSE {shards[per]}')
+            elif demand_records is not None:
+                f.columns(demand_records, DEMAND_COLUMNS)
+            else:
+                for _, rows in demand_periods:
+                    f.rows(rows)
 
         # SUPPLY block
-        f.write('BEGIN SUPPLY\n')
-        f.write('  # PER   FARM_ID   SUPPLY_TYPE   AMOUNT\n')
-        if supply_data:
-            for per, farm_supplies in supply_data.items():
-                for farm_id, supply in farm_supplies.items():
-                    # Example: supply could be a dict with type and amount
-                    supply_type = supply.get('type', 'UNKNOWN')
-                    amount = supply.get('amount', 0.0)
-                    f.write(f'  {per}   {farm_id}   {supply_type}   {amount}\n')
-        else:
-            f.write('  # TODO: Provide supply data for each farm and stress period\n')
-        f.write('END SUPPLY\n\n')
+        with f.block('SUPPLY', 'PER   FARM_ID   SUPPLY_TYPE   AMOUNT'):
+            if supply_data:
+                # Example: supply could be a dict with type and amount
+                f.rows((per, farm_id, supply.get('type', 'UNKNOWN'), supply.get('amount', 0.0))
+                       for per, farm_supplies in supply_data.items() for farm_id, supply in farm_supplies.items())
+            else:
+                f.line('# TODO: Provide supply data for each farm and stress period')
 
         # CROP block
-        f.write('BEGIN CROP\n')
-        f.write('  # ID   NAME   ET   ROOT_DEPTH   ETC\n')
-        if crop_data:
-            for crop_id, crop in crop_data.items():
-                name = crop.get('name', str(crop_id))
-                et = crop.get('et', 0.0)
-                root_depth = crop.get('root_depth', 0.0)
+        with f.block('CROP', 'ID   NAME   ET   ROOT_DEPTH   ETC'):
+            if crop_data:
                 # Add more fields as needed
-                f.write(f'  {crop_id}   {name}   {et}   {root_depth}\n')
-        else:
-            f.write('  # TODO: Provide crop data\n')
-        f.write('END CROP\n\n')
+                f.rows((crop_id, crop.get('name', str(crop_id)), crop.get('et', 0.0), crop.get('root_depth', 0.0))
+                       for crop_id, crop in crop_data.items())
+            else:
+                f.line('# TODO: Provide crop data')
 
         # SOIL block
-        f.write('BEGIN SOIL\n')
-        f.write('  # ID   NAME   FIELD_CAPACITY   WILTING_POINT   ETC\n')
-        if soil_data:
-            for soil_id, soil in soil_data.items():
-                name = soil.get('name', str(soil_id))
-                fc = soil.get('field_capacity', 0.0)
-                wp = soil.get('wilting_point', 0.0)
+        with f.block('SOIL', 'ID   NAME   FIELD_CAPACITY   WILTING_POINT   ETC'):
+            if soil_data:
                 # Add more fields as needed
-                f.write(f'  {soil_id}   {name}   {fc}   {wp}\n')
-        else:
-            f.write('  # TODO: Provide soil data\n')
-        f.write('END SOIL\n\n')
+                f.rows((soil_id, soil.get('name', str(soil_id)), soil.get('field_capacity', 0.0),
+                        soil.get('wilting_point', 0.0)) for soil_id, soil in soil_data.items())
+            else:
+                f.line('# TODO: Provide soil data')
 
         # WELL block
-        f.write('BEGIN WELL\n')
-        f.write('  # FARM_ID   WELL_ID   LAYER   ROW   COL   ETC\n')
-        if well_data:
-            for farm_id, wells in well_data.items():
-                for well in wells:
-                    well_id = well.get('well_id', 'UNKNOWN')
-                    layer = well.get('layer', 1)
-                    row = well.get('row', 1)
-                    col = well.get('col', 1)
-                    # Add more fields as needed
-                    f.write(f'  {farm_id}   {well_id}   {layer}   {row}   {col}\n')
-        else:
-            f.write('  # TODO: Provide well data\n')
-        f.write('END WELL\n\n')
+        with f.block('WELL', 'FARM_ID   WELL_ID   LAYER   ROW   COL   ETC'):
+            if well_data:
+                # Add more fields as needed
+                f.rows((farm_id, well.get('well_id', 'UNKNOWN'), well.get('layer', 1), well.get('row', 1),
+                        well.get('col', 1)) for farm_id, wells in well_data.items() for well in wells)
+            else:
+                f.line('# TODO: Provide well data')
 
         # DELIVERY block
-        f.write('BEGIN DELIVERY\n')
-        f.write('  # FARM_ID   DELIVERY_TYPE   AMOUNT   ETC\n')
-        if delivery_data:
-            for farm_id, deliveries in delivery_data.items():
-                for delivery in deliveries:
-                    delivery_type = delivery.get('type', 'UNKNOWN')
-                    amount = delivery.get('amount', 0.0)
-                    # Add more fields as needed
-                    f.write(f'  {farm_id}   {delivery_type}   {amount}\n')
-        else:
-            f.write('  # TODO: Provide delivery system data\n')
-        f.write('END DELIVERY\n\n')
+        with f.block('DELIVERY', 'FARM_ID   DELIVERY_TYPE   AMOUNT   ETC'):
+            if delivery_data:
+                # Add more fields as needed
+                f.rows((farm_id, delivery.get('type', 'UNKNOWN'), delivery.get('amount', 0.0))
+                       for farm_id, deliveries in delivery_data.items() for delivery in deliveries)
+            else:
+                f.line('# TODO: Provide delivery system data')
 
         # WATER_RIGHTS block
-        f.write('BEGIN WATER_RIGHTS\n')
-        f.write('  # FARM_ID   RIGHT_TYPE   AMOUNT   ETC\n')
-        if water_rights_data:
-            for farm_id, rights in water_rights_data.items():
-                for right in rights:
-                    right_type = right.get('type', 'UNKNOWN')
-                    amount = right.get('amount', 0.0)
-                    # Add more fields as needed
-                    f.write(f'  {farm_id}   {right_type}   {amount}\n')
-        else:
-            f.write('  # TODO: Provide water rights data\n')
-        f.write('END WATER_RIGHTS\n\n')
+        with f.block('WATER_RIGHTS', 'FARM_ID   RIGHT_TYPE   AMOUNT   ETC'):
+            if water_rights_data:
+                # Add more fields as needed
+                f.rows((farm_id, right.get('type', 'UNKNOWN'), right.get('amount', 0.0))
+                       for farm_id, rights in water_rights_data.items() for right in rights)
+            else:
+                f.line('# TODO: Provide water rights data')
 
         # AUXILIARY block
-        f.write('BEGIN AUXILIARY\n')
-        f.write('  # FARM_ID   AUX_NAME   VALUE\n')
-        if auxiliary_data:
-            for farm_id, auxs in auxiliary_data.items():
-                for aux in auxs:
-                    aux_name = aux.get('name', 'UNKNOWN')
-                    value = aux.get('value', 0.0)
-                    f.write(f'  {farm_id}   {aux_name}   {value}\n')
-        else:
-            f.write('  # TODO: Provide auxiliary data\n')
-        f.write('END AUXILIARY\n\n') 
\ No newline at end of file
+        with f.block('AUXILIARY', 'FARM_ID   AUX_NAME   VALUE'):
+            if auxiliary_data:
+                f.rows((farm_id, aux.get('name', 'UNKNOWN'), aux.get('value', 0.0))
+                       for farm_id, auxs in auxiliary_data.items() for aux in auxs)
+            else:
+                f.line('# TODO: Provide auxiliary data') 
+    if not shard:
+        # Shards of an earlier sharded write are no longer referenced
+        remove_shards(output_path)
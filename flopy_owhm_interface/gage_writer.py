@@ -3,16 +3,18 @@ GAGE input file writer for OWHM.
 Extracts gage data from a FloPy GAGE package if possible.
 Performs input validation and provides clear error messages.
 """
+from .package_file import PackageFile
 
 def _require_field(obj, field, context):
     if field not in obj:
         raise ValueError(f"Missing required field '{field}' in {context}.")
     return obj[field]
 
-def write_gage_input(gage_package, output_path):
+def write_gage_input(gage_package, output_path, float_precision=None):
     """
     Convert a FloPy GAGE package object to an OWHM-compatible GAGE input file.
     Performs input validation and provides clear error messages.
+    float_precision: significant digits for float values; None writes them as str() does.
     """
     gages = getattr(gage_package, 'stress_period_data', None)
     if gages is None:
@@ -28,15 +30,8 @@ def write_gage_input(gage_package, output_path):
             if not isinstance(outtype, int) or outtype < 0:
                 raise ValueError(f"outtype must be a non-negative integer in stress_period_data[{per}][{idx}]. Got: {outtype}")
 
-    with open(output_path, 'w') as f:
-        f.write('# OWHM GAGE Input File (auto-generated)\n')
+    with PackageFile(output_path, 'GAGE', float_precision) as f:
         # GAGE block
-        f.write('BEGIN GAGE\n')
-        f.write('  # UNIT   OUTTYPE\n')
-        for per, gage_list in gages.items():
-            for gage in gage_list:
-                unit = gage['unit']
-                outtype = gage['outtype']
-                f.write(f'  {unit}   {outtype}\n')
-        f.write('END GAGE\n\n')
+        with f.block('GAGE', 'UNIT   OUTTYPE'):
+            f.rows((gage['unit'], gage['outtype']) for gage_list in gages.values() for gage in gage_list)
         # TODO: Add more GAGE blocks as needed (with validation) 
\ No newline at end of file
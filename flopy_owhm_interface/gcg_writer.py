@@ -3,16 +3,18 @@ GCG input file writer for OWHM.
 Extracts GCG solver data from a FloPy GCG package if possible.
 Performs input validation and provides clear error messages.
 """
+from .package_file import PackageFile
 
 def _require_field(obj, field, context):
     if field not in obj:
         raise ValueError(f"Missing required field '{field}' in {context}.")
     return obj[field]
 
-def write_gcg_input(gcg_package, output_path):
+def write_gcg_input(gcg_package, output_path, float_precision=None):
     """
     Convert a FloPy GCG package object to an OWHM-compatible GCG input file.
     Performs input validation and provides clear error messages.
+    float_precision: significant digits for float values; None writes them as str() does.
     """
     gcgs = getattr(gcg_package, 'parameters', None)
     if gcgs is None:
@@ -37,11 +39,8 @@ def write_gcg_input(gcg_package, output_path):
     if not isinstance(iprgcg, int):
         raise ValueError(f"iprgcg must be an integer in GCG parameters. Got: {iprgcg}")
 
-    with open(output_path, 'w') as f:
-        f.write('# OWHM GCG Input File (auto-generated)\n')
+    with PackageFile(output_path, 'GCG', float_precision) as f:
         # GCG block
-        f.write('BEGIN GCG\n')
-        f.write('  # MXITER   ITER1   ISOLVE   CCLOSE   IPRGCG\n')
-        f.write(f'  {mxiter}   {iter1}   {isolve}   {cclose}   {iprgcg}\n')
-        f.write('END GCG\n\n')
+        with f.block('GCG', 'MXITER   ITER1   ISOLVE   CCLOSE   IPRGCG'):
+            f.rows([(mxiter, iter1, isolve, cclose, iprgcg)])
         # TODO: Add more GCG blocks as needed (with validation) 
\ No newline at end of file
@@ -3,21 +3,53 @@ GHB input file writer for OWHM.
 Extracts general-head boundary data from a FloPy GHB package if possible.
 Performs input validation and provides clear error messages.
 """
+import functools
+import operator
+from .columnar import (
+    stress_period_items, is_columnar, require_columns,
+    check_column, check_cell_columns, write_columns, REUSE_MARKER, repeated_periods,
+)
+from .shards import remove_shards, write_shards
+from .package_file import PackageFile, write_rows
+
+GHB_COLUMNS = ('k', 'i', 'j', 'bhead', 'cond')
 
 def _require_field(obj, field, context):
     if field not in obj:
         raise ValueError(f"Missing required field '{field}' in {context}.")
     return obj[field]
 
-def write_ghb_input(ghb_package, output_path):
+def _write_period(f, ghb_list):
+    """
+    Write the rows of one stress period.
+    """
+    if is_columnar(ghb_list):
+        write_columns(f, ghb_list, GHB_COLUMNS)
+    else:
+        write_rows(f, map(operator.itemgetter(*GHB_COLUMNS), ghb_list))
+
+def write_ghb_input(ghb_package, output_path, reuse_periods=False, shard=False, max_workers=None,
+                    float_precision=None):
     """
     Convert a FloPy GHB package object to an OWHM-compatible GHB input file.
     Performs input validation and provides clear error messages.
+    reuse_periods: if True, each period starts with a 'PERIOD n' line, and a period identical to the one
+        before it is written as a reuse marker under its header.
+    shard: if True, each period is written to its own file (see shards.write_shards), referenced by OPEN/CLOSE;
+        shards are written concurrently on max_workers threads and only rewritten when their content changes.
+    float_precision: significant digits for float values; None writes them as str() does.
     """
     ghbs = getattr(ghb_package, 'stress_period_data', None)
     if ghbs is None:
         raise ValueError("GHB package is missing 'stress_period_data'.")
-    for per, ghb_list in ghbs.items():
+    for per, ghb_list in stress_period_items(ghbs):
+        if is_columnar(ghb_list):
+            context = f'stress_period_data[{per}]'
+            require_columns(ghb_list, GHB_COLUMNS, context)
+            check_cell_columns(ghb_list, context)
+            check_column(ghb_list, 'bhead', context, "bhead must be a number")
+            check_column(ghb_list, 'cond', context, "cond must be positive", condition=lambda v: v > 0)
+            continue
         for idx, ghb in enumerate(ghb_list):
             _require_field(ghb, 'k', f'stress_period_data[{per}][{idx}]')
             _require_field(ghb, 'i', f'stress_period_data[{per}][{idx}]')
@@ -40,18 +72,29 @@ def write_ghb_input(ghb_package, output_path):
             if not (isinstance(cond, (int, float)) and cond > 0):
                 raise ValueError(f"cond must be positive in stress_period_data[{per}][{idx}]. Got: {cond}")
 
-    with open(output_path, 'w') as f:
-        f.write('# OWHM GHB Input File (auto-generated)\n')
+    # Periods identical to the previous one, found by hashing each period's values
+    repeated = set()
+    if reuse_periods:
+        repeated = repeated_periods(stress_period_items(ghbs), GHB_COLUMNS)
+    shards = {}
+    if shard:
+        blocks = [(per, functools.partial(_write_period, ghb_list=ghb_list))
+                  for per, ghb_list in stress_period_items(ghbs) if per not in repeated]
+        shards = write_shards(output_path, blocks, max_workers, float_precision)
+
+    with PackageFile(output_path, 'GHB', float_precision) as f:
         # GHB block
-        f.write('BEGIN GHB\n')
-        f.write('  # LAYER   ROW   COL   BHEAD   COND   ETC\n')
-        for per, ghb_list in ghbs.items():
-            for ghb in ghb_list:
-                layer = ghb['k']
-                row = ghb['i']
-                col = ghb['j']
-                bhead = ghb['bhead']
-                cond = ghb['cond']
-                f.write(f'  {layer}   {row}   {col}   {bhead}   {cond}\n')
-        f.write('END GHB\n\n')
-        # TODO: Add more GHB blocks as needed (with validation) 
\ No newline at end of file
+        with f.block('GHB', 'LAYER   ROW   COL   BHEAD   COND   ETC'):
+            for per, ghb_list in stress_period_items(ghbs):
+                if reuse_periods:
+                    f.line(f'PERIOD {per}')
+                if per in repeated:
+                    f.write(REUSE_MARKER)
+                elif shard:
+                    f.line(f'OPEN/CLOSE {shards[per]}')
+                else:
+                    _write_period(f, ghb_list)
+        # TODO: Add more GHB blocks as needed (with validation)
+    if not shard:
+        # Shards of an earlier sharded write are no longer referenced
+        remove_shards(output_path)
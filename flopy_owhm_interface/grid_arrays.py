@@ -0,0 +1,281 @@
+"""
+Dense grid array input and output for OWHM grid-based writers (RCH, EVT, UZF, SSM).
+Lets a stress period be given as a full-grid NumPy array, a memory-mapped array
+or the path of a '.npy' file (opened with mmap_mode='r'), and streams it to the
+output file a block of rows at a time, so no period is expanded into records.
+Periods covering most of the grid can be written as dense 2-D array blocks, inline
+or as OPEN/CLOSE references to external array files, instead of one line per cell.
+"""
+import os
+import numpy as np
+from .columnar import WRITE_BUFFER_SIZE, write_columns
+from .instrumentation import count_bytes, count_records
+
+# Number of grid cells formatted per write
+GRID_CHUNK_CELLS = 1 << 18
+
+def _is_grid_value(value):
+    """
+    Return True if value can be one field of a grid period: an unstructured ndarray, a '.npy' path or a scalar.
+    """
+    if isinstance(value, np.ndarray):
+        return value.dtype.names is None
+    if isinstance(value, (str, os.PathLike)):
+        return os.fspath(value).endswith('.npy')
+    return isinstance(value, (int, float, np.number)) and not isinstance(value, bool)
+
+def is_grid_period(records, value_fields=()):
+    """
+    Return True if a period is given as grid arrays rather than records: an unstructured
+    ndarray, a '.npy' path, or a dict of the package's value_fields (e.g. ('surf', 'evtr'))
+    to arrays, paths or scalars. Any other dict, such as a single record with 'k', 'i', 'j'
+    or a dict keyed by cell, is not a grid period.
+    """
+    if isinstance(records, dict):
+        return bool(records) and set(records) <= set(value_fields) and all(map(_is_grid_value, records.values()))
+    return not isinstance(records, (int, float, np.number)) and _is_grid_value(records)
+
+def load_grid(value):
+    """
+    Return a grid value as an array; '.npy' paths are memory-mapped, not read.
+    """
+    if isinstance(value, (str, os.PathLike)):
+        return np.load(value, mmap_mode='r')
+    return value
+
+def grid_fields(records, value_fields, context):
+    """
+    Return a dict of field name to array (or scalar) for a grid period.
+    A bare array or path is accepted when the package has a single value field.
+    """
+    if not isinstance(records, dict):
+        if len(value_fields) != 1:
+            raise ValueError(f"Grid input in {context} must be a dict with fields {', '.join(value_fields)}.")
+        records = {value_fields[0]: records}
+    fields = {}
+    for field in value_fields:
+        if field not in records:
+            raise ValueError(f"Missing required field '{field}' in {context}.")
+        fields[field] = load_grid(records[field])
+    return fields
+
+def check_grid_period(fields, context, max_ndim=3, int_fields=()):
+    """
+    Check dtypes and shapes of a grid period without reading its values.
+    Arrays must be (nrow, ncol) or, if max_ndim is 3, (nlay, nrow, ncol); scalars are broadcast.
+    Returns the common 3-D shape (nlay, nrow, ncol), with nlay 1 for 2-D arrays.
+    """
+    shape = None
+    for field, value in fields.items():
+        kinds = 'iu' if field in int_fields else 'iuf'
+        if np.ndim(value) == 0:
+            if np.asarray(value).dtype.kind not in kinds:
+                raise ValueError(f"{field} must be {'an integer' if field in int_fields else 'a number'} in {context}. Got: {value}")
+            continue
+        if value.dtype.kind not in kinds:
+            raise ValueError(f"{field} must be a numeric array in {context}. Got dtype: {value.dtype}")
+        if not 2 <= value.ndim <= max_ndim:
+            raise ValueError(f"{field} array in {context} must have 2{' or 3' if max_ndim == 3 else ''} dimensions. Got shape: {value.shape}")
+        if shape is not None and value.shape != shape:
+            raise ValueError(f"{field} array in {context} has shape {value.shape}, expected {shape}.")
+        shape = value.shape
+    if shape is None:
+        raise ValueError(f"Grid input in {context} needs at least one array.")
+    return (1,) + shape if len(shape) == 2 else shape
+
+def write_grid_period(f, fields, index_fields, value_fields, context, conditions=None):
+    """
+    Stream one grid period as rows of index_fields (1-based, e.g. ('k', 'i', 'j') or ('i', 'j'))
+    followed by value_fields, a block of rows at a time. Cells where any value field is NaN are skipped.
+    conditions: optional dict of field to (message, callable returning a mask of valid values);
+    the first offending cell raises ValueError.
+    """
+    nlay, nrow, ncol = check_grid_period(fields, context)
+    rows_per_chunk = max(1, GRID_CHUNK_CELLS // ncol)
+    dtype = [(name, np.int64) for name in index_fields] + [(name, np.result_type(fields[name])) for name in value_fields]
+    for layer in range(nlay):
+        for start in range(0, nrow, rows_per_chunk):
+            stop = min(start + rows_per_chunk, nrow)
+            block = {}
+            for name, value in fields.items():
+                if np.ndim(value) == 0:
+                    block[name] = np.full((stop - start, ncol), value)
+                else:
+                    block[name] = np.asarray(value[layer, start:stop] if value.ndim == 3 else value[start:stop])
+            mask = np.ones((stop - start, ncol), dtype=bool)
+            for name in value_fields:
+                if block[name].dtype.kind == 'f':
+                    mask &= ~np.isnan(block[name])
+            rows, cols = np.nonzero(mask)
+            for name, (message, condition) in (conditions or {}).items():
+                bad = np.flatnonzero(~condition(block[name][rows, cols]))
+                if bad.size:
+                    cell = (layer + 1, int(start + rows[bad[0]] + 1), int(cols[bad[0]] + 1))
+                    raise ValueError(f"{message} in {context} at cell {cell}. Got: {block[name][rows[bad[0]], cols[bad[0]]]}")
+            out = np.empty(rows.size, dtype=dtype)
+            index = {'k': layer + 1, 'i': start + rows + 1, 'j': cols + 1}
+            for name in index_fields:
+                out[name] = index[name]
+            for name in value_fields:
+                out[name] = block[name][rows, cols]
+            write_columns(f, out, index_fields + value_fields)
+
+# Array output modes of the grid-based writers (RCH, EVT, UZF)
+ARRAY_MODES = ('auto', 'list', 'array', 'external')
+
+# Fraction of the model grid's cells a period must exceed for 'auto' to choose array output
+ARRAY_COVERAGE = 0.5
+
+def _grid_shape3(shape):
+    return (1,) + tuple(shape) if len(shape) == 2 else tuple(shape)
+
+def records_to_grid(records, index_fields, value_fields, grid_shape, context):
+    """
+    Scatter one period of records (dicts or a structured array) into dense arrays.
+    Returns (fields, layers): a dict of field to (nlay, nrow, ncol) array, NaN where no record is given,
+    and the 0-based layers that hold records. Returns None if any cell is given more than once.
+    """
+    shape = _grid_shape3(grid_shape)
+    if isinstance(records, np.ndarray):
+        columns = {name: records[name] for name in index_fields + value_fields}
+    else:
+        columns = {name: np.array([record[name] for record in records]) for name in index_fields + value_fields}
+    layer = columns['k'] - 1 if 'k' in index_fields else np.zeros(len(columns['i']), dtype=np.int64)
+    try:
+        flat = np.ravel_multi_index((layer, columns['i'] - 1, columns['j'] - 1), shape)
+    except ValueError:
+        raise ValueError(f"Cells in {context} are outside the grid {shape}.") from None
+    if np.unique(flat).size < flat.size:
+        return None
+    fields = {}
+    for name in value_fields:
+        fields[name] = np.full(shape, np.nan)
+        fields[name].flat[flat] = columns[name]
+    return fields, np.unique(layer).tolist()
+
+def _set_mask(value, layer, nrow, ncol):
+    """
+    Return the mask of cells of one layer where a field is set (not NaN).
+    """
+    if np.ndim(value) == 0:
+        return np.ones((nrow, ncol), dtype=bool)
+    value = np.asarray(value[layer] if value.ndim == 3 else value)
+    return ~np.isnan(value) if value.dtype.kind == 'f' else np.ones((nrow, ncol), dtype=bool)
+
+def grid_coverage(fields, value_fields, grid_shape=None):
+    """
+    Return the fraction of the grid's cells where every value field is set (not NaN).
+    grid_shape: (nlay, nrow, ncol) or (nrow, ncol) of the model; defaults to the shape of the arrays.
+    Layers beyond those of the arrays count as uncovered.
+    """
+    nlay, nrow, ncol = check_grid_period(fields, 'grid coverage')
+    total = int(np.prod(_grid_shape3(grid_shape))) if grid_shape is not None else nlay * nrow * ncol
+    covered = 0
+    for layer in range(nlay):
+        mask = np.ones((nrow, ncol), dtype=bool)
+        for name in value_fields:
+            mask &= _set_mask(fields[name], layer, nrow, ncol)
+        covered += int(np.count_nonzero(mask))
+    return covered / total if total else 0.0
+
+def needs_fill(fields, value_fields, fill_fields, layers=None):
+    """
+    Return the first value field outside fill_fields with a missing (NaN) cell in the given layers
+    (default all), or None if a dense array of every other field needs no invented values.
+    """
+    nlay, nrow, ncol = check_grid_period(fields, 'grid fill')
+    for name in value_fields:
+        if name in fill_fields:
+            continue
+        for layer in (range(nlay) if layers is None else layers):
+            if not _set_mask(fields[name], layer, nrow, ncol).all():
+                return name
+    return None
+
+def write_array_period(f, per, records, index_fields, value_fields, context, array_output='auto',
+                       grid_shape=None, output_path=None, conditions=None, fill_fields=()):
+    """
+    Write one validated period as dense array blocks if array_output calls for it; returns True if written.
+    array_output: 'list' never writes arrays; 'array' writes INTERNAL array blocks; 'external' writes
+    OPEN/CLOSE references to text array files next to output_path; 'auto' writes INTERNAL arrays when the
+    period covers more than ARRAY_COVERAGE of the cells of the model grid.
+    grid_shape: (nlay, nrow, ncol) or (nrow, ncol), needed to write list periods as arrays.
+    fill_fields: value fields (rates) whose cells without a value are written as 0.0. A period missing cells
+    of any other field, or giving a cell twice, stays a list in 'auto' mode and raises ValueError otherwise.
+    f may be a PackageFile, whose float_precision also applies to external array files.
+    """
+    if array_output not in ARRAY_MODES:
+        raise ValueError(f"array_output must be one of {', '.join(ARRAY_MODES)}. Got: {array_output}")
+    if array_output == 'list':
+        return False
+    layers = None
+    if is_grid_period(records, value_fields):
+        fields = grid_fields(records, value_fields, context)
+    elif grid_shape is None:
+        if array_output == 'auto':
+            return False
+        raise ValueError(f"grid_shape is required to write list records in {context} as arrays.")
+    else:
+        # A period with fewer records than the coverage threshold stays a list; skip scattering it
+        if array_output == 'auto' and len(records) <= ARRAY_COVERAGE * np.prod(_grid_shape3(grid_shape)):
+            return False
+        scattered = records_to_grid(records, index_fields, value_fields, grid_shape, context)
+        if scattered is None:
+            if array_output == 'auto':
+                return False
+            raise ValueError(f"Cells are given more than once in {context}; cannot write them as an array.")
+        fields, layers = scattered
+    if array_output == 'auto' and grid_coverage(fields, value_fields, grid_shape) <= ARRAY_COVERAGE:
+        return False
+    unfilled = needs_fill(fields, value_fields, fill_fields, layers)
+    if unfilled is not None:
+        if array_output == 'auto':
+            return False
+        raise ValueError(f"{unfilled} is missing for some cells in {context}; cannot write it as an array.")
+
+    nlay, nrow, ncol = check_grid_period(fields, context)
+    layered = 'k' in index_fields
+    float_precision = getattr(f, 'float_precision', None)
+    rows_per_chunk = max(1, GRID_CHUNK_CELLS // ncol)
+    for layer in (range(nlay) if layers is None else layers):
+        for name in value_fields:
+            value = fields[name]
+            label = f'ARRAY {name.upper()} PERIOD {per}' + (f' LAYER {layer + 1}' if layered else '')
+            f.write(f'  {label}\n')
+            if np.ndim(value) == 0:
+                f.write(f'  CONSTANT {value}\n')
+                continue
+            if array_output == 'external':
+                stem = os.path.splitext(output_path)[0]
+                array_path = f'{stem}_{name}_{per}' + (f'_{layer + 1}' if layered else '') + '.txt'
+                f.write(f'  OPEN/CLOSE {os.path.basename(array_path)} 1.0 (FREE) -1\n')
+                with open(array_path, 'w', buffering=WRITE_BUFFER_SIZE) as af:
+                    _write_array_rows(af, value, layer, nrow, rows_per_chunk, name, context, conditions,
+                                      float_precision)
+                count_bytes(os.path.getsize(array_path))
+            else:
+                f.write('  INTERNAL 1.0 (FREE) -1\n')
+                _write_array_rows(f, value, layer, nrow, rows_per_chunk, name, context, conditions, float_precision)
+    return True
+
+def _write_array_rows(f, value, layer, nrow, rows_per_chunk, name, context, conditions, float_precision):
+    """
+    Write one layer of a grid array a block of rows at a time, with missing (NaN) cells as 0.0
+    (only reached for fill fields; see write_array_period).
+    """
+    for start in range(0, nrow, rows_per_chunk):
+        stop = min(start + rows_per_chunk, nrow)
+        block = np.asarray(value[layer, start:stop] if value.ndim == 3 else value[start:stop])
+        if block.dtype.kind == 'f':
+            missing = np.isnan(block)
+            if missing.any():
+                block = np.where(missing, 0.0, block)
+        if conditions and name in conditions:
+            message, condition = conditions[name]
+            bad = np.argwhere(~condition(block))
+            if bad.size:
+                row, col = bad[0]
+                cell = (layer + 1, int(start + row + 1), int(col + 1))
+                raise ValueError(f"{message} in {context} at cell {cell}. Got: {block[row, col]}")
+        np.savetxt(f, block, fmt='%s' if float_precision is None or block.dtype.kind != 'f' else f'%.{float_precision}g')
+        count_records(block.size)
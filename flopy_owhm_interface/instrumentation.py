@@ -0,0 +1,262 @@
+"""
+Per-package timing and throughput instrumentation for OWHM writers and parsers.
+While a package is written, a probe in the current context collects the number of
+records written, the bytes written and the time spent inside the package file, so
+validation time can be told apart from formatting and I/O time. Timings are gathered
+in a TimingReport that can be summarized or exported as JSON or a Chrome trace.
+"""
+import contextvars
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+_current_probe = contextvars.ContextVar('owhm_probe', default=None)
+
+class PackageProbe:
+    """
+    Counters for one package write, updated by PackageFile and the row/array helpers.
+    Shared by shard writer threads, so updates are locked.
+    """
+    def __init__(self):
+        self.records = 0
+        self.bytes = 0
+        self.io_start = None
+        self.io_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def add_records(self, count):
+        with self._lock:
+            self.records += count
+
+    def add_bytes(self, count):
+        with self._lock:
+            self.bytes += count
+
+    def add_io(self, start, seconds):
+        """
+        Record one span of time spent writing files; start is a time.time() timestamp.
+        """
+        with self._lock:
+            if self.io_start is None:
+                self.io_start = start
+            self.io_seconds += seconds
+
+def current_probe():
+    """
+    Return the probe of the package being written in this context, or None when not instrumented.
+    """
+    return _current_probe.get()
+
+def count_records(count):
+    """
+    Add count written records to the current probe, if any.
+    """
+    probe = _current_probe.get()
+    if probe is not None:
+        probe.add_records(count)
+
+def count_bytes(count):
+    """
+    Add count written bytes to the current probe, if any.
+    """
+    probe = _current_probe.get()
+    if probe is not None:
+        probe.add_bytes(count)
+
+@contextmanager
+def io_span():
+    """
+    Count the time spent in the block as I/O time of the current probe, if any.
+    """
+    start = time.time()
+    begin = time.perf_counter()
+    try:
+        yield
+    finally:
+        probe = _current_probe.get()
+        if probe is not None:
+            probe.add_io(start, time.perf_counter() - begin)
+
+@contextmanager
+def probing():
+    """
+    Install a new PackageProbe for the duration of the block and yield it.
+    """
+    probe = PackageProbe()
+    token = _current_probe.set(probe)
+    try:
+        yield probe
+    finally:
+        _current_probe.reset(token)
+
+class PackageTiming:
+    """
+    Timing of one package writer or output parser.
+    kind: 'write', 'parse' or 'validate' (the model-wide grid check). start: time.time() timestamp at which it started.
+    duration: wall time in seconds. io_seconds: time spent formatting and writing the package file and its
+    shard/array files, or reading the output; validation_seconds: the rest, mostly input validation.
+    records: rows written or parsed; bytes: bytes written or read (None if unknown).
+    error: the exception message if the writer or parser failed.
+    """
+    def __init__(self, name, kind, path, start, duration, io_seconds=0.0, io_start=None, records=None,
+                 bytes=None, error=None, pid=None, thread=None):
+        self.name = name
+        self.kind = kind
+        self.path = path
+        self.start = start
+        self.duration = duration
+        self.io_seconds = io_seconds
+        self.io_start = io_start
+        self.records = records
+        self.bytes = bytes
+        self.error = error
+        self.pid = os.getpid() if pid is None else pid
+        self.thread = threading.get_ident() if thread is None else thread
+
+    @property
+    def validation_seconds(self):
+        return max(0.0, self.duration - self.io_seconds)
+
+    @property
+    def bytes_per_sec(self):
+        if self.bytes is None or self.duration <= 0:
+            return None
+        return self.bytes / self.duration
+
+    def to_dict(self):
+        return {
+            'name': self.name, 'kind': self.kind, 'path': self.path, 'start': self.start,
+            'duration': self.duration, 'validation_seconds': self.validation_seconds,
+            'io_seconds': self.io_seconds, 'records': self.records, 'bytes': self.bytes,
+            'bytes_per_sec': self.bytes_per_sec, 'error': self.error,
+        }
+
+    def __repr__(self):
+        return f"PackageTiming({self.kind} {self.name}: {self.duration:.4f}s, {self.records} records, {self.bytes} bytes)"
+
+def timed_write(name, path, writer, args, kwargs):
+    """
+    Run one package writer under a probe and return its PackageTiming.
+    Raises the writer's exception, with the timing attached as its 'owhm_timing' attribute.
+    Defined at module level so it can be submitted to process pools.
+    """
+    with probing() as probe:
+        start = time.time()
+        begin = time.perf_counter()
+        error = None
+        try:
+            writer(*args, **kwargs)
+        except Exception as e:
+            error = e
+        duration = time.perf_counter() - begin
+    timing = PackageTiming(name, 'write', path, start, duration, probe.io_seconds, probe.io_start,
+                           probe.records, probe.bytes, error=None if error is None else str(error))
+    if error is not None:
+        error.owhm_timing = timing
+        raise error
+    return timing
+
+def timed_parse(name, path, parse):
+    """
+    Run one output parser and return (result, PackageTiming); all of its time counts as I/O.
+    records is the number of rows of a DataFrame result; bytes is the size of the output file.
+    """
+    start = time.time()
+    begin = time.perf_counter()
+    result = parse()
+    duration = time.perf_counter() - begin
+    nbytes = os.path.getsize(path) if result is not None and os.path.exists(path) else None
+    records = len(result) if result is not None and hasattr(result, '__len__') else None
+    return result, PackageTiming(name, 'parse', path, start, duration, duration, start, records, nbytes)
+
+class TimingReport:
+    """
+    Timings of the packages written by write_input_files or parsed by read_outputs, in completion order.
+    callback: optional callable receiving each PackageTiming as it is added.
+    """
+    def __init__(self, callback=None):
+        self.timings = []
+        self.callback = callback
+        self._lock = threading.Lock()
+
+    def add(self, timing):
+        with self._lock:
+            self.timings.append(timing)
+        if self.callback is not None:
+            self.callback(timing)
+
+    def __iter__(self):
+        return iter(self.timings)
+
+    def __len__(self):
+        return len(self.timings)
+
+    def __getitem__(self, name):
+        for timing in self.timings:
+            if timing.name == name:
+                return timing
+        raise KeyError(name)
+
+    @property
+    def total_seconds(self):
+        """
+        Wall time from the first start to the last finish.
+        """
+        if not self.timings:
+            return 0.0
+        return max(t.start + t.duration for t in self.timings) - min(t.start for t in self.timings)
+
+    def slowest(self, n=5):
+        """
+        Return the n timings with the longest duration.
+        """
+        return sorted(self.timings, key=lambda t: t.duration, reverse=True)[:n]
+
+    def summary(self):
+        """
+        Return the timings as a fixed-width text table, slowest first.
+        """
+        lines = [f"{'package':<20} {'seconds':>9} {'valid.':>9} {'io':>9} {'records':>10} {'MiB/s':>9}"]
+        for t in self.slowest(len(self.timings)):
+            rate = t.bytes_per_sec
+            lines.append(f"{t.name:<20} {t.duration:>9.4f} {t.validation_seconds:>9.4f} {t.io_seconds:>9.4f} "
+                         f"{t.records if t.records is not None else '-':>10} "
+                         f"{'-' if rate is None else f'{rate / 2**20:.2f}':>9}")
+        return '\n'.join(lines)
+
+    def to_dict(self):
+        return {'total_seconds': self.total_seconds, 'timings': [t.to_dict() for t in self.timings]}
+
+    def to_json(self, path):
+        """
+        Write the report as JSON to path.
+        """
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    def chrome_trace(self):
+        """
+        Return the report as a Chrome trace event dict (chrome://tracing, Perfetto or speedscope).
+        Each package is a complete event, with its validation and I/O spans nested inside it.
+        """
+        events = []
+        for t in self.timings:
+            base = {'cat': t.kind, 'ph': 'X', 'pid': t.pid, 'tid': t.thread}
+            args = {key: value for key, value in t.to_dict().items() if key not in ('name', 'kind', 'start')}
+            events.append(dict(base, name=t.name, ts=t.start * 1e6, dur=t.duration * 1e6, args=args))
+            if t.kind == 'write':
+                io_start = t.io_start if t.io_start is not None else t.start + t.duration
+                events.append(dict(base, name='validate', ts=t.start * 1e6,
+                                   dur=max(0.0, io_start - t.start) * 1e6))
+                if t.io_seconds:
+                    events.append(dict(base, name='format+write', ts=io_start * 1e6, dur=t.io_seconds * 1e6))
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def to_chrome_trace(self, path):
+        """
+        Write the report as a Chrome trace JSON file to path.
+        """
+        with open(path, 'w') as f:
+            json.dump(self.chrome_trace(), f)
@@ -3,17 +3,19 @@ LAKE input file writer for OWHM.
 Extracts lake data from a FloPy LAK package if possible.
 Performs input validation and provides clear error messages.
 """
+from .package_file import PackageFile
 
 def _require_field(obj, field, context):
     if field not in obj:
         raise ValueError(f"Missing required field '{field}' in {context}.")
     return obj[field]
 
-def write_lake_input(lak_package, output_path):
+def write_lake_input(lak_package, output_path, float_precision=None):
     """
     Convert a FloPy LAK package object to an OWHM-compatible LAKE input file.
     This version writes basic LAKE blocks, extracting what is possible from FloPy.
     Performs input validation and provides clear error messages.
+    float_precision: significant digits for float values; None writes them as str() does.
     """
     lakes = getattr(lak_package, 'lakes', None)
     if lakes is None:
@@ -44,27 +46,13 @@ def write_lake_input(lak_package, output_path):
             if lake_id not in lakes:
                 raise ValueError(f"Outlet references unknown lake_id {lake_id} in outlets[{idx}].")
 
-    with open(output_path, 'w') as f:
-        f.write('# OWHM LAKE Input File (auto-generated)\n')
+    with PackageFile(output_path, 'LAKE', float_precision) as f:
         # LAKES block
-        f.write('BEGIN LAKES\n')
-        f.write('  # LAKE_ID   LAYER   ROW   COL   AREA   ETC\n')
-        for lake_id, lake in lakes.items():
-            layer = lake['layer']
-            row = lake['row']
-            col = lake['col']
-            area = lake['area']
-            f.write(f'  {lake_id}   {layer}   {row}   {col}   {area}\n')
-        f.write('END LAKES\n\n')
+        with f.block('LAKES', 'LAKE_ID   LAYER   ROW   COL   AREA   ETC'):
+            f.rows((lake_id, lake['layer'], lake['row'], lake['col'], lake['area']) for lake_id, lake in lakes.items())
 
         # OUTLETS block
-        f.write('BEGIN OUTLETS\n')
-        f.write('  # LAKE_ID   OUTLET_ID   TYPE   ETC\n')
-        if outlets:
-            for outlet in outlets:
-                lake_id = outlet['lake_id']
-                outlet_id = outlet['outlet_id']
-                outlet_type = outlet['type']
-                f.write(f'  {lake_id}   {outlet_id}   {outlet_type}\n')
-        f.write('END OUTLETS\n\n')
+        with f.block('OUTLETS', 'LAKE_ID   OUTLET_ID   TYPE   ETC'):
+            if outlets:
+                f.rows((outlet['lake_id'], outlet['outlet_id'], outlet['type']) for outlet in outlets)
         # TODO: Add more LAKE blocks as needed (with validation) 
\ No newline at end of file
@@ -0,0 +1,57 @@
+"""
+Lazy, dict-like container for OWHM outputs.
+Each output is parsed the first time its key is accessed and then kept.
+"""
+import os
+import threading
+from collections.abc import Mapping
+
+class LazyOutputs(Mapping):
+    """
+    Read-only mapping of output key to parsed DataFrame (or None), loaded on first access.
+    paths: dict of output key to output file path.
+    loaders: dict of output key to a zero-argument callable returning the parsed output.
+    """
+    def __init__(self, paths, loaders):
+        self.paths = dict(paths)
+        self._loaders = dict(loaders)
+        self._results = {}
+        self._lock = threading.Lock()
+
+    def __getitem__(self, key):
+        if key not in self._loaders:
+            raise KeyError(key)
+        with self._lock:
+            if key not in self._results:
+                self._results[key] = self._loaders[key]()
+            return self._results[key]
+
+    def __contains__(self, key):
+        return key in self._loaders
+
+    def __iter__(self):
+        return iter(self._loaders)
+
+    def __len__(self):
+        return len(self._loaders)
+
+    def __repr__(self):
+        return f"LazyOutputs(loaded={self.loaded()}, available={self.available()})"
+
+    def available(self):
+        """
+        Return the keys whose output file exists, without reading any file.
+        """
+        return [key for key in self._loaders if os.path.exists(self.paths[key])]
+
+    def loaded(self):
+        """
+        Return the keys that have already been parsed.
+        """
+        return list(self._results)
+
+    def to_dict(self):
+        """
+        Parse every output and return a plain dict, as returned by read_outputs(lazy=False).
+        """
+        return {key: self[key] for key in self._loaders}
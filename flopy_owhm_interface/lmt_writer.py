@@ -3,16 +3,18 @@ LMT input file writer for OWHM.
 Extracts Link-MT3DMS data from a FloPy LMT package if possible.
 Performs input validation and provides clear error messages.
 """
+from .package_file import PackageFile
 
 def _require_field(obj, field, context):
     if field not in obj:
         raise ValueError(f"Missing required field '{field}' in {context}.")
     return obj[field]
 
-def write_lmt_input(lmt_package, output_path):
+def write_lmt_input(lmt_package, output_path, float_precision=None):
     """
     Convert a FloPy LMT package object to an OWHM-compatible LMT input file.
     Performs input validation and provides clear error messages.
+    float_precision: significant digits for float values; None writes them as str() does.
     """
     lmts = getattr(lmt_package, 'parameters', None)
     if lmts is None:
@@ -28,11 +30,8 @@ def write_lmt_input(lmt_package, output_path):
     if not isinstance(output_format, int):
         raise ValueError(f"output_format must be an integer in LMT parameters. Got: {output_format}")
 
-    with open(output_path, 'w') as f:
-        f.write('# OWHM LMT Input File (auto-generated)\n')
+    with PackageFile(output_path, 'LMT', float_precision) as f:
         # LMT block
-        f.write('BEGIN LMT\n')
-        f.write('  # OUTPUT_FILE   OUTPUT_FORMAT\n')
-        f.write(f'  {output_file}   {output_format}\n')
-        f.write('END LMT\n\n')
+        with f.block('LMT', 'OUTPUT_FILE   OUTPUT_FORMAT'):
+            f.rows([(output_file, output_format)])
         # TODO: Add more LMT blocks as needed (with validation) 
\ No newline at end of file
@@ -3,16 +3,18 @@ MAW input file writer for OWHM.
 Extracts well data from a FloPy MAW package if possible.
 Performs input validation and provides clear error messages.
 """
+from .package_file import PackageFile
 
 def _require_field(obj, field, context):
     if field not in obj:
         raise ValueError(f"Missing required field '{field}' in {context}.")
     return obj[field]
 
-def write_maw_input(maw_package, output_path):
+def write_maw_input(maw_package, output_path, float_precision=None):
     """
     Convert a FloPy MAW package object to an OWHM-compatible MAW input file.
     Extracts well data and writes all major fields. Performs input validation.
+    float_precision: significant digits for float values; None writes them as str() does.
     """
     # Try to extract static well info (location, screen, etc.)
     static_data = getattr(maw_package, 'well_info', None)
@@ -54,26 +56,12 @@ def write_maw_input(maw_package, output_path):
             if not (isinstance(status, str) and status):
                 raise ValueError(f"Status for well {well_id} in stress period {per} must be a non-empty string. Got: {status}")
 
-    with open(output_path, 'w') as f:
-        f.write('# OWHM MAW Input File (auto-generated)\n')
-        f.write('BEGIN MAW\n')
-        f.write('  # WELL_ID   LAYER   ROW   COL   SCREEN_TOP   SCREEN_BOTTOM   DIAMETER   ETC\n')
-        for well_id, info in static_data.items():
-            layer = info['layer']
-            row = info['row']
-            col = info['col']
-            screen_top = info['screen_top']
-            screen_bottom = info['screen_bottom']
-            diameter = info['diameter']
-            f.write(f'  {well_id}   {layer}   {row}   {col}   {screen_top}   {screen_bottom}   {diameter}\n')
-        f.write('END MAW\n\n')
+    with PackageFile(output_path, 'MAW', float_precision) as f:
+        with f.block('MAW', 'WELL_ID   LAYER   ROW   COL   SCREEN_TOP   SCREEN_BOTTOM   DIAMETER   ETC'):
+            f.rows((well_id, info['layer'], info['row'], info['col'], info['screen_top'], info['screen_bottom'],
+                    info['diameter']) for well_id, info in static_data.items())
 
         # MAW stress period data (e.g., rates, status)
-        f.write('BEGIN MAW_SP\n')
-        f.write('  # PER   WELL_ID   RATE   STATUS   ETC\n')
-        for per, wells in maw_data.items():
-            for well_id, data in wells.items():
-                rate = data['rate']
-                status = data['status']
-                f.write(f'  {per}   {well_id}   {rate}   {status}\n')
-        f.write('END MAW_SP\n\n') 
\ No newline at end of file
+        with f.block('MAW_SP', 'PER   WELL_ID   RATE   STATUS   ETC'):
+            f.rows((per, well_id, data['rate'], data['status'])
+                   for per, wells in maw_data.items() for well_id, data in wells.items()) 
\ No newline at end of file
@@ -3,21 +3,38 @@ MNW2 input file writer for OWHM.
 Extracts multi-node well data from a FloPy MNW2 package if possible.
 Performs input validation and provides clear error messages.
 """
+import functools
+import operator
+from .columnar import stress_period_items
+from .shards import remove_shards, write_shards
+from .package_file import PackageFile, write_rows
+
+MNW2_COLUMNS = ('wellid', 'k', 'i', 'j', 'qdes')
 
 def _require_field(obj, field, context):
     if field not in obj:
         raise ValueError(f"Missing required field '{field}' in {context}.")
     return obj[field]
 
-def write_mnw2_input(mnw2_package, output_path):
+def _write_period(f, mnw2_list):
+    """
+    Write the rows of one stress period.
+    """
+    write_rows(f, map(operator.itemgetter(*MNW2_COLUMNS), mnw2_list))
+
+def write_mnw2_input(mnw2_package, output_path, shard=False, max_workers=None,
+                     float_precision=None):
     """
     Convert a FloPy MNW2 package object to an OWHM-compatible MNW2 input file.
     Performs input validation and provides clear error messages.
+    shard: if True, each period is written to its own file (see shards.write_shards), referenced by OPEN/CLOSE;
+        shards are written concurrently on max_workers threads and only rewritten when their content changes.
+    float_precision: significant digits for float values; None writes them as str() does.
     """
     mnw2s = getattr(mnw2_package, 'stress_period_data', None)
     if mnw2s is None:
         raise ValueError("MNW2 package is missing 'stress_period_data'.")
-    for per, mnw2_list in mnw2s.items():
+    for per, mnw2_list in stress_period_items(mnw2s):
         for idx, mnw2 in enumerate(mnw2_list):
             _require_field(mnw2, 'wellid', f'stress_period_data[{per}][{idx}]')
             _require_field(mnw2, 'k', f'stress_period_data[{per}][{idx}]')
@@ -40,18 +57,21 @@ def write_mnw2_input(mnw2_package, output_path):
             if not isinstance(qdes, (int, float)):
                 raise ValueError(f"qdes must be a number in stress_period_data[{per}][{idx}]. Got: {qdes}")
 
-    with open(output_path, 'w') as f:
-        f.write('# OWHM MNW2 Input File (auto-generated)\n')
+    shards = {}
+    if shard:
+        blocks = [(per, functools.partial(_write_period, mnw2_list=mnw2_list))
+                  for per, mnw2_list in stress_period_items(mnw2s)]
+        shards = write_shards(output_path, blocks, max_workers, float_precision)
+
+    with PackageFile(output_path, 'MNW2', float_precision) as f:
         # MNW2 block
-        f.write('BEGIN MNW2\n')
-        f.write('  # WELLID   LAYER   ROW   COL   QDES\n')
-        for per, mnw2_list in mnw2s.items():
-            for mnw2 in mnw2_list:
-                wellid = mnw2['wellid']
-                layer = mnw2['k']
-                row = mnw2['i']
-                col = mnw2['j']
-                qdes = mnw2['qdes']
-                f.write(f'  {wellid}   {layer}   {row}   {col}   {qdes}\n')
-        f.write('END MNW2\n\n')
-        # TODO: Add more MNW2 blocks as needed (with validation) 
\ No newline at end of file
+        with f.block('MNW2', 'WELLID   LAYER   ROW   COL   QDES'):
+            for per, mnw2_list in stress_period_items(mnw2s):
+                if shard:
+                    f.line(f'OPEN/CLOSE {shards[per]}')
+                else:
+                    _write_period(f, mnw2_list)
+        # TODO: Add more MNW2 blocks as needed (with validation)
+    if not shard:
+        # Shards of an earlier sharded write are no longer referenced
+        remove_shards(output_path)
@@ -4,17 +4,19 @@ Extracts output control data from a FloPy OC package if possible.
 Performs input validation and provides clear error messages.
 Supports CSV, listing, and custom output options.
 """
+from .package_file import PackageFile
 
 def _require_field(obj, field, context):
     if field not in obj:
         raise ValueError(f"Missing required field '{field}' in {context}.")
     return obj[field]
 
-def write_oc_input(oc_package, output_path):
+def write_oc_input(oc_package, output_path, float_precision=None):
     """
     Convert a FloPy OC package object to an OWHM-compatible OC input file.
     Performs input validation and provides clear error messages.
     Supports CSV, listing, and custom output options.
+    float_precision: significant digits for float values; None writes them as str() does.
     """
     ocs = getattr(oc_package, 'parameters', None)
     if ocs is None:
@@ -33,15 +35,12 @@ def write_oc_input(oc_package, output_path):
     if not isinstance(custom_blocks, list):
         raise ValueError(f"custom_blocks must be a list in OC parameters. Got: {custom_blocks}")
 
-    with open(output_path, 'w') as f:
-        f.write('# OWHM OC Input File (auto-generated)\n')
+    with PackageFile(output_path, 'OC', float_precision) as f:
         # OC block
-        f.write('BEGIN OC\n')
-        f.write(f'  CSV_OUTPUT   {int(csv_output)}\n')
-        f.write(f'  LISTING_OUTPUT   {int(listing_output)}\n')
-        for block in custom_blocks:
-            if not isinstance(block, str):
-                raise ValueError(f"Each custom block must be a string. Got: {block}")
-            f.write(f'  {block}\n')
-        f.write('END OC\n\n')
+        with f.block('OC'):
+            f.rows([('CSV_OUTPUT', int(csv_output)), ('LISTING_OUTPUT', int(listing_output))])
+            for block in custom_blocks:
+                if not isinstance(block, str):
+                    raise ValueError(f"Each custom block must be a string. Got: {block}")
+                f.line(block)
         # TODO: Add more OC blocks as needed (with validation) 
\ No newline at end of file
@@ -0,0 +1,89 @@
+"""
+On-disk binary cache for parsed OWHM outputs.
+Stores each parsed DataFrame as Parquet (if pyarrow is installed) or a pandas pickle,
+keyed on the source path, size and modification time, so repeated reads of an
+unchanged output skip CSV parsing. A rewritten output invalidates its entry.
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+import pandas as pd
+
+CACHE_DIR_NAME = '.owhm_cache'
+
+logger = logging.getLogger(__name__)
+
+try:
+    import pyarrow  # noqa: F401
+    _CACHE_FORMAT = 'parquet'
+except ImportError:
+    _CACHE_FORMAT = 'pickle'
+
+def _cache_paths(path, cache_dir):
+    """
+    Return (data_path, meta_path) of the cache entry for an output file.
+    """
+    source = os.path.abspath(path)
+    if cache_dir is None:
+        cache_dir = os.path.join(os.path.dirname(source), CACHE_DIR_NAME)
+    digest = hashlib.sha256(source.encode()).hexdigest()[:16]
+    stem = os.path.join(cache_dir, f'{os.path.basename(source)}.{digest}')
+    return f'{stem}.{_CACHE_FORMAT}', f'{stem}.json'
+
+def _source_stamp(path, parser, parse_kwargs):
+    stat = os.stat(path)
+    return {'source': os.path.abspath(path), 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns,
+            'parser': f'{parser.__module__}.{parser.__name__}', 'format': _CACHE_FORMAT,
+            'kwargs': repr(sorted(parse_kwargs.items()))}
+
+def _write_atomic(path, write):
+    tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+def cached_parse(parser, path: str, cache_dir=None, **parse_kwargs) -> pd.DataFrame:
+    """
+    Parse an output with parser(path, **parse_kwargs), reusing the cached binary copy if the file is unchanged.
+    cache_dir: directory for cache entries; defaults to a '.owhm_cache' folder next to the output.
+    parse_kwargs (e.g. dtype) are part of the cache key. An entry that cannot be read is reparsed and replaced.
+    If the entry cannot be stored (e.g. a read-only cache_dir), a warning is logged and the parsed output is
+    still returned.
+    """
+    stamp = _source_stamp(path, parser, parse_kwargs)
+    data_path, meta_path = _cache_paths(path, cache_dir)
+    try:
+        with open(meta_path, 'r') as f:
+            cached_stamp = json.load(f)
+        if cached_stamp == stamp:
+            if _CACHE_FORMAT == 'parquet':
+                return pd.read_parquet(data_path)
+            return pd.read_pickle(data_path)
+    except Exception:
+        # A missing, truncated or corrupt entry (e.g. pyarrow's ArrowInvalid, EOFError from pickle)
+        # is a cache miss; it is overwritten below
+        pass
+
+    df = parser(path, **parse_kwargs)
+
+    def write_meta(tmp_path):
+        with open(tmp_path, 'w') as f:
+            json.dump(stamp, f)
+    try:
+        os.makedirs(os.path.dirname(data_path), exist_ok=True)
+        if _CACHE_FORMAT == 'parquet':
+            _write_atomic(data_path, df.to_parquet)
+        else:
+            _write_atomic(data_path, df.to_pickle)
+        _write_atomic(meta_path, write_meta)
+    except Exception as e:
+        # The cache is only an optimization: an unwritable directory or a serialization error
+        # (e.g. pyarrow's ArrowNotImplementedError for object columns) must not fail the parse
+        logger.warning(f"Could not cache {path} in {os.path.dirname(data_path)}: {e}")
+    return df
@@ -1,67 +1,106 @@
+from typing import Iterator, Union
 import pandas as pd
 
-def parse_sfr_output(path: str) -> pd.DataFrame:
+_COMMENT_PREFIXES = ('#', '!')
+
+# A parsed output: one DataFrame, or an iterator of DataFrame chunks when chunksize is given
+ParsedOutput = Union[pd.DataFrame, Iterator[pd.DataFrame]]
+
+class _CommentFilter:
     """
-    Parse an SFR output file (CSV/TXT) and return as a Pandas DataFrame.
-    Skips comment lines.
+    Read-only text stream over an open file that drops '#' and '!' comment lines on the fly.
+    Lets pd.read_csv tokenize the file directly, without a filtered in-memory copy.
+    """
+    def __init__(self, f):
+        self._lines = (line for line in f if not line.strip().startswith(_COMMENT_PREFIXES))
+        self._buffer = ''
+
+    def read(self, size=-1):
+        if size is None or size < 0:
+            data = self._buffer + ''.join(self._lines)
+            self._buffer = ''
+            return data
+        parts = [self._buffer]
+        length = len(self._buffer)
+        while length < size:
+            line = next(self._lines, None)
+            if line is None:
+                break
+            parts.append(line)
+            length += len(line)
+        data = ''.join(parts)
+        self._buffer = data[size:]
+        return data[:size]
+
+    def readline(self):
+        if self._buffer:
+            line, sep, rest = self._buffer.partition('\n')
+            self._buffer = rest
+            return line + sep if sep else line + next(self._lines, '')
+        return next(self._lines, '')
+
+    def __iter__(self):
+        return iter(self.readline, '')
+
+def _iter_csv_chunks(f, chunksize, usecols=None, dtype=None) -> Iterator[pd.DataFrame]:
+    """
+    Yield DataFrame chunks from an open OWHM CSV output, closing the file when exhausted.
+    """
+    with f, pd.read_csv(_CommentFilter(f), usecols=usecols, dtype=dtype, chunksize=chunksize) as reader:
+        for chunk in reader:
+            yield chunk
+
+def read_owhm_csv(path: str, usecols=None, dtype=None, chunksize=None) -> ParsedOutput:
     """
+    Parse an OWHM CSV/TXT output, skipping comment lines while streaming.
+    usecols, dtype: passed through to pd.read_csv.
+    chunksize: if given, return an iterator of DataFrames with at most this many rows each,
+    so large outputs can be aggregated in bounded memory.
+    """
+    if chunksize is not None:
+        # Open eagerly so a missing file fails here rather than on first iteration
+        return _iter_csv_chunks(open(path, 'r'), chunksize, usecols=usecols, dtype=dtype)
     with open(path, 'r') as f:
-        lines = [line for line in f if not line.strip().startswith(('#', '!'))]
-    from io import StringIO
-    data = StringIO(''.join(lines))
-    return pd.read_csv(data)
+        return pd.read_csv(_CommentFilter(f), usecols=usecols, dtype=dtype)
+
+def parse_sfr_output(path: str, usecols=None, dtype=None, chunksize=None) -> ParsedOutput:
+    """
+    Parse an SFR output file (CSV/TXT) and return as a Pandas DataFrame.
+    Skips comment lines. With chunksize, returns an iterator of DataFrames (see read_owhm_csv).
+    """
+    return read_owhm_csv(path, usecols=usecols, dtype=dtype, chunksize=chunksize)
 
-def parse_swr_output(path: str) -> pd.DataFrame:
+def parse_swr_output(path: str, usecols=None, dtype=None, chunksize=None) -> ParsedOutput:
     """
     Parse an SWR output file (CSV/TXT) and return as a Pandas DataFrame.
-    Skips comment lines.
+    Skips comment lines. With chunksize, returns an iterator of DataFrames (see read_owhm_csv).
     """
-    with open(path, 'r') as f:
-        lines = [line for line in f if not line.strip().startswith(('#', '!'))]
-    from io import StringIO
-    data = StringIO(''.join(lines))
-    return pd.read_csv(data)
+    return read_owhm_csv(path, usecols=usecols, dtype=dtype, chunksize=chunksize)
 
-def parse_lak_output(path: str) -> pd.DataFrame:
+def parse_lak_output(path: str, usecols=None, dtype=None, chunksize=None) -> ParsedOutput:
     """
     Parse a LAK output file (CSV/TXT) and return as a Pandas DataFrame.
-    Skips comment lines.
+    Skips comment lines. With chunksize, returns an iterator of DataFrames (see read_owhm_csv).
     """
-    with open(path, 'r') as f:
-        lines = [line for line in f if not line.strip().startswith(('#', '!'))]
-    from io import StringIO
-    data = StringIO(''.join(lines))
-    return pd.read_csv(data)
+    return read_owhm_csv(path, usecols=usecols, dtype=dtype, chunksize=chunksize)
 
-def parse_drn_output(path: str) -> pd.DataFrame:
+def parse_drn_output(path: str, usecols=None, dtype=None, chunksize=None) -> ParsedOutput:
     """
     Parse a DRN output file (CSV/TXT) and return as a Pandas DataFrame.
-    Skips comment lines.
+    Skips comment lines. With chunksize, returns an iterator of DataFrames (see read_owhm_csv).
     """
-    with open(path, 'r') as f:
-        lines = [line for line in f if not line.strip().startswith(('#', '!'))]
-    from io import StringIO
-    data = StringIO(''.join(lines))
-    return pd.read_csv(data)
+    return read_owhm_csv(path, usecols=usecols, dtype=dtype, chunksize=chunksize)
 
-def parse_res_output(path: str) -> pd.DataFrame:
+def parse_res_output(path: str, usecols=None, dtype=None, chunksize=None) -> ParsedOutput:
     """
     Parse a RES output file (CSV/TXT) and return as a Pandas DataFrame.
-    Skips comment lines.
+    Skips comment lines. With chunksize, returns an iterator of DataFrames (see read_owhm_csv).
     """
-    with open(path, 'r') as f:
-        lines = [line for line in f if not line.strip().startswith(('#', '!'))]
-    from io import StringIO
-    data = StringIO(''.join(lines))
-    return pd.read_csv(data)
+    return read_owhm_csv(path, usecols=usecols, dtype=dtype, chunksize=chunksize)
 
-def parse_accounting_output(path: str) -> pd.DataFrame:
+def parse_accounting_output(path: str, usecols=None, dtype=None, chunksize=None) -> ParsedOutput:
     """
     Parse a water accounting output file (CSV/TXT) and return as a Pandas DataFrame.
-    Skips comment lines.
+    Skips comment lines. With chunksize, returns an iterator of DataFrames (see read_owhm_csv).
     """
-    with open(path, 'r') as f:
-        lines = [line for line in f if not line.strip().startswith(('#', '!'))]
-    from io import StringIO
-    data = StringIO(''.join(lines))
-    return pd.read_csv(data) 
\ No newline at end of file
+    return read_owhm_csv(path, usecols=usecols, dtype=dtype, chunksize=chunksize)
@@ -1,37 +1,52 @@
+import asyncio
+import functools
+import os
 import subprocess
-from typing import Optional, Dict
-import pandas as pd
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Executor, ThreadPoolExecutor, wait
+from typing import TYPE_CHECKING, Callable, Optional, Dict, List, Sequence
 import logging
-from .fmp_writer import write_fmp_input
-from .maw_writer import write_maw_input
-from .sfr_writer import write_sfr_input
-from .swr_writer import write_swr_input
-from .lake_writer import write_lake_input
-from .drn_writer import write_drn_input
-from .res_writer import write_res_input
-from .water_accounting_writer import write_water_accounting_input
-from .ghb_writer import write_ghb_input
-from .output_parsers import (
-    parse_sfr_output, parse_swr_output, parse_lak_output,
-    parse_drn_output, parse_res_output, parse_accounting_output
-)
-from .evt_writer import write_evt_input
-from .ets_writer import write_ets_input
-from .rch_writer import write_rch_input
-from .drt_writer import write_drt_input
-from .mnw2_writer import write_mnw2_input
-from .uzf_writer import write_uzf_input
-from .gage_writer import write_gage_input
-from .chd_writer import write_chd_input
-from .riv_writer import write_riv_input
-from .ssm_writer import write_ssm_input
-from .adv_writer import write_adv_input
-from .dsp_writer import write_dsp_input
-from .gcg_writer import write_gcg_input
-from .lmt_writer import write_lmt_input
-from .rct_writer import write_rct_input
-from .tob_writer import write_tob_input
-from .oc_writer import write_oc_input
+from logging.handlers import RotatingFileHandler
+from .lazy_outputs import LazyOutputs
+from .validation import GridBounds, ValidationIndex, raise_if_errors
+from .fingerprint import fingerprint_package, manifest_path, load_manifest, save_manifest
+from .instrumentation import PackageTiming, TimingReport, timed_parse, timed_write
+from .shards import shards_intact
+from .registry import OUTPUT_PARSERS, WATER_ACCOUNTING_WRITER, get_package, registered_packages, schedule
+
+if TYPE_CHECKING:
+    import pandas as pd
+    from .binary_outputs import BudgetFile, HeadFile
+
+# Console bytes buffered per read by arun_model (1 MiB); longer lines are read in pieces
+_STREAM_LIMIT = 1 << 20
+
+async def _aread_line(stream) -> bytes:
+    """
+    Read one line of any length from an asyncio.StreamReader, including its newline; returns b'' at EOF.
+    """
+    chunks = []
+    while True:
+        try:
+            chunks.append(await stream.readuntil(b'\n'))
+            break
+        except asyncio.IncompleteReadError as e:
+            chunks.append(e.partial)
+            break
+        except asyncio.LimitOverrunError as e:
+            # No newline within the buffer limit: take what is buffered and keep reading
+            chunks.append(await stream.readexactly(e.consumed))
+    return b''.join(chunks)
+
+def _parse_csv_output(path: str, dtype=None) -> 'pd.DataFrame':
+    """
+    Parse a CSV output file and return as a Pandas DataFrame.
+    Handles comment lines and missing values.
+    """
+    from .output_parsers import read_owhm_csv
+    return read_owhm_csv(path, dtype=dtype)
 
 class OWHMInterface:
     """
@@ -47,138 +62,379 @@ class OWHMInterface:
             handler.setFormatter(formatter)
             self.logger.addHandler(handler)
         self.logger.setLevel(logging.INFO)
+        self.write_timings: Dict[str, float] = {}
+        self.write_report = TimingReport()
+        self.read_report = TimingReport()
         # TODO: Store model workspace, input/output file paths, etc.
 
-    def write_input_files(self, flopy_model, workspace: Optional[str] = None, water_accounting: Optional[dict] = None):
+    def write_input_files(self, flopy_model, workspace: Optional[str] = None, water_accounting: Optional[dict] = None,
+                          max_workers: Optional[int] = None, executor: Optional[Executor] = None,
+                          incremental: bool = False, check_grid: bool = True,
+                          shard: bool = False, float_precision: Optional[int] = None,
+                          timing_callback: Optional[Callable[[PackageTiming], None]] = None,
+                          packages: Optional[Sequence[str]] = None, reuse_periods: bool = False) -> Dict[str, float]:
         """
         Generate OWHM input files from a FloPy model, including FMP, MAW, SFR, SWR, LAK, DRN, RES, GHB, EVT, and water accounting support.
+        Each package is written to its own file. Packages come from the registry (see registry.register_package)
+        and are written in registry order; a package starts only after the packages it depends on are written.
+        packages: optional model attributes of the packages to write, e.g. ['ghb', 'rch']; each must be registered
+            and present on the model. By default every registered package present on the model is written.
+        max_workers: if greater than 1, write packages concurrently in a thread pool of this size.
+        executor: optional concurrent.futures executor (thread or process pool) to run the writers on; it is not shut down.
+        incremental: if True, fingerprint each package's input and skip packages whose fingerprint matches
+            the workspace manifest and whose file (and, if sharded, every shard) still exists; skipped files are
+            not touched. Packages with callable stress_period_data are always rewritten unless the callable
+            has an 'owhm_fingerprint' attribute identifying its output (see fingerprint).
+        check_grid: if True and the model has a structured discretization, check every cell-based package's
+            layer/row/col against nlay/nrow/ncol and ibound/idomain before writing anything; all violations
+            are raised together as an OWHMValidationError.
+        shard: if True, shardable packages (GHB, CHD, RIV, DRN, MNW2 and the FMP DEMAND block) write each stress
+            period to its own OPEN/CLOSE file; shards are written concurrently and only rewritten when their content
+            changes.
+        reuse_periods: if True, packages registered as reusable (GHB, CHD, RIV and DRN) start each period with a
+            'PERIOD n' line and write a period identical to the one before it as a reuse marker.
+        float_precision: if set, every package writes float values with this many significant digits
+            instead of their full str() representation.
+        timing_callback: optional callable receiving the PackageTiming of each package as it finishes.
+            Every timing (duration, records, bytes written, validation vs. formatting/I/O time) is also kept in
+            self.write_report, a TimingReport that can be exported with to_json() or to_chrome_trace().
+        Returns a dict mapping each written (regenerated) package to its write time in seconds.
+        If any writer fails, every failure is logged and the first one (in package order) is re-raised.
+        """
+        specs = self._select_packages(flopy_model, packages)
+        report = TimingReport(timing_callback)
+        self.write_report = report
+        grid = GridBounds.from_model(flopy_model)
+        if check_grid and grid is not None:
+            start = time.time()
+            begin = time.perf_counter()
+            errors = grid.check_model(flopy_model, [spec.attr for spec in specs])
+            report.add(PackageTiming('grid check', 'validate', None, start, time.perf_counter() - begin))
+            raise_if_errors(errors)
+        jobs = self._collect_write_jobs(flopy_model, workspace, water_accounting, grid, shard, float_precision, specs,
+                                        reuse_periods=reuse_periods)
+        fingerprints = {}
+        if incremental:
+            manifest_file = manifest_path(workspace)
+            manifest = load_manifest(manifest_file)
+            pending = []
+            for job in jobs:
+                label, output_path, writer, args, kwargs = job
+                key = os.path.basename(output_path)
+                digest = fingerprint_package(writer, args[0], kwargs)
+                if digest is not None and manifest.get(key) == digest and os.path.exists(output_path) \
+                        and shards_intact(output_path, kwargs.get('shard', False)):
+                    self.logger.info(f"Skipped {label} input; {output_path} is unchanged")
+                    continue
+                fingerprints[label] = (key, digest)
+                pending.append(job)
+            jobs = pending
+
+        depends = {spec.label: [get_package(dep).label for dep in spec.depends] for spec in specs}
+        timings, errors = self._run_write_jobs(jobs, max_workers, executor, report, depends)
+        self.write_timings = timings
+        if incremental:
+            for label, (key, digest) in fingerprints.items():
+                if label in timings and digest is not None:
+                    manifest[key] = digest
+                else:
+                    manifest.pop(key, None)
+            save_manifest(manifest_file, manifest)
+            self.logger.info(f"Regenerated packages: {', '.join(timings) or 'none'}")
+        if errors:
+            raise errors[0]
+        return timings
+
+    def _run_write_jobs(self, jobs, max_workers: Optional[int], executor: Optional[Executor],
+                        report: Optional[TimingReport] = None, depends: Optional[Dict[str, List[str]]] = None):
+        """
+        Run write jobs sequentially or on an executor. Returns (timings, errors).
+        Sequential runs stop at the first failure; concurrent runs wait for every job.
+        report: optional TimingReport receiving the PackageTiming of every job, including failed ones.
+        depends: optional labels of the jobs each job waits for; jobs must already be in dependency order.
+            Concurrent runs submit a job once its dependencies among jobs are written, and skip it if one failed.
+        """
+        timings = {}
+        errors = []
+
+        def record(label, output_path, timing=None, error=None):
+            if error is not None:
+                timing = getattr(error, 'owhm_timing', None)
+                self.logger.error(f"Failed to write {label} input to {output_path}: {error}")
+                errors.append(error)
+            else:
+                timings[label] = timing.duration
+                self.logger.info(f"Wrote {label} input to {output_path} in {timing.duration:.3f}s")
+            if report is not None and timing is not None:
+                report.add(timing)
+
+        if executor is None and (max_workers is None or max_workers <= 1):
+            for label, output_path, writer, args, kwargs in jobs:
+                try:
+                    timing = timed_write(label, output_path, writer, args, kwargs)
+                except Exception as e:
+                    record(label, output_path, error=e)
+                    break
+                record(label, output_path, timing)
+            return timings, errors
+
+        own_executor = executor is None
+        if own_executor:
+            executor = ThreadPoolExecutor(max_workers=max_workers)
+        try:
+            labels = {job[0] for job in jobs}
+            waiting = {job[0]: {dep for dep in (depends or {}).get(job[0], ()) if dep in labels} for job in jobs}
+            pending = list(jobs)
+            running = {}
+            failed = {}
+            while pending or running:
+                for job in list(pending):
+                    label, output_path, writer, args, kwargs = job
+                    blocked = waiting[label] & set(failed)
+                    if blocked:
+                        pending.remove(job)
+                        failed[label] = None
+                        self.logger.error(f"Skipped {label} input; it depends on {', '.join(sorted(blocked))}, "
+                                          f"which failed")
+                    elif not waiting[label] - set(timings):
+                        pending.remove(job)
+                        running[executor.submit(timed_write, label, output_path, writer, args, kwargs)] = job
+                if not running:
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    label, output_path = running.pop(future)[:2]
+                    try:
+                        timing = future.result()
+                    except Exception as e:
+                        failed[label] = e
+                        record(label, output_path, error=e)
+                    else:
+                        record(label, output_path, timing)
+            # Re-raise the first failure in package order, not completion order
+            errors[:] = [failed[job[0]] for job in jobs if failed.get(job[0]) is not None]
+        finally:
+            if own_executor:
+                executor.shutdown()
+        return timings, errors
+
+    def _select_packages(self, flopy_model, packages: Optional[Sequence[str]] = None):
         """
-        if hasattr(flopy_model, 'fmp') and flopy_model.fmp is not None:
-            output_path = 'FMP.dat' if workspace is None else f'{workspace}/FMP.dat'
-            write_fmp_input(flopy_model.fmp, output_path, water_accounting=water_accounting)
-            self.logger.info(f"Wrote FMP input to {output_path}")
-        if hasattr(flopy_model, 'maw') and flopy_model.maw is not None:
-            output_path = 'MAW.dat' if workspace is None else f'{workspace}/MAW.dat'
-            write_maw_input(flopy_model.maw, output_path)
-            self.logger.info(f"Wrote MAW input to {output_path}")
-        if hasattr(flopy_model, 'sfr') and flopy_model.sfr is not None:
-            output_path = 'SFR.dat' if workspace is None else f'{workspace}/SFR.dat'
-            write_sfr_input(flopy_model.sfr, output_path)
-            self.logger.info(f"Wrote SFR input to {output_path}")
-        if hasattr(flopy_model, 'swr') and flopy_model.swr is not None:
-            output_path = 'SWR.dat' if workspace is None else f'{workspace}/SWR.dat'
-            write_swr_input(flopy_model.swr, output_path)
-            self.logger.info(f"Wrote SWR input to {output_path}")
-        if hasattr(flopy_model, 'lak') and flopy_model.lak is not None:
-            output_path = 'LAK.dat' if workspace is None else f'{workspace}/LAK.dat'
-            write_lake_input(flopy_model.lak, output_path)
-            self.logger.info(f"Wrote LAK input to {output_path}")
-        if hasattr(flopy_model, 'drn') and flopy_model.drn is not None:
-            output_path = 'DRN.dat' if workspace is None else f'{workspace}/DRN.dat'
-            write_drn_input(flopy_model.drn, output_path)
-            self.logger.info(f"Wrote DRN input to {output_path}")
-        if hasattr(flopy_model, 'res') and flopy_model.res is not None:
-            output_path = 'RES.dat' if workspace is None else f'{workspace}/RES.dat'
-            write_res_input(flopy_model.res, output_path)
-            self.logger.info(f"Wrote RES input to {output_path}")
-        if hasattr(flopy_model, 'ghb') and flopy_model.ghb is not None:
-            output_path = 'GHB.dat' if workspace is None else f'{workspace}/GHB.dat'
-            write_ghb_input(flopy_model.ghb, output_path)
-            self.logger.info(f"Wrote GHB input to {output_path}")
-        if hasattr(flopy_model, 'evt') and flopy_model.evt is not None:
-            output_path = 'EVT.dat' if workspace is None else f'{workspace}/EVT.dat'
-            write_evt_input(flopy_model.evt, output_path)
-            self.logger.info(f"Wrote EVT input to {output_path}")
-        if hasattr(flopy_model, 'ets') and flopy_model.ets is not None:
-            output_path = 'ETS.dat' if workspace is None else f'{workspace}/ETS.dat'
-            write_ets_input(flopy_model.ets, output_path)
-            self.logger.info(f"Wrote ETS input to {output_path}")
-        if hasattr(flopy_model, 'rch') and flopy_model.rch is not None:
-            output_path = 'RCH.dat' if workspace is None else f'{workspace}/RCH.dat'
-            write_rch_input(flopy_model.rch, output_path)
-            self.logger.info(f"Wrote RCH input to {output_path}")
-        if hasattr(flopy_model, 'drt') and flopy_model.drt is not None:
-            output_path = 'DRT.dat' if workspace is None else f'{workspace}/DRT.dat'
-            write_drt_input(flopy_model.drt, output_path)
-            self.logger.info(f"Wrote DRT input to {output_path}")
-        if hasattr(flopy_model, 'mnw2') and flopy_model.mnw2 is not None:
-            output_path = 'MNW2.dat' if workspace is None else f'{workspace}/MNW2.dat'
-            write_mnw2_input(flopy_model.mnw2, output_path)
-            self.logger.info(f"Wrote MNW2 input to {output_path}")
-        if hasattr(flopy_model, 'uzf') and flopy_model.uzf is not None:
-            output_path = 'UZF.dat' if workspace is None else f'{workspace}/UZF.dat'
-            write_uzf_input(flopy_model.uzf, output_path)
-            self.logger.info(f"Wrote UZF input to {output_path}")
-        if hasattr(flopy_model, 'gage') and flopy_model.gage is not None:
-            output_path = 'GAGE.dat' if workspace is None else f'{workspace}/GAGE.dat'
-            write_gage_input(flopy_model.gage, output_path)
-            self.logger.info(f"Wrote GAGE input to {output_path}")
-        if hasattr(flopy_model, 'chd') and flopy_model.chd is not None:
-            output_path = 'CHD.dat' if workspace is None else f'{workspace}/CHD.dat'
-            write_chd_input(flopy_model.chd, output_path)
-            self.logger.info(f"Wrote CHD input to {output_path}")
-        if hasattr(flopy_model, 'riv') and flopy_model.riv is not None:
-            output_path = 'RIV.dat' if workspace is None else f'{workspace}/RIV.dat'
-            write_riv_input(flopy_model.riv, output_path)
-            self.logger.info(f"Wrote RIV input to {output_path}")
-        if hasattr(flopy_model, 'ssm') and flopy_model.ssm is not None:
-            output_path = 'SSM.dat' if workspace is None else f'{workspace}/SSM.dat'
-            write_ssm_input(flopy_model.ssm, output_path)
-            self.logger.info(f"Wrote SSM input to {output_path}")
-        if hasattr(flopy_model, 'adv') and flopy_model.adv is not None:
-            output_path = 'ADV.dat' if workspace is None else f'{workspace}/ADV.dat'
-            write_adv_input(flopy_model.adv, output_path)
-            self.logger.info(f"Wrote ADV input to {output_path}")
-        if hasattr(flopy_model, 'dsp') and flopy_model.dsp is not None:
-            output_path = 'DSP.dat' if workspace is None else f'{workspace}/DSP.dat'
-            write_dsp_input(flopy_model.dsp, output_path)
-            self.logger.info(f"Wrote DSP input to {output_path}")
-        if hasattr(flopy_model, 'gcg') and flopy_model.gcg is not None:
-            output_path = 'GCG.dat' if workspace is None else f'{workspace}/GCG.dat'
-            write_gcg_input(flopy_model.gcg, output_path)
-            self.logger.info(f"Wrote GCG input to {output_path}")
-        if hasattr(flopy_model, 'lmt') and flopy_model.lmt is not None:
-            output_path = 'LMT.dat' if workspace is None else f'{workspace}/LMT.dat'
-            write_lmt_input(flopy_model.lmt, output_path)
-            self.logger.info(f"Wrote LMT input to {output_path}")
-        if hasattr(flopy_model, 'tob') and flopy_model.tob is not None:
-            output_path = 'TOB.dat' if workspace is None else f'{workspace}/TOB.dat'
-            write_tob_input(flopy_model.tob, output_path)
-            self.logger.info(f"Wrote TOB input to {output_path}")
-        if hasattr(flopy_model, 'oc') and flopy_model.oc is not None:
-            output_path = 'OC.dat' if workspace is None else f'{workspace}/OC.dat'
-            write_oc_input(flopy_model.oc, output_path)
-            self.logger.info(f"Wrote OC input to {output_path}")
+        Return the PackageSpecs to write, in dependency order: the given packages, or every registered
+        package present on the model. Raises ValueError for unknown packages or ones missing from the model.
+        """
+        if packages is None:
+            attrs = [spec.attr for spec in registered_packages() if getattr(flopy_model, spec.attr, None) is not None]
+        else:
+            attrs = []
+            for attr in packages:
+                get_package(attr)
+                if getattr(flopy_model, attr, None) is None:
+                    raise ValueError(f"Model has no '{attr}' package to write.")
+                if attr not in attrs:
+                    attrs.append(attr)
+        return [get_package(attr) for attr in schedule(attrs)]
+
+    def _collect_write_jobs(self, flopy_model, workspace: Optional[str], water_accounting: Optional[dict],
+                            grid: Optional[GridBounds] = None, shard: bool = False,
+                            float_precision: Optional[int] = None, specs=None, reuse_periods: bool = False):
+        """
+        Build the (label, output_path, writer, args, kwargs) job list for every package present on the model.
+        grid: model grid, if known; its shape lets packages registered with grid_dims (RCH, EVT, UZF)
+            choose array output for dense periods.
+        shard: if True, shardable packages write their periods to OPEN/CLOSE shard files.
+        float_precision: significant digits passed to every writer, if set.
+        specs: optional PackageSpecs to write, in order (default: see _select_packages).
+        reuse_periods: if True, reusable packages write repeated periods as reuse markers.
+        """
+        if specs is None:
+            specs = self._select_packages(flopy_model)
+        jobs = []
+        # Valid farm/well/reach/segment/lake IDs, built once and shared by the writers' referential checks
+        validation_index = ValidationIndex.from_model(flopy_model)
+        shared = {'water_accounting': water_accounting, 'validation_index': validation_index}
+        for spec in specs:
+            package = getattr(flopy_model, spec.attr)
+            output_path = spec.filename if workspace is None else f'{workspace}/{spec.filename}'
+            kwargs = {name: shared[name] for name in spec.inputs}
+            if spec.grid_dims == 3 and grid is not None:
+                kwargs['grid_shape'] = (grid.nlay, grid.nrow, grid.ncol)
+            elif spec.grid_dims == 2 and grid is not None:
+                kwargs['grid_shape'] = (grid.nrow, grid.ncol)
+            if spec.shardable and shard:
+                kwargs['shard'] = True
+            if spec.reusable and reuse_periods:
+                kwargs['reuse_periods'] = True
+            if float_precision is not None:
+                kwargs['float_precision'] = float_precision
+            jobs.append((spec.label, output_path, spec.writer, (package, output_path), kwargs))
         if water_accounting is not None:
             output_path = 'ACCOUNTING.dat' if workspace is None else f'{workspace}/ACCOUNTING.dat'
-            valid_farm_ids = set(flopy_model.fmp.farm_dict.keys()) if hasattr(flopy_model, 'fmp') and flopy_model.fmp is not None else None
-            write_water_accounting_input(water_accounting, output_path, valid_farm_ids=valid_farm_ids)
-            self.logger.info(f"Wrote water accounting input to {output_path}")
+            # Cross-check accounting IDs against the model's packages; this reads farm_dict etc., not FMP.dat
+            kwargs = {'validation_index': validation_index}
+            if float_precision is not None:
+                kwargs['float_precision'] = float_precision
+            jobs.append(('water accounting', output_path, WATER_ACCOUNTING_WRITER,
+                         (water_accounting, output_path), kwargs))
         # TODO: Add more package writers for drains, reservoirs, advanced boundaries, etc.
+        return jobs
 
-    def run_model(self, workspace: Optional[str] = None):
+    def run_model(self, workspace: Optional[str] = None,
+                  line_callback: Optional[Callable[[str, str], None]] = None,
+                  log_file: Optional[str] = None, log_max_bytes: int = 10 * 1024 * 1024,
+                  log_backup_count: int = 3, tail_lines: int = 200):
         """
         Run the MF-OWHM executable in the specified workspace. Logs output and errors.
+        Console output is streamed line by line while the model runs instead of being buffered until exit.
+        line_callback: optional callable(line, stream) receiving each line, with stream 'stdout' or 'stderr';
+            when given, lines are passed to it instead of the logger.
+        log_file: optional path to tee all console output to, rotated at log_max_bytes with log_backup_count backups.
+        tail_lines: number of trailing lines per stream kept in memory for error reporting.
+        """
+        cmd = [self.owhm_exe_path]
+        tee = None
+        if log_file is not None:
+            tee = RotatingFileHandler(log_file, maxBytes=log_max_bytes, backupCount=log_backup_count)
+            tee.setFormatter(logging.Formatter('%(message)s'))
+        stdout_tail = deque(maxlen=tail_lines)
+        stderr_tail = deque(maxlen=tail_lines)
+        try:
+            self.logger.info(f"Running MF-OWHM: {' '.join(cmd)} in {workspace or '.'}")
+            with subprocess.Popen(cmd, cwd=workspace, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                                  text=True, errors='replace', bufsize=1) as proc:
+                # Drain stderr on a second thread so neither pipe can fill up and block the model
+                stderr_reader = threading.Thread(
+                    target=self._pump_stream, args=(proc.stderr, 'stderr', stderr_tail, line_callback, tee), daemon=True)
+                stderr_reader.start()
+                self._pump_stream(proc.stdout, 'stdout', stdout_tail, line_callback, tee)
+                stderr_reader.join()
+                returncode = proc.wait()
+            if returncode != 0:
+                raise subprocess.CalledProcessError(returncode, cmd, output=''.join(stdout_tail), stderr=''.join(stderr_tail))
+            self.logger.info("MF-OWHM run completed successfully.")
+        except subprocess.CalledProcessError as e:
+            self._log_run_failure(e, tail_lines)
+            raise
+        except Exception as e:
+            self.logger.error(f"Unexpected error running MF-OWHM: {e}")
+            raise
+        finally:
+            if tee is not None:
+                tee.close()
+
+    async def arun_model(self, workspace: Optional[str] = None,
+                         line_callback: Optional[Callable[[str, str], None]] = None,
+                         log_file: Optional[str] = None, log_max_bytes: int = 10 * 1024 * 1024,
+                         log_backup_count: int = 3, tail_lines: int = 200,
+                         timeout: Optional[float] = None):
+        """
+        Asyncio counterpart of run_model, built on asyncio.create_subprocess_exec.
+        Streams console output the same way as run_model, so many runs can share one event loop.
+        timeout: optional limit in seconds; the process is killed and asyncio.TimeoutError raised when exceeded.
+        If the awaiting task is cancelled, the MF-OWHM process is killed before the cancellation propagates.
         """
         cmd = [self.owhm_exe_path]
+        tee = None
+        if log_file is not None:
+            tee = RotatingFileHandler(log_file, maxBytes=log_max_bytes, backupCount=log_backup_count)
+            tee.setFormatter(logging.Formatter('%(message)s'))
+        stdout_tail = deque(maxlen=tail_lines)
+        stderr_tail = deque(maxlen=tail_lines)
         try:
             self.logger.info(f"Running MF-OWHM: {' '.join(cmd)} in {workspace or '.'}")
-            result = subprocess.run(cmd, cwd=workspace, check=True, capture_output=True, text=True)
+            proc = await asyncio.create_subprocess_exec(*cmd, cwd=workspace, stdout=asyncio.subprocess.PIPE,
+                                                        stderr=asyncio.subprocess.PIPE, limit=_STREAM_LIMIT)
+            try:
+                await asyncio.wait_for(asyncio.gather(
+                    self._apump_stream(proc.stdout, 'stdout', stdout_tail, line_callback, tee),
+                    self._apump_stream(proc.stderr, 'stderr', stderr_tail, line_callback, tee),
+                    proc.wait()), timeout)
+            except BaseException:
+                # Timed out or cancelled: do not leave an orphaned model run behind
+                if proc.returncode is None:
+                    proc.kill()
+                    await proc.wait()
+                raise
+            if proc.returncode != 0:
+                raise subprocess.CalledProcessError(proc.returncode, cmd, output=''.join(stdout_tail),
+                                                    stderr=''.join(stderr_tail))
             self.logger.info("MF-OWHM run completed successfully.")
-            if result.stdout:
-                self.logger.info(f"MF-OWHM output:\n{result.stdout}")
-            if result.stderr:
-                self.logger.warning(f"MF-OWHM errors:\n{result.stderr}")
+        except asyncio.TimeoutError:
+            self.logger.error(f"MF-OWHM run timed out after {timeout} seconds.")
+            raise
+        except asyncio.CancelledError:
+            self.logger.warning("MF-OWHM run was cancelled.")
+            raise
         except subprocess.CalledProcessError as e:
-            self.logger.error(f"MF-OWHM run failed: {e}")
-            if e.stdout:
-                self.logger.error(f"Output:\n{e.stdout}")
-            if e.stderr:
-                self.logger.error(f"Errors:\n{e.stderr}")
+            self._log_run_failure(e, tail_lines)
             raise
         except Exception as e:
             self.logger.error(f"Unexpected error running MF-OWHM: {e}")
             raise
+        finally:
+            if tee is not None:
+                tee.close()
+
+    async def aread_outputs(self, workspace: Optional[str] = None, **output_paths) -> Dict[str, 'pd.DataFrame']:
+        """
+        Asyncio counterpart of read_outputs. Parsing runs in the event loop's default executor
+        so the loop stays responsive; keyword arguments are the same as read_outputs.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, functools.partial(self.read_outputs, workspace, **output_paths))
+
+    def _log_run_failure(self, e: subprocess.CalledProcessError, tail_lines: int):
+        """
+        Log a failed MF-OWHM run with the retained tail of its console output.
+        """
+        self.logger.error(f"MF-OWHM run failed: {e}")
+        if e.stdout:
+            self.logger.error(f"Output (last {tail_lines} lines):\n{e.stdout}")
+        if e.stderr:
+            self.logger.error(f"Errors (last {tail_lines} lines):\n{e.stderr}")
+
+    def _pump_stream(self, stream, name: str, tail: deque, line_callback, tee):
+        """
+        Forward each line of a console pipe to the callback or logger, the tee file, and the bounded tail.
+        """
+        for line in stream:
+            self._handle_line(line, name, tail, line_callback, tee)
+
+    async def _apump_stream(self, stream, name: str, tail: deque, line_callback, tee):
+        """
+        Asyncio counterpart of _pump_stream for asyncio.StreamReader pipes.
+        """
+        while True:
+            line = await _aread_line(stream)
+            if not line:
+                break
+            self._handle_line(line.decode(errors='replace'), name, tail, line_callback, tee)
+
+    def _handle_line(self, line: str, name: str, tail: deque, line_callback, tee):
+        """
+        Dispatch one console line from the 'stdout' or 'stderr' stream.
+        """
+        level = logging.INFO if name == 'stdout' else logging.WARNING
+        tail.append(line)
+        text = line.rstrip('\r\n')
+        if tee is not None:
+            tee.handle(logging.makeLogRecord({'msg': text, 'levelno': level, 'levelname': logging.getLevelName(level)}))
+        if line_callback is not None:
+            line_callback(text, name)
+        elif name == 'stdout':
+            self.logger.info(f"MF-OWHM: {text}")
+        else:
+            self.logger.warning(f"MF-OWHM error: {text}")
+
+    def run_ensemble(self, realizations: List[dict], max_workers: Optional[int] = None, retries: int = 1,
+                     read_outputs: bool = True, executor: Optional[Executor] = None):
+        """
+        Write, run and parse many realizations in parallel worker processes with this executable.
+        See batch_runner.run_ensemble; returns (status DataFrame, aggregated outputs dict).
+        """
+        from .batch_runner import run_ensemble
+        return run_ensemble(self.owhm_exe_path, realizations, max_workers=max_workers, retries=retries,
+                            read_outputs=read_outputs, executor=executor)
 
     def read_outputs(self, workspace: Optional[str] = None,
                      fmp_output: Optional[str] = None,
@@ -188,87 +444,93 @@ class OWHMInterface:
                      lak_output: Optional[str] = None,
                      drn_output: Optional[str] = None,
                      res_output: Optional[str] = None,
-                     accounting_output: Optional[str] = None) -> Dict[str, pd.DataFrame]:
+                     accounting_output: Optional[str] = None,
+                     cache: bool = False, cache_dir: Optional[str] = None,
+                     lazy: bool = False, dtypes: Optional[Dict[str, dict]] = None,
+                     max_workers: Optional[int] = None, executor: Optional[Executor] = None,
+                     timing_callback: Optional[Callable[[PackageTiming], None]] = None) -> Dict[str, 'pd.DataFrame']:
         """
         Parse OWHM output files and return results as Pandas DataFrames.
         User can specify output file paths or use defaults.
         Returns a dict with keys for each supported output type.
+        cache: if True, keep a binary copy of each parsed output (see output_cache) and reuse it
+            while the output file's size and modification time are unchanged.
+        cache_dir: directory for cache entries; defaults to '.owhm_cache' next to each output.
+        lazy: if True, return a LazyOutputs mapping that parses each output on first access;
+            its available() method lists the outputs that exist without reading them.
+        dtypes: optional per-output dtype maps, e.g. {'sfr': {'SEGMENT': 'int32'}}, passed to pd.read_csv.
+        max_workers: if greater than 1 (and not lazy), parse the outputs concurrently in a thread pool of this size.
+        executor: optional concurrent.futures executor to parse on instead; it is not shut down.
+        timing_callback: optional callable receiving the PackageTiming of each parsed output. Timings (duration,
+            rows, bytes read) are also kept in self.read_report; lazy outputs add theirs when first accessed.
         """
-        results = {}
-        # FMP
-        fmp_path = fmp_output or (f'{workspace}/FMPWB.CSV' if workspace else 'FMPWB.CSV')
+        report = TimingReport(timing_callback)
+        self.read_report = report
+        output_paths = {
+            'fmp': fmp_output, 'maw': maw_output, 'sfr': sfr_output, 'swr': swr_output,
+            'lak': lak_output, 'drn': drn_output, 'res': res_output, 'accounting': accounting_output,
+        }
+        paths = {}
+        loaders = {}
+        for key, filename, parser, label in OUTPUT_PARSERS:
+            path = output_paths[key] or (f'{workspace}/{filename}' if workspace else filename)
+            paths[key] = path
+            dtype = (dtypes or {}).get(key)
+            loaders[key] = functools.partial(self._load_output, parser, path, label, cache, cache_dir, dtype, report)
+        if lazy:
+            return LazyOutputs(paths, loaders)
+        if executor is None and (max_workers is None or max_workers <= 1):
+            return {key: load() for key, load in loaders.items()}
+        own_executor = executor is None
+        if own_executor:
+            executor = ThreadPoolExecutor(max_workers=max_workers)
         try:
-            results['fmp'] = _parse_csv_output(fmp_path)
-            self.logger.info(f"Parsed FMP output from {fmp_path}")
-        except Exception as e:
-            self.logger.warning(f"Could not parse FMP output: {e}")
-            results['fmp'] = None
-        # MAW
-        maw_path = maw_output or (f'{workspace}/MAW.CSV' if workspace else 'MAW.CSV')
-        try:
-            results['maw'] = _parse_csv_output(maw_path)
-            self.logger.info(f"Parsed MAW output from {maw_path}")
-        except Exception as e:
-            self.logger.warning(f"Could not parse MAW output: {e}")
-            results['maw'] = None
-        # SFR
-        sfr_path = sfr_output or (f'{workspace}/SFR.CSV' if workspace else 'SFR.CSV')
-        try:
-            results['sfr'] = parse_sfr_output(sfr_path)
-            self.logger.info(f"Parsed SFR output from {sfr_path}")
-        except Exception as e:
-            self.logger.warning(f"Could not parse SFR output: {e}")
-            results['sfr'] = None
-        # SWR
-        swr_path = swr_output or (f'{workspace}/SWR.CSV' if workspace else 'SWR.CSV')
-        try:
-            results['swr'] = parse_swr_output(swr_path)
-            self.logger.info(f"Parsed SWR output from {swr_path}")
-        except Exception as e:
-            self.logger.warning(f"Could not parse SWR output: {e}")
-            results['swr'] = None
-        # LAK
-        lak_path = lak_output or (f'{workspace}/LAK.CSV' if workspace else 'LAK.CSV')
-        try:
-            results['lak'] = parse_lak_output(lak_path)
-            self.logger.info(f"Parsed LAK output from {lak_path}")
-        except Exception as e:
-            self.logger.warning(f"Could not parse LAK output: {e}")
-            results['lak'] = None
-        # DRN
-        drn_path = drn_output or (f'{workspace}/DRN.CSV' if workspace else 'DRN.CSV')
-        try:
-            results['drn'] = parse_drn_output(drn_path)
-            self.logger.info(f"Parsed DRN output from {drn_path}")
-        except Exception as e:
-            self.logger.warning(f"Could not parse DRN output: {e}")
-            results['drn'] = None
-        # RES
-        res_path = res_output or (f'{workspace}/RES.CSV' if workspace else 'RES.CSV')
-        try:
-            results['res'] = parse_res_output(res_path)
-            self.logger.info(f"Parsed RES output from {res_path}")
-        except Exception as e:
-            self.logger.warning(f"Could not parse RES output: {e}")
-            results['res'] = None
-        # Water Accounting
-        acc_path = accounting_output or (f'{workspace}/ACCOUNTING.CSV' if workspace else 'ACCOUNTING.CSV')
+            # Loaders log and return None on failure, so every future yields a result
+            futures = {key: executor.submit(load) for key, load in loaders.items()}
+            return {key: future.result() for key, future in futures.items()}
+        finally:
+            if own_executor:
+                executor.shutdown()
+
+    def _load_output(self, parser, path: str, label: str, cache: bool, cache_dir: Optional[str],
+                     dtype=None, report: Optional[TimingReport] = None) -> Optional['pd.DataFrame']:
+        """
+        Parse one output, logging the outcome. Returns None if the output is missing or cannot be parsed.
+        report: optional TimingReport receiving the PackageTiming of a successful parse.
+        """
         try:
-            results['accounting'] = parse_accounting_output(acc_path)
-            self.logger.info(f"Parsed water accounting output from {acc_path}")
+            if cache:
+                from .output_cache import cached_parse
+                parse = functools.partial(cached_parse, parser, path, cache_dir=cache_dir, dtype=dtype)
+            else:
+                parse = functools.partial(parser, path, dtype=dtype)
+            df, timing = timed_parse(label, path, parse)
+            if report is not None:
+                report.add(timing)
+            self.logger.info(f"Parsed {label} output from {path} in {timing.duration:.3f}s")
+            return df
         except Exception as e:
-            self.logger.warning(f"Could not parse water accounting output: {e}")
-            results['accounting'] = None
-        return results
+            self.logger.warning(f"Could not parse {label} output: {e}")
+            return None
 
-def _parse_csv_output(path: str) -> pd.DataFrame:
-    """
-    Parse a CSV output file and return as a Pandas DataFrame.
-    Handles comment lines and missing values.
-    """
-    with open(path, 'r') as f:
-        lines = [line for line in f if not line.strip().startswith(('#', '!'))]
-    from io import StringIO
-    data = StringIO(''.join(lines))
-    df = pd.read_csv(data)
-    return df 
\ No newline at end of file
+    def open_heads(self, path: str, workspace: Optional[str] = None, precision: str = 'auto') -> 'HeadFile':
+        """
+        Open a binary head (.hds) output as a memory-mapped HeadFile; see binary_outputs.
+        path: the head file, relative to workspace if given. Close it (or use it in a with block) when done.
+        """
+        from .binary_outputs import HeadFile
+        path = os.path.join(workspace, path) if workspace else path
+        heads = HeadFile(path, precision=precision)
+        self.logger.info(f"Indexed {len(heads)} head records in {path}")
+        return heads
+
+    def open_budget(self, path: str, workspace: Optional[str] = None, precision: str = 'auto') -> 'BudgetFile':
+        """
+        Open a cell-by-cell budget (.cbc) output as a memory-mapped BudgetFile; see binary_outputs.
+        path: the budget file, relative to workspace if given. Close it (or use it in a with block) when done.
+        """
+        from .binary_outputs import BudgetFile
+        path = os.path.join(workspace, path) if workspace else path
+        budget = BudgetFile(path, precision=precision)
+        self.logger.info(f"Indexed {len(budget)} budget records in {path}")
+        return budget
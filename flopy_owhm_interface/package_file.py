@@ -0,0 +1,119 @@
+"""
+Shared buffered writer for OWHM package files.
+Every writer opens its output through PackageFile, which writes the file header,
+BEGIN/END blocks with their column comment, and rows formatted in batches through
+a large buffer, so float formatting is the same in every package file.
+"""
+import os
+import time
+from contextlib import contextmanager
+import numpy as np
+from .columnar import WRITE_BUFFER_SIZE, write_columns
+from .instrumentation import count_records, current_probe
+
+# Number of rows formatted per write call
+ROW_BATCH_SIZE = 8192
+
+def value_formatter(float_precision=None):
+    """
+    Return the function formatting one value: str(), or '{:.Ng}' for floats when float_precision is set.
+    """
+    if float_precision is None:
+        return str
+
+    def format_value(value):
+        if isinstance(value, (float, np.floating)):
+            return f'{value:.{float_precision}g}'
+        return str(value)
+    return format_value
+
+def write_rows(f, rows):
+    """
+    Write an iterable of row tuples as indented, space separated lines, ROW_BATCH_SIZE rows per write.
+    f may be a PackageFile or shard buffer, whose float_precision applies.
+    """
+    format_value = value_formatter(getattr(f, 'float_precision', None))
+    batch = []
+    for row in rows:
+        batch.append('  ' + '   '.join(map(format_value, row)) + '\n')
+        if len(batch) >= ROW_BATCH_SIZE:
+            f.write(''.join(batch))
+            count_records(len(batch))
+            batch.clear()
+    if batch:
+        f.write(''.join(batch))
+        count_records(len(batch))
+
+class PackageFile:
+    """
+    Buffered writer for one OWHM package file, used as a context manager.
+    title: name in the '# OWHM <title> Input File (auto-generated)' header line.
+    float_precision: significant digits for float values, or None to write them as str() does.
+    Also accepted as a file by helpers that call write(); they use its float_precision.
+    The file is written to '<output_path>.tmp' and renamed over output_path only when the block exits
+    without an error, so a writer failing part way (e.g. on a bad streamed grid period) leaves no
+    partial file and any previous output_path untouched.
+    When instrumented (see instrumentation.probing), the time spent with the file open and its size
+    are added to the current probe.
+    """
+    def __init__(self, output_path, title, float_precision=None):
+        self.output_path = output_path
+        self.title = title
+        self.float_precision = float_precision
+        self._f = None
+        self._opened = None
+
+    def __enter__(self):
+        self._opened = (time.time(), time.perf_counter())
+        self._f = open(self._tmp_path, 'w', buffering=WRITE_BUFFER_SIZE)
+        self._f.write(f'# OWHM {self.title} Input File (auto-generated)\n')
+        return self
+
+    @property
+    def _tmp_path(self):
+        return f'{self.output_path}.tmp'
+
+    def __exit__(self, exc_type, exc, tb):
+        self._f.close()
+        if exc_type is not None:
+            os.remove(self._tmp_path)
+            return False
+        os.replace(self._tmp_path, self.output_path)
+        probe = current_probe()
+        if probe is not None:
+            start, begin = self._opened
+            probe.add_io(start, time.perf_counter() - begin)
+            probe.add_bytes(os.path.getsize(self.output_path))
+        return False
+
+    def write(self, text):
+        self._f.write(text)
+
+    @contextmanager
+    def block(self, name, header=None):
+        """
+        Write a 'BEGIN name' ... 'END name' block; header is the column comment, e.g. 'LAYER   ROW   COL'.
+        """
+        self._f.write(f'BEGIN {name}\n')
+        if header is not None:
+            self._f.write(f'  # {header}\n')
+        yield self
+        self._f.write(f'END {name}\n\n')
+
+    def line(self, text):
+        """
+        Write one indented line, such as a keyword or a comment.
+        """
+        self._f.write(f'  {text}\n')
+
+    def rows(self, rows):
+        """
+        Write an iterable of row tuples in batches.
+        """
+        write_rows(self, rows)
+
+    def columns(self, records, fields):
+        """
+        Write the given fields of a structured array in bulk.
+        """
+        write_columns(self, records, fields)
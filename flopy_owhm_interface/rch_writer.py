@@ -3,50 +3,90 @@ RCH input file writer for OWHM.
 Extracts recharge data from a FloPy RCH package if possible.
 Performs input validation and provides clear error messages.
 """
+import operator
+from .columnar import (
+    stress_period_items, is_columnar, require_columns,
+    check_column, check_cell_columns,
+)
+from .grid_arrays import (
+    is_grid_period, grid_fields, check_grid_period, write_grid_period, write_array_period,
+)
+from .package_file import PackageFile
+
+RCH_COLUMNS = ('k', 'i', 'j', 'recharge')
 
 def _require_field(obj, field, context):
     if field not in obj:
         raise ValueError(f"Missing required field '{field}' in {context}.")
     return obj[field]
 
-def write_rch_input(rch_package, output_path):
+def _validate_period(per, rch_list):
+    """
+    Validate one stress period given as records, a structured array or a recharge grid array.
+    """
+    context = f'stress_period_data[{per}]'
+    if is_grid_period(rch_list, ('recharge',)):
+        check_grid_period(grid_fields(rch_list, ('recharge',), context), context)
+        return
+    if is_columnar(rch_list):
+        require_columns(rch_list, RCH_COLUMNS, context)
+        check_cell_columns(rch_list, context)
+        check_column(rch_list, 'recharge', context, "recharge must be a number")
+        return
+    for idx, rch in enumerate(rch_list):
+        _require_field(rch, 'k', f'stress_period_data[{per}][{idx}]')
+        _require_field(rch, 'i', f'stress_period_data[{per}][{idx}]')
+        _require_field(rch, 'j', f'stress_period_data[{per}][{idx}]')
+        _require_field(rch, 'recharge', f'stress_period_data[{per}][{idx}]')
+        layer = rch['k']
+        row = rch['i']
+        col = rch['j']
+        recharge = rch['recharge']
+        if not (isinstance(layer, int) and layer > 0):
+            raise ValueError(f"Layer must be a positive integer in stress_period_data[{per}][{idx}]. Got: {layer}")
+        if not (isinstance(row, int) and row > 0):
+            raise ValueError(f"Row must be a positive integer in stress_period_data[{per}][{idx}]. Got: {row}")
+        if not (isinstance(col, int) and col > 0):
+            raise ValueError(f"Col must be a positive integer in stress_period_data[{per}][{idx}]. Got: {col}")
+        if not isinstance(recharge, (int, float)):
+            raise ValueError(f"recharge must be a number in stress_period_data[{per}][{idx}]. Got: {recharge}")
+
+def write_rch_input(rch_package, output_path, array_output='auto', grid_shape=None, float_precision=None):
     """
     Convert a FloPy RCH package object to an OWHM-compatible RCH input file.
     Performs input validation and provides clear error messages.
+    Periods may also be recharge grid arrays (2-D for layer 1, or 3-D), memory-mapped '.npy' paths,
+    or come from a callable yielding (period, data) pairs; grid periods are streamed a block of rows at a time.
+    array_output: 'auto' (default), 'list', 'array' or 'external'; see grid_arrays.write_array_period.
+        'auto' writes a period as a dense RECHARGE array block when it covers most of the model grid;
+        cells without recharge are written as 0.0.
+    grid_shape: (nlay, nrow, ncol) of the model, needed to write list periods as arrays.
+    float_precision: significant digits for float values; None writes them as str() does.
     """
     rchs = getattr(rch_package, 'stress_period_data', None)
     if rchs is None:
         raise ValueError("RCH package is missing 'stress_period_data'.")
-    for per, rch_list in rchs.items():
-        for idx, rch in enumerate(rch_list):
-            _require_field(rch, 'k', f'stress_period_data[{per}][{idx}]')
-            _require_field(rch, 'i', f'stress_period_data[{per}][{idx}]')
-            _require_field(rch, 'j', f'stress_period_data[{per}][{idx}]')
-            _require_field(rch, 'recharge', f'stress_period_data[{per}][{idx}]')
-            layer = rch['k']
-            row = rch['i']
-            col = rch['j']
-            recharge = rch['recharge']
-            if not (isinstance(layer, int) and layer > 0):
-                raise ValueError(f"Layer must be a positive integer in stress_period_data[{per}][{idx}]. Got: {layer}")
-            if not (isinstance(row, int) and row > 0):
-                raise ValueError(f"Row must be a positive integer in stress_period_data[{per}][{idx}]. Got: {row}")
-            if not (isinstance(col, int) and col > 0):
-                raise ValueError(f"Col must be a positive integer in stress_period_data[{per}][{idx}]. Got: {col}")
-            if not isinstance(recharge, (int, float)):
-                raise ValueError(f"recharge must be a number in stress_period_data[{per}][{idx}]. Got: {recharge}")
+    # Periods from a callable are produced one at a time, so they are validated as they are written
+    streamed = callable(rchs)
+    if not streamed:
+        for per, rch_list in stress_period_items(rchs):
+            _validate_period(per, rch_list)
 
-    with open(output_path, 'w') as f:
-        f.write('# OWHM RCH Input File (auto-generated)\n')
+    with PackageFile(output_path, 'RCH', float_precision) as f:
         # RCH block
-        f.write('BEGIN RCH\n')
-        f.write('  # LAYER   ROW   COL   RECHARGE\n')
-        for per, rch_list in rchs.items():
-            for rch in rch_list:
-                layer = rch['k']
-                row = rch['i']
-                col = rch['j']
-                recharge = rch['recharge']
-                f.write(f'  {layer}   {row}   {col}   {recharge}\n')
-        f.write('END RCH\n\n')
+        with f.block('RCH', 'LAYER   ROW   COL   RECHARGE'):
+            for per, rch_list in stress_period_items(rchs):
+                if streamed:
+                    _validate_period(per, rch_list)
+                context = f'stress_period_data[{per}]'
+                if write_array_period(f, per, rch_list, ('k', 'i', 'j'), ('recharge',), context, array_output,
+                                      grid_shape, output_path, fill_fields=('recharge',)):
+                    continue
+                if is_grid_period(rch_list, ('recharge',)):
+                    write_grid_period(f, grid_fields(rch_list, ('recharge',), context), ('k', 'i', 'j'),
+                                      ('recharge',), context)
+                elif is_columnar(rch_list):
+                    f.columns(rch_list, RCH_COLUMNS)
+                else:
+                    f.rows(map(operator.itemgetter(*RCH_COLUMNS), rch_list))
         # TODO: Add more RCH blocks as needed (with validation) 
\ No newline at end of file
@@ -3,16 +3,18 @@ RCT input file writer for OWHM.
 Extracts reaction data from a FloPy RCT package if possible.
 Performs input validation and provides clear error messages.
 """
+from .package_file import PackageFile
 
 def _require_field(obj, field, context):
     if field not in obj:
         raise ValueError(f"Missing required field '{field}' in {context}.")
     return obj[field]
 
-def write_rct_input(rct_package, output_path):
+def write_rct_input(rct_package, output_path, float_precision=None):
     """
     Convert a FloPy RCT package object to an OWHM-compatible RCT input file.
     Performs input validation and provides clear error messages.
+    float_precision: significant digits for float values; None writes them as str() does.
     """
     rcts = getattr(rct_package, 'parameters', None)
     if rcts is None:
@@ -39,11 +41,8 @@ def write_rct_input(rct_package, output_path):
         if not isinstance(val, (int, float)):
             raise ValueError(f"{name} must be a number in RCT parameters. Got: {val}")
 
-    with open(output_path, 'w') as f:
-        f.write('# OWHM RCT Input File (auto-generated)\n')
+    with PackageFile(output_path, 'RCT', float_precision) as f:
         # RCT block
-        f.write('BEGIN RCT\n')
-        f.write('  # ISOTHM   IREACT   RC1   RC2   RC3   RC4   SP1   SP2   SP3   SP4\n')
-        f.write(f'  {isothm}   {ireact}   {rc1}   {rc2}   {rc3}   {rc4}   {sp1}   {sp2}   {sp3}   {sp4}\n')
-        f.write('END RCT\n\n')
+        with f.block('RCT', 'ISOTHM   IREACT   RC1   RC2   RC3   RC4   SP1   SP2   SP3   SP4'):
+            f.rows([(isothm, ireact, rc1, rc2, rc3, rc4, sp1, sp2, sp3, sp4)])
         # TODO: Add more RCT blocks as needed (with validation) 
\ No newline at end of file
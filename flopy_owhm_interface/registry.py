@@ -0,0 +1,185 @@
+"""
+Registry of OWHM package writers and output parsers.
+Writers and parsers are listed by module and function name and imported the first
+time a package is written or an output is parsed, so importing the interface does
+not import every writer module, or pandas, up front. Each package is registered
+with its model attribute, default file name, writer and dependencies; third-party
+packages are added with register_package.
+"""
+import importlib
+
+class LazyFunction:
+    """
+    Stand-in for a module-level function that is imported on first call.
+    Has the target's __module__ and __name__ and pickles by them, so it can be
+    fingerprinted, cached and submitted to process pools like the function itself.
+    """
+    def __init__(self, module, name):
+        self.__module__ = module
+        self.__name__ = name
+        self._function = None
+
+    def resolve(self):
+        """
+        Import and return the target function.
+        """
+        if self._function is None:
+            self._function = getattr(importlib.import_module(self.__module__), self.__name__)
+        return self._function
+
+    def __call__(self, *args, **kwargs):
+        return self.resolve()(*args, **kwargs)
+
+    def __reduce__(self):
+        return LazyFunction, (self.__module__, self.__name__)
+
+    def __repr__(self):
+        return f"LazyFunction({self.__module__}.{self.__name__})"
+
+def _local(module, name):
+    return LazyFunction(f'{__package__}.{module}', name)
+
+class PackageSpec:
+    """
+    How one OWHM package is written.
+    attr: model attribute holding the package, e.g. 'ghb'; its upper-cased form labels the package.
+    filename: default output file name in the workspace.
+    writer: writer(package, output_path, **kwargs) function, or a LazyFunction.
+    depends: attributes of packages that must be written before this one, when both are written.
+    grid_dims: 3 or 2 to pass the model's (nlay, nrow, ncol) or (nrow, ncol) as grid_shape, if known.
+    shardable: True if the writer takes shard=True to write periods to OPEN/CLOSE files.
+    reusable: True if the writer takes reuse_periods=True to write repeated periods as reuse markers.
+    inputs: names of shared inputs passed as keyword arguments: 'water_accounting', 'validation_index'.
+    """
+    def __init__(self, attr, filename, writer, depends=(), grid_dims=None, shardable=False, inputs=(),
+                 reusable=False):
+        self.attr = attr
+        self.filename = filename
+        self.writer = writer
+        self.depends = tuple(depends)
+        self.grid_dims = grid_dims
+        self.shardable = shardable
+        self.inputs = tuple(inputs)
+        self.reusable = reusable
+
+    @property
+    def label(self):
+        return self.attr.upper()
+
+    def __repr__(self):
+        return f"PackageSpec({self.attr!r}, {self.filename!r}, {self.writer!r})"
+
+# Registered packages by model attribute, in default write order
+_PACKAGES = {}
+
+def register_package(attr, filename, writer, depends=(), grid_dims=None, shardable=False, inputs=(),
+                     reusable=False, replace=False):
+    """
+    Register the writer of an OWHM package, so write_input_files writes it when the model has attr.
+    writer: the writer function, or a 'module:function' string imported on first use.
+    New packages are written after the built-in ones; see PackageSpec for the other arguments.
+    replace: if True, replace an already registered package (keeping its place in the write order).
+    Returns the PackageSpec.
+    """
+    if attr in _PACKAGES and not replace:
+        raise ValueError(f"Package '{attr}' is already registered; pass replace=True to replace it.")
+    if isinstance(writer, str):
+        module, sep, name = writer.partition(':')
+        if not (module and sep and name):
+            raise ValueError(f"Writer must be a function or a 'module:function' string. Got: {writer}")
+        writer = LazyFunction(module, name)
+    spec = PackageSpec(attr, filename, writer, depends, grid_dims, shardable, inputs, reusable)
+    _PACKAGES[attr] = spec
+    return spec
+
+def unregister_package(attr):
+    """
+    Remove a registered package. Raises KeyError if it is not registered.
+    """
+    del _PACKAGES[attr]
+
+def registered_packages():
+    """
+    Return the PackageSpec of every registered package, in default write order.
+    """
+    return list(_PACKAGES.values())
+
+def get_package(attr):
+    """
+    Return the PackageSpec registered for attr. Raises ValueError if there is none.
+    """
+    if attr not in _PACKAGES:
+        raise ValueError(f"Unknown package '{attr}'. Registered packages: {', '.join(_PACKAGES)}")
+    return _PACKAGES[attr]
+
+def schedule(attrs):
+    """
+    Order package attributes so every package comes after the ones it depends on.
+    Dependencies outside attrs are ignored; otherwise the given order is kept.
+    Raises ValueError if the dependencies form a cycle.
+    """
+    attrs = list(attrs)
+    selected = set(attrs)
+    ordered = []
+    done = set()
+    visiting = []
+
+    def visit(attr):
+        if attr in done:
+            return
+        if attr in visiting:
+            cycle = visiting[visiting.index(attr):] + [attr]
+            raise ValueError(f"Package dependencies form a cycle: {' -> '.join(cycle)}")
+        visiting.append(attr)
+        for dep in get_package(attr).depends:
+            if dep in selected:
+                visit(dep)
+        visiting.pop()
+        done.add(attr)
+        ordered.append(attr)
+
+    for attr in attrs:
+        visit(attr)
+    return ordered
+
+# Built-in packages, in write order
+register_package('fmp', 'FMP.dat', _local('fmp_writer', 'write_fmp_input'),
+                 shardable=True, inputs=('water_accounting', 'validation_index'))
+register_package('maw', 'MAW.dat', _local('maw_writer', 'write_maw_input'))
+register_package('sfr', 'SFR.dat', _local('sfr_writer', 'write_sfr_input'))
+register_package('swr', 'SWR.dat', _local('swr_writer', 'write_swr_input'))
+register_package('lak', 'LAK.dat', _local('lake_writer', 'write_lake_input'))
+register_package('drn', 'DRN.dat', _local('drn_writer', 'write_drn_input'), shardable=True, reusable=True)
+register_package('res', 'RES.dat', _local('res_writer', 'write_res_input'))
+register_package('ghb', 'GHB.dat', _local('ghb_writer', 'write_ghb_input'), shardable=True, reusable=True)
+register_package('evt', 'EVT.dat', _local('evt_writer', 'write_evt_input'), grid_dims=3)
+register_package('ets', 'ETS.dat', _local('ets_writer', 'write_ets_input'))
+register_package('rch', 'RCH.dat', _local('rch_writer', 'write_rch_input'), grid_dims=3)
+register_package('drt', 'DRT.dat', _local('drt_writer', 'write_drt_input'))
+register_package('mnw2', 'MNW2.dat', _local('mnw2_writer', 'write_mnw2_input'), shardable=True)
+register_package('uzf', 'UZF.dat', _local('uzf_writer', 'write_uzf_input'), grid_dims=2)
+register_package('gage', 'GAGE.dat', _local('gage_writer', 'write_gage_input'))
+register_package('chd', 'CHD.dat', _local('chd_writer', 'write_chd_input'), shardable=True, reusable=True)
+register_package('riv', 'RIV.dat', _local('riv_writer', 'write_riv_input'), shardable=True, reusable=True)
+register_package('ssm', 'SSM.dat', _local('ssm_writer', 'write_ssm_input'))
+register_package('adv', 'ADV.dat', _local('adv_writer', 'write_adv_input'))
+register_package('dsp', 'DSP.dat', _local('dsp_writer', 'write_dsp_input'))
+register_package('gcg', 'GCG.dat', _local('gcg_writer', 'write_gcg_input'))
+register_package('lmt', 'LMT.dat', _local('lmt_writer', 'write_lmt_input'))
+register_package('tob', 'TOB.dat', _local('tob_writer', 'write_tob_input'))
+register_package('oc', 'OC.dat', _local('oc_writer', 'write_oc_input'))
+
+# Writer of the ACCOUNTING.dat file written when water accounting data is given
+WATER_ACCOUNTING_WRITER = _local('water_accounting_writer', 'write_water_accounting_input')
+
+# (result key, default file name, parser, log label) for every supported output
+OUTPUT_PARSERS = [
+    ('fmp', 'FMPWB.CSV', _local('owhm_interface', '_parse_csv_output'), 'FMP'),
+    ('maw', 'MAW.CSV', _local('owhm_interface', '_parse_csv_output'), 'MAW'),
+    ('sfr', 'SFR.CSV', _local('output_parsers', 'parse_sfr_output'), 'SFR'),
+    ('swr', 'SWR.CSV', _local('output_parsers', 'parse_swr_output'), 'SWR'),
+    ('lak', 'LAK.CSV', _local('output_parsers', 'parse_lak_output'), 'LAK'),
+    ('drn', 'DRN.CSV', _local('output_parsers', 'parse_drn_output'), 'DRN'),
+    ('res', 'RES.CSV', _local('output_parsers', 'parse_res_output'), 'RES'),
+    ('accounting', 'ACCOUNTING.CSV', _local('output_parsers', 'parse_accounting_output'), 'water accounting'),
+]
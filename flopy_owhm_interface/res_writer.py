@@ -3,17 +3,22 @@ RES input file writer for OWHM.
 Extracts reservoir data from a FloPy RES package if possible.
 Performs input validation and provides clear error messages.
 """
+import operator
+from .package_file import PackageFile
+
+RES_COLUMNS = ('k', 'i', 'j', 'stage', 'area')
 
 def _require_field(obj, field, context):
     if field not in obj:
         raise ValueError(f"Missing required field '{field}' in {context}.")
     return obj[field]
 
-def write_res_input(res_package, output_path):
+def write_res_input(res_package, output_path, float_precision=None):
     """
     Convert a FloPy RES package object to an OWHM-compatible RES input file.
     This version writes basic RES blocks, extracting what is possible from FloPy.
     Performs input validation and provides clear error messages.
+    float_precision: significant digits for float values; None writes them as str() does.
     """
     reservoirs = getattr(res_package, 'stress_period_data', None)
     if reservoirs is None:
@@ -41,18 +46,9 @@ def write_res_input(res_package, output_path):
             if not (isinstance(area, (int, float)) and area > 0):
                 raise ValueError(f"Area must be positive in stress_period_data[{per}][{idx}]. Got: {area}")
 
-    with open(output_path, 'w') as f:
-        f.write('# OWHM RES Input File (auto-generated)\n')
+    with PackageFile(output_path, 'RES', float_precision) as f:
         # RESERVOIRS block
-        f.write('BEGIN RESERVOIRS\n')
-        f.write('  # LAYER   ROW   COL   STAGE   AREA   ETC\n')
-        for per, res_list in reservoirs.items():
-            for res in res_list:
-                layer = res['k']
-                row = res['i']
-                col = res['j']
-                stage = res['stage']
-                area = res['area']
-                f.write(f'  {layer}   {row}   {col}   {stage}   {area}\n')
-        f.write('END RESERVOIRS\n\n')
+        with f.block('RESERVOIRS', 'LAYER   ROW   COL   STAGE   AREA   ETC'):
+            for per, res_list in reservoirs.items():
+                f.rows(map(operator.itemgetter(*RES_COLUMNS), res_list))
         # TODO: Add more RES blocks as needed (with validation) 
\ No newline at end of file
@@ -3,21 +3,54 @@ RIV input file writer for OWHM.
 Extracts river boundary data from a FloPy RIV package if possible.
 Performs input validation and provides clear error messages.
 """
+import functools
+import operator
+from .columnar import (
+    stress_period_items, is_columnar, require_columns,
+    check_column, check_cell_columns, write_columns, REUSE_MARKER, repeated_periods,
+)
+from .shards import remove_shards, write_shards
+from .package_file import PackageFile, write_rows
+
+RIV_COLUMNS = ('k', 'i', 'j', 'stage', 'cond', 'rbot')
 
 def _require_field(obj, field, context):
     if field not in obj:
         raise ValueError(f"Missing required field '{field}' in {context}.")
     return obj[field]
 
-def write_riv_input(riv_package, output_path):
+def _write_period(f, riv_list):
+    """
+    Write the rows of one stress period.
+    """
+    if is_columnar(riv_list):
+        write_columns(f, riv_list, RIV_COLUMNS)
+    else:
+        write_rows(f, map(operator.itemgetter(*RIV_COLUMNS), riv_list))
+
+def write_riv_input(riv_package, output_path, reuse_periods=False, shard=False, max_workers=None,
+                    float_precision=None):
     """
     Convert a FloPy RIV package object to an OWHM-compatible RIV input file.
     Performs input validation and provides clear error messages.
+    reuse_periods: if True, each period starts with a 'PERIOD n' line, and a period identical to the one
+        before it is written as a reuse marker under its header.
+    shard: if True, each period is written to its own file (see shards.write_shards), referenced by OPEN/CLOSE;
+        shards are written concurrently on max_workers threads and only rewritten when their content changes.
+    float_precision: significant digits for float values; None writes them as str() does.
     """
     rivs = getattr(riv_package, 'stress_period_data', None)
     if rivs is None:
         raise ValueError("RIV package is missing 'stress_period_data'.")
-    for per, riv_list in rivs.items():
+    for per, riv_list in stress_period_items(rivs):
+        if is_columnar(riv_list):
+            context = f'stress_period_data[{per}]'
+            require_columns(riv_list, RIV_COLUMNS, context)
+            check_cell_columns(riv_list, context)
+            check_column(riv_list, 'stage', context, "stage must be a number")
+            check_column(riv_list, 'cond', context, "cond must be a number")
+            check_column(riv_list, 'rbot', context, "rbot must be a number")
+            continue
         for idx, riv in enumerate(riv_list):
             _require_field(riv, 'k', f'stress_period_data[{per}][{idx}]')
             _require_field(riv, 'i', f'stress_period_data[{per}][{idx}]')
@@ -44,19 +77,29 @@ def write_riv_input(riv_package, output_path):
             if not isinstance(rbot, (int, float)):
                 raise ValueError(f"rbot must be a number in stress_period_data[{per}][{idx}]. Got: {rbot}")
 
-    with open(output_path, 'w') as f:
-        f.write('# OWHM RIV Input File (auto-generated)\n')
+    # Periods identical to the previous one, found by hashing each period's values
+    repeated = set()
+    if reuse_periods:
+        repeated = repeated_periods(stress_period_items(rivs), RIV_COLUMNS)
+    shards = {}
+    if shard:
+        blocks = [(per, functools.partial(_write_period, riv_list=riv_list))
+                  for per, riv_list in stress_period_items(rivs) if per not in repeated]
+        shards = write_shards(output_path, blocks, max_workers, float_precision)
+
+    with PackageFile(output_path, 'RIV', float_precision) as f:
         # RIV block
-        f.write('BEGIN RIV\n')
-        f.write('  # LAYER   ROW   COL   STAGE   COND   RBOT\n')
-        for per, riv_list in rivs.items():
-            for riv in riv_list:
-                layer = riv['k']
-                row = riv['i']
-                col = riv['j']
-                stage = riv['stage']
-                cond = riv['cond']
-                rbot = riv['rbot']
-                f.write(f'  {layer}   {row}   {col}   {stage}   {cond}   {rbot}\n')
-        f.write('END RIV\n\n')
-        # TODO: Add more RIV blocks as needed (with validation) 
\ No newline at end of file
+        with f.block('RIV', 'LAYER   ROW   COL   STAGE   COND   RBOT'):
+            for per, riv_list in stress_period_items(rivs):
+                if reuse_periods:
+                    f.line(f'PERIOD {per}')
+                if per in repeated:
+                    f.write(REUSE_MARKER)
+                elif shard:
+                    f.line(f'OPEN/CLOSE {shards[per]}')
+                else:
+                    _write_period(f, riv_list)
+        # TODO: Add more RIV blocks as needed (with validation)
+    if not shard:
+        # Shards of an earlier sharded write are no longer referenced
+        remove_shards(output_path)
@@ -0,0 +1,178 @@
+"""
+SFR network topology index for OWHM.
+Builds adjacency arrays, a routing (topological) order and connected components
+of an SFR segment network in linear time, for validation, ordered output and
+downstream accumulation queries.
+"""
+from collections import deque
+import numpy as np
+
+def _csr(keys, values, n):
+    """
+    Group values by keys into compressed (indptr, indices) arrays.
+    """
+    order = np.argsort(keys, kind='stable')
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(keys, minlength=n), out=indptr[1:])
+    return indptr, values[order]
+
+class SFRNetwork:
+    """
+    Topology index of SFR segments.
+    segments: dict of segment ID to a dict with 'upstream' and 'downstream' segment IDs (-1 for none).
+    Both fields define routing edges (upstream -> segment -> downstream). References to unknown
+    segments and cycles are collected in 'errors'. Orphans (segments connected to no other segment)
+    and disconnected components are reported in 'warnings', or in 'errors' if strict is True.
+    """
+    def __init__(self, segments, strict=False):
+        self.segment_ids = np.array(list(segments.keys()))
+        self._position = {seg_id: pos for pos, seg_id in enumerate(segments)}
+        n = len(self._position)
+        self.errors = []
+        # Position of each segment's downstream segment, -1 for outlets
+        self.downstream = np.full(n, -1, dtype=np.int64)
+        src = []
+        dst = []
+        for pos, (seg_id, seg) in enumerate(segments.items()):
+            for ref in ('upstream', 'downstream'):
+                ref_id = seg[ref]
+                if ref_id == -1:
+                    continue
+                ref_pos = self._position.get(ref_id)
+                if ref_pos is None:
+                    self.errors.append(f"{ref} segment {ref_id} referenced by segment {seg_id} not found in segments.")
+                    continue
+                if ref == 'downstream':
+                    self.downstream[pos] = ref_pos
+                    src.append(pos)
+                    dst.append(ref_pos)
+                else:
+                    src.append(ref_pos)
+                    dst.append(pos)
+        edges = np.unique(np.array([src, dst], dtype=np.int64).T, axis=0) if src else np.empty((0, 2), dtype=np.int64)
+        self.edges = edges
+        self.out_indptr, self.out_indices = _csr(edges[:, 0], edges[:, 1], n)
+        self.in_indptr, self.in_indices = _csr(edges[:, 1], edges[:, 0], n)
+        self.routing_order = self._topological_order()
+        self.component_labels = self._components()
+        self.n_components = int(self.component_labels.max()) + 1 if n else 0
+        degree = np.diff(self.out_indptr) + np.diff(self.in_indptr)
+        self.orphans = self.segment_ids[degree == 0] if n > 1 else self.segment_ids[:0]
+        self.warnings = []
+        (self.errors if strict else self.warnings).extend(self._topology_issues(degree))
+
+    def _topological_order(self):
+        """
+        Kahn's algorithm over the routing edges; returns positions, upstream segments first.
+        Segments left over are on a cycle and are reported in errors.
+        """
+        n = len(self.segment_ids)
+        indegree = np.diff(self.in_indptr).tolist()
+        out_indptr = self.out_indptr.tolist()
+        out_indices = self.out_indices.tolist()
+        queue = deque(pos for pos in range(n) if indegree[pos] == 0)
+        order = []
+        while queue:
+            pos = queue.popleft()
+            order.append(pos)
+            for nxt in out_indices[out_indptr[pos]:out_indptr[pos + 1]]:
+                indegree[nxt] -= 1
+                if indegree[nxt] == 0:
+                    queue.append(nxt)
+        if len(order) < n:
+            cyclic = sorted(set(range(n)) - set(order))
+            ids = ', '.join(str(self.segment_ids[pos]) for pos in cyclic)
+            self.errors.append(f"Segments {ids} form or feed a routing cycle.")
+        return np.array(order, dtype=np.int64)
+
+    def _components(self):
+        """
+        Label weakly connected components with union-find; returns one label per segment.
+        """
+        parent = list(range(len(self.segment_ids)))
+
+        def find(pos):
+            while parent[pos] != pos:
+                parent[pos] = parent[parent[pos]]
+                pos = parent[pos]
+            return pos
+
+        for a, b in self.edges.tolist():
+            ra, rb = find(a), find(b)
+            if ra != rb:
+                parent[rb] = ra
+        roots = np.array([find(pos) for pos in range(len(parent))], dtype=np.int64)
+        return np.unique(roots, return_inverse=True)[1].reshape(-1) if len(roots) else roots
+
+    def _topology_issues(self, degree):
+        """
+        Describe orphan segments and, apart from them, any network split into disconnected components.
+        """
+        issues = []
+        if len(self.orphans):
+            ids = ', '.join(str(seg_id) for seg_id in self.orphans.tolist())
+            issues.append(f"Segments {ids} are orphans: they are connected to no other segment.")
+        # Orphans are single-segment components and are already reported above
+        connected = self.component_labels[degree > 0]
+        labels, first = np.unique(connected, return_index=True)
+        if len(labels) > 1:
+            ids = ', '.join(str(seg_id) for seg_id in self.segment_ids[degree > 0][np.sort(first)].tolist())
+            issues.append(f"Segments form {len(labels)} disconnected networks, containing segments {ids} respectively.")
+        return issues
+
+    def position(self, seg_id):
+        """
+        Return the array position of a segment ID.
+        """
+        return self._position[seg_id]
+
+    def routing_ids(self):
+        """
+        Return segment IDs in routing order (every segment after all segments upstream of it).
+        """
+        return self.segment_ids[self.routing_order]
+
+    def upstream_of(self, seg_id):
+        """
+        Return the IDs of the segments routing directly into seg_id.
+        """
+        pos = self._position[seg_id]
+        return self.segment_ids[self.in_indices[self.in_indptr[pos]:self.in_indptr[pos + 1]]]
+
+    def downstream_of(self, seg_id):
+        """
+        Return the IDs of the segments seg_id routes directly into.
+        """
+        pos = self._position[seg_id]
+        return self.segment_ids[self.out_indices[self.out_indptr[pos]:self.out_indptr[pos + 1]]]
+
+    def accumulate(self, values):
+        """
+        Accumulate per-segment values downstream along the 'downstream' pointers.
+        values: array aligned with segment_ids, or a dict of segment ID to value (missing IDs count as 0).
+        Returns an array aligned with segment_ids holding each segment's value plus everything upstream.
+        """
+        if self.errors:
+            raise ValueError("Cannot accumulate over an invalid SFR network: " + '; '.join(self.errors))
+        if isinstance(values, dict):
+            totals = np.zeros(len(self.segment_ids))
+            for seg_id, value in values.items():
+                totals[self._position[seg_id]] = value
+        else:
+            totals = np.array(values, dtype=float)
+        downstream = self.downstream.tolist()
+        for pos in self.routing_order.tolist():
+            nxt = downstream[pos]
+            if nxt != -1:
+                totals[nxt] += totals[pos]
+        return totals
+
+def build_sfr_network(sfr_package, strict=False):
+    """
+    Build the SFRNetwork of a FloPy SFR package (its 'segments' dict).
+    strict: if True, orphans and disconnected components are errors rather than warnings.
+    """
+    segments = getattr(sfr_package, 'segments', None)
+    if segments is None:
+        raise ValueError("SFR package is missing 'segments'.")
+    return SFRNetwork(segments, strict)
@@ -3,17 +3,50 @@ SFR input file writer for OWHM.
 Extracts reach and segment data from a FloPy SFR package if possible.
 Performs input validation and provides clear error messages.
 """
+import logging
+from .columnar import (
+    as_records, add_id_column, require_columns, check_column,
+    check_cell_columns, check_unique, check_membership,
+)
+from .sfr_network import SFRNetwork
+from .validation import raise_if_errors
+from .package_file import PackageFile
+
+REACH_COLUMNS = ('reach', 'segment', 'layer', 'row', 'col', 'length')
+
+logger = logging.getLogger(__name__)
 
 def _require_field(obj, field, context):
     if field not in obj:
         raise ValueError(f"Missing required field '{field}' in {context}.")
     return obj[field]
 
-def write_sfr_input(sfr_package, output_path):
+def _validate_reach_records(records, segment_ids):
+    """
+    Validate columnar reaches with vectorized checks. Reach IDs default to 1..n if there is no 'reach' column.
+    """
+    records = add_id_column(records, 'reach')
+    require_columns(records, REACH_COLUMNS, 'reaches')
+    check_column(records, 'reach', 'reaches', "Reach ID must be a positive integer", kind='int', condition=lambda v: v > 0)
+    check_unique(records, 'reach', 'reaches', "Reach ID must be unique")
+    check_cell_columns(records, 'reaches', fields=('layer', 'row', 'col'))
+    check_column(records, 'length', 'reaches', "Length must be positive", condition=lambda v: v > 0)
+    # Cross-check: referenced segments must exist
+    check_membership(records, 'segment', segment_ids, 'reaches', "Segment not found in segments")
+    return records
+
+def write_sfr_input(sfr_package, output_path, strict_network=False, float_precision=None):
     """
     Convert a FloPy SFR package object to an OWHM-compatible SFR input file.
     This version writes basic SFR blocks, extracting what is possible from FloPy.
     Performs input validation and provides clear error messages.
+    Reaches may be a dict or columnar (structured array / DataFrame with columns
+    reach (optional), segment, layer, row, col, length), validated with vectorized checks.
+    Segments are written in routing order (upstream first). Returns the SFRNetwork
+    topology index of the segments for downstream accumulation queries.
+    strict_network: if True, orphan segments and disconnected components are validation errors;
+        otherwise they are logged as warnings.
+    float_precision: significant digits for float values; None writes them as str() does.
     """
     segments = getattr(sfr_package, 'segments', None)
     if segments is None:
@@ -27,52 +60,47 @@ def write_sfr_input(sfr_package, output_path):
         length = seg['length']
         if not (isinstance(length, (int, float)) and length > 0):
             raise ValueError(f"Length for segment {seg_id} must be positive. Got: {length}")
-        # Cross-check: referenced upstream/downstream segments should exist (if not -1)
-        for ref in ['upstream', 'downstream']:
-            ref_id = seg[ref]
-            if ref_id != -1 and ref_id not in segments:
-                raise ValueError(f"{ref} segment {ref_id} referenced by segment {seg_id} not found in segments.")
+    # Cross-check: referenced upstream/downstream segments must exist (if not -1) and must not form cycles
+    network = SFRNetwork(segments, strict_network)
+    raise_if_errors(network.errors)
+    for warning in network.warnings:
+        logger.warning(warning)
 
     reaches = getattr(sfr_package, 'reaches', None)
     if reaches is None:
         raise ValueError("SFR package is missing 'reaches'.")
-    for reach_id, reach in reaches.items():
-        if not (isinstance(reach_id, int) and reach_id > 0):
-            raise ValueError(f"Reach ID {reach_id} must be a positive integer.")
-        _require_field(reach, 'segment', f'reaches[{reach_id}]')
-        _require_field(reach, 'layer', f'reaches[{reach_id}]')
-        _require_field(reach, 'row', f'reaches[{reach_id}]')
-        _require_field(reach, 'col', f'reaches[{reach_id}]')
-        _require_field(reach, 'length', f'reaches[{reach_id}]')
-        length = reach['length']
-        if not (isinstance(length, (int, float)) and length > 0):
-            raise ValueError(f"Length for reach {reach_id} must be positive. Got: {length}")
-        # Cross-check: referenced segment must exist
-        segment = reach['segment']
-        if segment not in segments:
-            raise ValueError(f"Segment {segment} referenced by reach {reach_id} not found in segments.")
+    reach_records = as_records(reaches)
+    if reach_records is not None:
+        reach_records = _validate_reach_records(reach_records, network.segment_ids)
+    else:
+        for reach_id, reach in reaches.items():
+            if not (isinstance(reach_id, int) and reach_id > 0):
+                raise ValueError(f"Reach ID {reach_id} must be a positive integer.")
+            _require_field(reach, 'segment', f'reaches[{reach_id}]')
+            _require_field(reach, 'layer', f'reaches[{reach_id}]')
+            _require_field(reach, 'row', f'reaches[{reach_id}]')
+            _require_field(reach, 'col', f'reaches[{reach_id}]')
+            _require_field(reach, 'length', f'reaches[{reach_id}]')
+            length = reach['length']
+            if not (isinstance(length, (int, float)) and length > 0):
+                raise ValueError(f"Length for reach {reach_id} must be positive. Got: {length}")
+            # Cross-check: referenced segment must exist
+            segment = reach['segment']
+            if segment not in segments:
+                raise ValueError(f"Segment {segment} referenced by reach {reach_id} not found in segments.")
 
-    with open(output_path, 'w') as f:
-        f.write('# OWHM SFR Input File (auto-generated)\n')
+    with PackageFile(output_path, 'SFR', float_precision) as f:
         # SEGMENTS block
-        f.write('BEGIN SEGMENTS\n')
-        f.write('  # SEGMENT   UPSTREAM   DOWNSTREAM   LENGTH   ETC\n')
-        for seg_id, seg in segments.items():
-            upstream = seg['upstream']
-            downstream = seg['downstream']
-            length = seg['length']
-            f.write(f'  {seg_id}   {upstream}   {downstream}   {length}\n')
-        f.write('END SEGMENTS\n\n')
+        with f.block('SEGMENTS', 'SEGMENT   UPSTREAM   DOWNSTREAM   LENGTH   ETC'):
+            f.rows((seg_id, segments[seg_id]['upstream'], segments[seg_id]['downstream'], segments[seg_id]['length'])
+                   for seg_id in network.routing_ids().tolist())
 
         # REACHES block
-        f.write('BEGIN REACHES\n')
-        f.write('  # REACH   SEGMENT   LAYER   ROW   COL   LENGTH   ETC\n')
-        for reach_id, reach in reaches.items():
-            segment = reach['segment']
-            layer = reach['layer']
-            row = reach['row']
-            col = reach['col']
-            length = reach['length']
-            f.write(f'  {reach_id}   {segment}   {layer}   {row}   {col}   {length}\n')
-        f.write('END REACHES\n\n')
-        # TODO: Add more SFR blocks as needed (with validation) 
\ No newline at end of file
+        with f.block('REACHES', 'REACH   SEGMENT   LAYER   ROW   COL   LENGTH   ETC'):
+            if reach_records is not None:
+                f.columns(reach_records, REACH_COLUMNS)
+            else:
+                f.rows((reach_id, reach['segment'], reach['layer'], reach['row'], reach['col'], reach['length'])
+                       for reach_id, reach in reaches.items())
+        # TODO: Add more SFR blocks as needed (with validation)
+    return network 
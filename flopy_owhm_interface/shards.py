@@ -0,0 +1,110 @@
+"""
+External OPEN/CLOSE file sharding for OWHM package writers.
+Writes per-period blocks of a package to separate files referenced from the main
+package file. Shards are formatted and written concurrently, and a shard whose
+content hash matches the previous run is left untouched.
+"""
+import contextvars
+import hashlib
+import io
+import os
+from concurrent.futures import ThreadPoolExecutor
+from .columnar import WRITE_BUFFER_SIZE
+from .fingerprint import load_manifest, save_manifest
+from .instrumentation import count_bytes, io_span
+
+# Suffix of the JSON file holding the content hash of each shard of a package file
+SHARD_MANIFEST_SUFFIX = '.shards.json'
+
+def shard_path(output_path, per):
+    """
+    Return the path of the shard holding period per of a package file, e.g. GHB_sp3.dat.
+    """
+    stem, ext = os.path.splitext(output_path)
+    return f'{stem}_sp{per}{ext or ".dat"}'
+
+class _ShardBuffer(io.StringIO):
+    """
+    In-memory shard text, carrying the float precision of its package file.
+    """
+    def __init__(self, float_precision=None):
+        super().__init__()
+        self.float_precision = float_precision
+
+def _write_shard(path, write_block, previous_digest, float_precision):
+    """
+    Format one shard in memory and write it if its content changed. Returns (digest, written).
+    """
+    buffer = _ShardBuffer(float_precision)
+    write_block(buffer)
+    text = buffer.getvalue()
+    digest = hashlib.sha256(text.encode()).hexdigest()
+    if digest == previous_digest and os.path.exists(path):
+        return digest, False
+    # Write to a temporary file and move it into place, so an interrupted write never leaves a partial shard
+    tmp_path = f'{path}.tmp'
+    try:
+        with open(tmp_path, 'w', buffering=WRITE_BUFFER_SIZE) as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    count_bytes(os.path.getsize(path))
+    return digest, True
+
+def write_shards(output_path, blocks, max_workers=None, float_precision=None):
+    """
+    Write per-period shards of a package file concurrently.
+    blocks: (period, write_block) pairs; write_block(f) writes the rows of that period to f.
+    max_workers: thread pool size (default: the ThreadPoolExecutor default).
+    float_precision: significant digits for float values (see package_file.PackageFile).
+    Returns a dict mapping each period to its shard file name, relative to the package file.
+    Unchanged shards are not rewritten; shards of periods no longer present are removed.
+    Each shard is replaced atomically, and the shard manifest is saved only after every shard is written.
+    """
+    manifest_file = output_path + SHARD_MANIFEST_SUFFIX
+    manifest = load_manifest(manifest_file)
+    paths = {per: shard_path(output_path, per) for per, _ in blocks}
+    with io_span(), ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # Each shard runs in a copy of this context, so it reports to the package's instrumentation probe
+        futures = {per: executor.submit(contextvars.copy_context().run, _write_shard, paths[per], write_block,
+                                        manifest.get(os.path.basename(paths[per])), float_precision)
+                   for per, write_block in blocks}
+        digests = {os.path.basename(paths[per]): future.result()[0] for per, future in futures.items()}
+    directory = os.path.dirname(output_path)
+    for name in set(manifest) - set(digests):
+        stale = os.path.join(directory, name)
+        if os.path.exists(stale):
+            os.remove(stale)
+    # Saved last: if a shard failed above, the previous manifest no longer matches and the shards are rewritten
+    save_manifest(manifest_file, digests)
+    return {per: os.path.basename(path) for per, path in paths.items()}
+
+def remove_shards(output_path):
+    """
+    Remove the shards and shard manifest of a package file, e.g. when it is rewritten without sharding.
+    """
+    manifest_file = output_path + SHARD_MANIFEST_SUFFIX
+    if not os.path.exists(manifest_file):
+        return
+    directory = os.path.dirname(output_path)
+    for name in load_manifest(manifest_file):
+        stale = os.path.join(directory, name)
+        if os.path.exists(stale):
+            os.remove(stale)
+    os.remove(manifest_file)
+
+def shards_intact(output_path, sharded):
+    """
+    Return True if the shards of a package file match how it was written: when sharded, its shard
+    manifest and every shard it lists exist; otherwise there is no shard manifest.
+    """
+    manifest_file = output_path + SHARD_MANIFEST_SUFFIX
+    if not sharded:
+        return not os.path.exists(manifest_file)
+    if not os.path.exists(manifest_file):
+        return False
+    directory = os.path.dirname(output_path)
+    return all(os.path.exists(os.path.join(directory, name)) for name in load_manifest(manifest_file))
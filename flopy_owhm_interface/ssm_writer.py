@@ -3,55 +3,76 @@ SSM input file writer for OWHM.
 Extracts source and sink mixing data from a FloPy SSM package if possible.
 Performs input validation and provides clear error messages.
 """
+import operator
+from .columnar import stress_period_items
+from .grid_arrays import is_grid_period, grid_fields, check_grid_period, write_grid_period
+from .package_file import PackageFile
+
+SSM_COLUMNS = ('k', 'i', 'j', 'itype', 'c')
 
 def _require_field(obj, field, context):
     if field not in obj:
         raise ValueError(f"Missing required field '{field}' in {context}.")
     return obj[field]
 
-def write_ssm_input(ssm_package, output_path):
+def _validate_period(per, ssm_list):
+    """
+    Validate one stress period given as records or as an 'itype' and a 'c' concentration grid array.
+    """
+    if is_grid_period(ssm_list, ('itype', 'c')):
+        context = f'stress_period_data[{per}]'
+        check_grid_period(grid_fields(ssm_list, ('itype', 'c'), context), context, int_fields=('itype',))
+        return
+    for idx, ssm in enumerate(ssm_list):
+        _require_field(ssm, 'k', f'stress_period_data[{per}][{idx}]')
+        _require_field(ssm, 'i', f'stress_period_data[{per}][{idx}]')
+        _require_field(ssm, 'j', f'stress_period_data[{per}][{idx}]')
+        _require_field(ssm, 'itype', f'stress_period_data[{per}][{idx}]')
+        _require_field(ssm, 'c', f'stress_period_data[{per}][{idx}]')
+        layer = ssm['k']
+        row = ssm['i']
+        col = ssm['j']
+        itype = ssm['itype']
+        c = ssm['c']
+        if not (isinstance(layer, int) and layer > 0):
+            raise ValueError(f"Layer must be a positive integer in stress_period_data[{per}][{idx}]. Got: {layer}")
+        if not (isinstance(row, int) and row > 0):
+            raise ValueError(f"Row must be a positive integer in stress_period_data[{per}][{idx}]. Got: {row}")
+        if not (isinstance(col, int) and col > 0):
+            raise ValueError(f"Col must be a positive integer in stress_period_data[{per}][{idx}]. Got: {col}")
+        if not isinstance(itype, int):
+            raise ValueError(f"itype must be an integer in stress_period_data[{per}][{idx}]. Got: {itype}")
+        if not isinstance(c, (int, float)):
+            raise ValueError(f"c must be a number in stress_period_data[{per}][{idx}]. Got: {c}")
+
+def write_ssm_input(ssm_package, output_path, float_precision=None):
     """
     Convert a FloPy SSM package object to an OWHM-compatible SSM input file.
     Performs input validation and provides clear error messages.
+    Periods may also be dicts of an 'itype' (scalar or array) and a 'c' concentration grid array
+    (2-D for layer 1, or 3-D) or memory-mapped '.npy' path, or come from a callable yielding
+    (period, data) pairs; grid periods are streamed a block of rows at a time.
+    float_precision: significant digits for float values; None writes them as str() does.
     """
     ssms = getattr(ssm_package, 'stress_period_data', None)
     if ssms is None:
         raise ValueError("SSM package is missing 'stress_period_data'.")
-    for per, ssm_list in ssms.items():
-        for idx, ssm in enumerate(ssm_list):
-            _require_field(ssm, 'k', f'stress_period_data[{per}][{idx}]')
-            _require_field(ssm, 'i', f'stress_period_data[{per}][{idx}]')
-            _require_field(ssm, 'j', f'stress_period_data[{per}][{idx}]')
-            _require_field(ssm, 'itype', f'stress_period_data[{per}][{idx}]')
-            _require_field(ssm, 'c', f'stress_period_data[{per}][{idx}]')
-            layer = ssm['k']
-            row = ssm['i']
-            col = ssm['j']
-            itype = ssm['itype']
-            c = ssm['c']
-            if not (isinstance(layer, int) and layer > 0):
-                raise ValueError(f"Layer must be a positive integer in stress_period_data[{per}][{idx}]. Got: {layer}")
-            if not (isinstance(row, int) and row > 0):
-                raise ValueError(f"Row must be a positive integer in stress_period_data[{per}][{idx}]. Got: {row}")
-            if not (isinstance(col, int) and col > 0):
-                raise ValueError(f"Col must be a positive integer in stress_period_data[{per}][{idx}]. Got: {col}")
-            if not isinstance(itype, int):
-                raise ValueError(f"itype must be an integer in stress_period_data[{per}][{idx}]. Got: {itype}")
-            if not isinstance(c, (int, float)):
-                raise ValueError(f"c must be a number in stress_period_data[{per}][{idx}]. Got: {c}")
+    # Periods from a callable are produced one at a time, so they are validated as they are written
+    streamed = callable(ssms)
+    if not streamed:
+        for per, ssm_list in stress_period_items(ssms):
+            _validate_period(per, ssm_list)
 
-    with open(output_path, 'w') as f:
-        f.write('# OWHM SSM Input File (auto-generated)\n')
+    with PackageFile(output_path, 'SSM', float_precision) as f:
         # SSM block
-        f.write('BEGIN SSM\n')
-        f.write('  # LAYER   ROW   COL   ITYPE   C\n')
-        for per, ssm_list in ssms.items():
-            for ssm in ssm_list:
-                layer = ssm['k']
-                row = ssm['i']
-                col = ssm['j']
-                itype = ssm['itype']
-                c = ssm['c']
-                f.write(f'  {layer}   {row}   {col}   {itype}   {c}\n')
-        f.write('END SSM\n\n')
-        # TODO: Add more SSM blocks as needed (with validation) 
\ No newline at end of file
+        with f.block('SSM', 'LAYER   ROW   COL   ITYPE   C'):
+            for per, ssm_list in stress_period_items(ssms):
+                if streamed:
+                    _validate_period(per, ssm_list)
+                if is_grid_period(ssm_list, ('itype', 'c')):
+                    context = f'stress_period_data[{per}]'
+                    write_grid_period(f, grid_fields(ssm_list, ('itype', 'c'), context), ('k', 'i', 'j'),
+                                      ('itype', 'c'), context)
+                else:
+                    f.rows(map(operator.itemgetter(*SSM_COLUMNS), ssm_list))
+        # TODO: Add more SSM blocks as needed (with validation)
\ No newline at end of file
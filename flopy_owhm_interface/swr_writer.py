@@ -3,66 +3,120 @@ SWR input file writer for OWHM.
 Extracts reach and connection data from a FloPy SWR package if possible.
 Performs input validation and provides clear error messages.
 """
+import numpy as np
+from .columnar import (
+    as_records, add_id_column, require_columns, check_column,
+    check_cell_columns, check_unique, check_membership,
+)
+from .package_file import PackageFile
+
+REACH_COLUMNS = ('reach', 'layer', 'row', 'col', 'length')
+CONNECTION_COLUMNS = ('reach1', 'reach2', 'type')
+# Type written for connections given without a type column
+DEFAULT_CONNECTION_TYPE = 1
 
 def _require_field(obj, field, context):
     if field not in obj:
         raise ValueError(f"Missing required field '{field}' in {context}.")
     return obj[field]
 
-def write_swr_input(swr_package, output_path):
+def _validate_reach_records(records):
+    """
+    Validate columnar reaches with vectorized checks. Reach IDs default to 1..n if there is no 'reach' column.
+    """
+    records = add_id_column(records, 'reach')
+    require_columns(records, REACH_COLUMNS, 'reaches')
+    check_column(records, 'reach', 'reaches', "Reach ID must be a positive integer", kind='int', condition=lambda v: v > 0)
+    check_unique(records, 'reach', 'reaches', "Reach ID must be unique")
+    check_cell_columns(records, 'reaches', fields=('layer', 'row', 'col'))
+    check_column(records, 'length', 'reaches', "Length must be positive", condition=lambda v: v > 0)
+    return records
+
+def _connection_array_records(connections):
+    """
+    Map the columns of an (n, 2) or (n, 3) integer array onto CONNECTION_COLUMNS, as a structured array.
+    A missing type column is filled with DEFAULT_CONNECTION_TYPE.
+    """
+    if connections.ndim != 2 or connections.shape[1] not in (2, 3):
+        raise ValueError(f"Connection array must have shape (n, 2) or (n, 3). Got: {connections.shape}")
+    if connections.dtype.kind not in 'iu':
+        raise ValueError(f"Connection array must be integer. Got dtype: {connections.dtype}")
+    records = np.empty(len(connections), dtype=[(name, connections.dtype) for name in CONNECTION_COLUMNS])
+    records['reach1'] = connections[:, 0]
+    records['reach2'] = connections[:, 1]
+    records['type'] = connections[:, 2] if connections.shape[1] == 3 else DEFAULT_CONNECTION_TYPE
+    return records
+
+def write_swr_input(swr_package, output_path, float_precision=None):
     """
     Convert a FloPy SWR package object to an OWHM-compatible SWR input file.
     This version writes basic SWR blocks, extracting what is possible from FloPy.
     Performs input validation and provides clear error messages.
+    Reaches (columns reach (optional), layer, row, col, length) and connections (edge columns
+    reach1, reach2, type) may also be structured arrays or DataFrames, validated with vectorized checks.
+    Connections may also be a plain (n, 2) or (n, 3) integer array of reach1, reach2 and (optionally) type.
+    float_precision: significant digits for float values; None writes them as str() does.
     """
     reaches = getattr(swr_package, 'reaches', None)
     if reaches is None:
         raise ValueError("SWR package is missing 'reaches'.")
-    for reach_id, reach in reaches.items():
-        if not (isinstance(reach_id, int) and reach_id > 0):
-            raise ValueError(f"Reach ID {reach_id} must be a positive integer.")
-        _require_field(reach, 'layer', f'reaches[{reach_id}]')
-        _require_field(reach, 'row', f'reaches[{reach_id}]')
-        _require_field(reach, 'col', f'reaches[{reach_id}]')
-        _require_field(reach, 'length', f'reaches[{reach_id}]')
-        length = reach['length']
-        if not (isinstance(length, (int, float)) and length > 0):
-            raise ValueError(f"Length for reach {reach_id} must be positive. Got: {length}")
+    reach_records = as_records(reaches)
+    if reach_records is not None:
+        reach_records = _validate_reach_records(reach_records)
+        reach_ids = reach_records['reach']
+    else:
+        for reach_id, reach in reaches.items():
+            if not (isinstance(reach_id, int) and reach_id > 0):
+                raise ValueError(f"Reach ID {reach_id} must be a positive integer.")
+            _require_field(reach, 'layer', f'reaches[{reach_id}]')
+            _require_field(reach, 'row', f'reaches[{reach_id}]')
+            _require_field(reach, 'col', f'reaches[{reach_id}]')
+            _require_field(reach, 'length', f'reaches[{reach_id}]')
+            length = reach['length']
+            if not (isinstance(length, (int, float)) and length > 0):
+                raise ValueError(f"Length for reach {reach_id} must be positive. Got: {length}")
+        reach_ids = reaches
 
     connections = getattr(swr_package, 'connections', None)
     if connections is None:
         raise ValueError("SWR package is missing 'connections'.")
-    for idx, conn in enumerate(connections):
-        _require_field(conn, 'reach1', f'connections[{idx}]')
-        _require_field(conn, 'reach2', f'connections[{idx}]')
-        _require_field(conn, 'type', f'connections[{idx}]')
-        reach1 = conn['reach1']
-        reach2 = conn['reach2']
-        if reach1 not in reaches:
-            raise ValueError(f"Connection reach1 {reach1} in connections[{idx}] not found in reaches.")
-        if reach2 not in reaches:
-            raise ValueError(f"Connection reach2 {reach2} in connections[{idx}] not found in reaches.")
+    if isinstance(connections, np.ndarray) and connections.dtype.names is None:
+        connection_records = _connection_array_records(connections)
+    else:
+        connection_records = as_records(connections)
+    if connection_records is not None:
+        require_columns(connection_records, CONNECTION_COLUMNS, 'connections')
+        # Cross-check: both ends of every connection edge must be known reaches
+        valid_ids = reach_ids if reach_records is not None else np.array(list(reach_ids))
+        check_membership(connection_records, 'reach1', valid_ids, 'connections', "Connection reach1 not found in reaches")
+        check_membership(connection_records, 'reach2', valid_ids, 'connections', "Connection reach2 not found in reaches")
+    else:
+        if reach_records is not None:
+            reach_ids = set(reach_ids.tolist())
+        for idx, conn in enumerate(connections):
+            _require_field(conn, 'reach1', f'connections[{idx}]')
+            _require_field(conn, 'reach2', f'connections[{idx}]')
+            _require_field(conn, 'type', f'connections[{idx}]')
+            reach1 = conn['reach1']
+            reach2 = conn['reach2']
+            if reach1 not in reach_ids:
+                raise ValueError(f"Connection reach1 {reach1} in connections[{idx}] not found in reaches.")
+            if reach2 not in reach_ids:
+                raise ValueError(f"Connection reach2 {reach2} in connections[{idx}] not found in reaches.")
 
-    with open(output_path, 'w') as f:
-        f.write('# OWHM SWR Input File (auto-generated)\n')
+    with PackageFile(output_path, 'SWR', float_precision) as f:
         # REACHES block
-        f.write('BEGIN REACHES\n')
-        f.write('  # REACH   LAYER   ROW   COL   LENGTH   ETC\n')
-        for reach_id, reach in reaches.items():
-            layer = reach['layer']
-            row = reach['row']
-            col = reach['col']
-            length = reach['length']
-            f.write(f'  {reach_id}   {layer}   {row}   {col}   {length}\n')
-        f.write('END REACHES\n\n')
+        with f.block('REACHES', 'REACH   LAYER   ROW   COL   LENGTH   ETC'):
+            if reach_records is not None:
+                f.columns(reach_records, REACH_COLUMNS)
+            else:
+                f.rows((reach_id, reach['layer'], reach['row'], reach['col'], reach['length'])
+                       for reach_id, reach in reaches.items())
 
         # CONNECTIONS block
-        f.write('BEGIN CONNECTIONS\n')
-        f.write('  # REACH1   REACH2   TYPE   ETC\n')
-        for conn in connections:
-            reach1 = conn['reach1']
-            reach2 = conn['reach2']
-            conn_type = conn['type']
-            f.write(f'  {reach1}   {reach2}   {conn_type}\n')
-        f.write('END CONNECTIONS\n\n')
+        with f.block('CONNECTIONS', 'REACH1   REACH2   TYPE   ETC'):
+            if connection_records is not None:
+                f.columns(connection_records, CONNECTION_COLUMNS)
+            else:
+                f.rows((conn['reach1'], conn['reach2'], conn['type']) for conn in connections)
         # TODO: Add more SWR blocks as needed (with validation) 
\ No newline at end of file
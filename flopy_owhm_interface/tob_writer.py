@@ -3,16 +3,18 @@ TOB input file writer for OWHM.
 Extracts transport observation data from a FloPy TOB package if possible.
 Performs input validation and provides clear error messages.
 """
+from .package_file import PackageFile
 
 def _require_field(obj, field, context):
     if field not in obj:
         raise ValueError(f"Missing required field '{field}' in {context}.")
     return obj[field]
 
-def write_tob_input(tob_package, output_path):
+def write_tob_input(tob_package, output_path, float_precision=None):
     """
     Convert a FloPy TOB package object to an OWHM-compatible TOB input file.
     Performs input validation and provides clear error messages.
+    float_precision: significant digits for float values; None writes them as str() does.
     """
     tobs = getattr(tob_package, 'observation_data', None)
     if tobs is None:
@@ -39,17 +41,8 @@ def write_tob_input(tob_package, output_path):
         if not isinstance(obstype, str):
             raise ValueError(f"obstype must be a string in observation_data[{idx}]. Got: {obstype}")
 
-    with open(output_path, 'w') as f:
-        f.write('# OWHM TOB Input File (auto-generated)\n')
+    with PackageFile(output_path, 'TOB', float_precision) as f:
         # TOB block
-        f.write('BEGIN TOB\n')
-        f.write('  # LAYER   ROW   COL   OBSNAME   OBSTYPE\n')
-        for tob in tobs:
-            layer = tob['k']
-            row = tob['i']
-            col = tob['j']
-            obsname = tob['obsname']
-            obstype = tob['obstype']
-            f.write(f'  {layer}   {row}   {col}   {obsname}   {obstype}\n')
-        f.write('END TOB\n\n')
+        with f.block('TOB', 'LAYER   ROW   COL   OBSNAME   OBSTYPE'):
+            f.rows((tob['k'], tob['i'], tob['j'], tob['obsname'], tob['obstype']) for tob in tobs)
         # TODO: Add more TOB blocks as needed (with validation) 
\ No newline at end of file
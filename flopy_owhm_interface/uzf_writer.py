@@ -3,45 +3,75 @@ UZF input file writer for OWHM.
 Extracts unsaturated zone flow data from a FloPy UZF package if possible.
 Performs input validation and provides clear error messages.
 """
+import operator
+from .columnar import stress_period_items
+from .grid_arrays import (
+    is_grid_period, grid_fields, check_grid_period, write_grid_period, write_array_period,
+)
+from .package_file import PackageFile
+
+UZF_COLUMNS = ('i', 'j', 'finf')
 
 def _require_field(obj, field, context):
     if field not in obj:
         raise ValueError(f"Missing required field '{field}' in {context}.")
     return obj[field]
 
-def write_uzf_input(uzf_package, output_path):
+def _validate_period(per, uzf_list):
+    """
+    Validate one stress period given as records or a 2-D finf grid array.
+    """
+    if is_grid_period(uzf_list, ('finf',)):
+        context = f'stress_period_data[{per}]'
+        check_grid_period(grid_fields(uzf_list, ('finf',), context), context, max_ndim=2)
+        return
+    for idx, uzf in enumerate(uzf_list):
+        _require_field(uzf, 'i', f'stress_period_data[{per}][{idx}]')
+        _require_field(uzf, 'j', f'stress_period_data[{per}][{idx}]')
+        _require_field(uzf, 'finf', f'stress_period_data[{per}][{idx}]')
+        row = uzf['i']
+        col = uzf['j']
+        finf = uzf['finf']
+        if not (isinstance(row, int) and row > 0):
+            raise ValueError(f"Row must be a positive integer in stress_period_data[{per}][{idx}]. Got: {row}")
+        if not (isinstance(col, int) and col > 0):
+            raise ValueError(f"Col must be a positive integer in stress_period_data[{per}][{idx}]. Got: {col}")
+        if not isinstance(finf, (int, float)):
+            raise ValueError(f"finf must be a number in stress_period_data[{per}][{idx}]. Got: {finf}")
+
+def write_uzf_input(uzf_package, output_path, array_output='auto', grid_shape=None, float_precision=None):
     """
     Convert a FloPy UZF package object to an OWHM-compatible UZF input file.
     Performs input validation and provides clear error messages.
+    Periods may also be 2-D finf grid arrays or memory-mapped '.npy' paths, or come from a callable
+    yielding (period, data) pairs; grid periods are streamed a block of rows at a time.
+    array_output: 'auto' (default), 'list', 'array' or 'external'; see grid_arrays.write_array_period.
+        'auto' writes a period as a dense FINF array block when it covers most of the grid;
+        cells without finf are written as 0.0.
+    grid_shape: (nrow, ncol) of the model, needed to write list periods as arrays.
+    float_precision: significant digits for float values; None writes them as str() does.
     """
     uzfs = getattr(uzf_package, 'stress_period_data', None)
     if uzfs is None:
         raise ValueError("UZF package is missing 'stress_period_data'.")
-    for per, uzf_list in uzfs.items():
-        for idx, uzf in enumerate(uzf_list):
-            _require_field(uzf, 'i', f'stress_period_data[{per}][{idx}]')
-            _require_field(uzf, 'j', f'stress_period_data[{per}][{idx}]')
-            _require_field(uzf, 'finf', f'stress_period_data[{per}][{idx}]')
-            row = uzf['i']
-            col = uzf['j']
-            finf = uzf['finf']
-            if not (isinstance(row, int) and row > 0):
-                raise ValueError(f"Row must be a positive integer in stress_period_data[{per}][{idx}]. Got: {row}")
-            if not (isinstance(col, int) and col > 0):
-                raise ValueError(f"Col must be a positive integer in stress_period_data[{per}][{idx}]. Got: {col}")
-            if not isinstance(finf, (int, float)):
-                raise ValueError(f"finf must be a number in stress_period_data[{per}][{idx}]. Got: {finf}")
+    # Periods from a callable are produced one at a time, so they are validated as they are written
+    streamed = callable(uzfs)
+    if not streamed:
+        for per, uzf_list in stress_period_items(uzfs):
+            _validate_period(per, uzf_list)
 
-    with open(output_path, 'w') as f:
-        f.write('# OWHM UZF Input File (auto-generated)\n')
+    with PackageFile(output_path, 'UZF', float_precision) as f:
         # UZF block
-        f.write('BEGIN UZF\n')
-        f.write('  # ROW   COL   FINF\n')
-        for per, uzf_list in uzfs.items():
-            for uzf in uzf_list:
-                row = uzf['i']
-                col = uzf['j']
-                finf = uzf['finf']
-                f.write(f'  {row}   {col}   {finf}\n')
-        f.write('END UZF\n\n')
-        # TODO: Add more UZF blocks as needed (with validation) 
\ No newline at end of file
+        with f.block('UZF', 'ROW   COL   FINF'):
+            for per, uzf_list in stress_period_items(uzfs):
+                if streamed:
+                    _validate_period(per, uzf_list)
+                context = f'stress_period_data[{per}]'
+                if write_array_period(f, per, uzf_list, ('i', 'j'), ('finf',), context, array_output, grid_shape,
+                                      output_path, fill_fields=('finf',)):
+                    continue
+                if is_grid_period(uzf_list, ('finf',)):
+                    write_grid_period(f, grid_fields(uzf_list, ('finf',), context), ('i', 'j'), ('finf',), context)
+                else:
+                    f.rows(map(operator.itemgetter(*UZF_COLUMNS), uzf_list))
+        # TODO: Add more UZF blocks as needed (with validation)
\ No newline at end of file
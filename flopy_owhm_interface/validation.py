@@ -0,0 +1,303 @@
+"""
+Shared validation index for OWHM writers.
+Holds hash sets (and arrays) of the valid farm, well, reach, segment and lake IDs
+of a model, built once per write_input_files call, so writers can run referential
+checks in constant time per record and report every violation in one pass.
+Also checks the cell indices of every cell-based package against the model grid.
+"""
+import numpy as np
+from .columnar import as_records, add_id_column, is_columnar, stress_period_items
+from .grid_arrays import is_grid_period, load_grid
+
+ID_KINDS = ('farm', 'well', 'reach', 'segment', 'lake')
+
+# Water accounting types and the ID kind their object_id refers to
+ACCOUNT_TYPE_KINDS = {
+    'FARM': 'farm',
+    'WELL': 'well',
+    'REACH': 'reach',
+    'SEGMENT': 'segment',
+    'LAKE': 'lake',
+}
+
+# Where the valid IDs of each kind come from, for error messages
+ID_SOURCES = {
+    'farm': 'FMP farm_dict',
+    'well': 'MAW well_info',
+    'reach': 'SFR reaches',
+    'segment': 'SFR segments',
+    'lake': 'LAK lakes',
+}
+
+class OWHMValidationError(ValueError):
+    """
+    ValueError carrying every violation found in a validation pass.
+    """
+    def __init__(self, errors):
+        self.errors = list(errors)
+        if len(self.errors) == 1:
+            message = self.errors[0]
+        else:
+            message = f"{len(self.errors)} validation errors:\n" + '\n'.join(f"  - {e}" for e in self.errors)
+        super().__init__(message)
+
+def raise_if_errors(errors):
+    """
+    Raise OWHMValidationError if any errors were collected.
+    """
+    if errors:
+        raise OWHMValidationError(errors)
+
+class ValidationIndex:
+    """
+    Valid IDs of each kind ('farm', 'well', 'reach', 'segment', 'lake').
+    A kind set to None is unknown and is not checked.
+    """
+    def __init__(self, farm_ids=None, well_ids=None, reach_ids=None, segment_ids=None, lake_ids=None):
+        given = {'farm': farm_ids, 'well': well_ids, 'reach': reach_ids,
+                 'segment': segment_ids, 'lake': lake_ids}
+        self.ids = {kind: (set(ids) if ids is not None else None) for kind, ids in given.items()}
+        self.arrays = {kind: (np.array(sorted(ids, key=repr)) if ids is not None else None)
+                       for kind, ids in self.ids.items()}
+
+    @classmethod
+    def from_model(cls, flopy_model):
+        """
+        Build the index from the packages present on a FloPy model.
+        """
+        def keys(package, *attrs):
+            for attr in attrs:
+                data = getattr(package, attr, None)
+                records = as_records(data) if data is not None else None
+                if records is not None:
+                    # Columnar reaches: IDs are the 'reach' column, or 1..n without one
+                    return add_id_column(records, 'reach')['reach'].tolist()
+                if data is not None and hasattr(data, 'keys'):
+                    return data.keys()
+            return None
+
+        fmp = getattr(flopy_model, 'fmp', None)
+        maw = getattr(flopy_model, 'maw', None)
+        sfr = getattr(flopy_model, 'sfr', None)
+        lak = getattr(flopy_model, 'lak', None)
+        return cls(
+            farm_ids=keys(fmp, 'farm_dict') if fmp is not None else None,
+            well_ids=keys(maw, 'well_info', 'static_data') if maw is not None else None,
+            reach_ids=keys(sfr, 'reaches') if sfr is not None else None,
+            segment_ids=keys(sfr, 'segments') if sfr is not None else None,
+            lake_ids=keys(lak, 'lakes') if lak is not None else None,
+        )
+
+    def has(self, kind):
+        """
+        Return True if valid IDs of this kind are known.
+        """
+        return self.ids[kind] is not None
+
+    def unknown(self, kind, ids):
+        """
+        Return the positions and values of ids that are not valid IDs of this kind.
+        Uses np.isin for numeric arrays and set lookups otherwise.
+        """
+        valid = self.ids[kind]
+        if valid is None:
+            return []
+        if isinstance(ids, np.ndarray) and ids.dtype.kind in 'iuf' and self.arrays[kind].dtype.kind in 'iuf':
+            bad = np.flatnonzero(~np.isin(ids, self.arrays[kind]))
+            return [(int(idx), ids[idx]) for idx in bad]
+        return [(idx, value) for idx, value in enumerate(ids) if value not in valid]
+
+    def check(self, kind, ids, context):
+        """
+        Return an error message for every id not found among the valid IDs of this kind.
+        context: description of the id sequence, e.g. 'Water accounting FARM'.
+        """
+        return [f"{context}[{idx}] refers to unknown {kind}_id {value} not in {ID_SOURCES[kind]}."
+                for idx, value in self.unknown(kind, ids)]
+
+# Cell-based package data checked against the model grid:
+# (package attribute, data attributes tried in order, layout, (layer, row, col) fields; None for 2-D packages)
+CELL_SOURCES = [
+    ('rch', ('stress_period_data',), 'periods', ('k', 'i', 'j')),
+    ('evt', ('stress_period_data',), 'periods', ('k', 'i', 'j')),
+    ('ets', ('stress_period_data',), 'periods', ('k', 'i', 'j')),
+    ('ghb', ('stress_period_data',), 'periods', ('k', 'i', 'j')),
+    ('chd', ('stress_period_data',), 'periods', ('k', 'i', 'j')),
+    ('riv', ('stress_period_data',), 'periods', ('k', 'i', 'j')),
+    ('drn', ('stress_period_data',), 'periods', ('k', 'i', 'j')),
+    ('drt', ('stress_period_data',), 'periods', ('k', 'i', 'j')),
+    ('res', ('stress_period_data',), 'periods', ('k', 'i', 'j')),
+    ('mnw2', ('stress_period_data',), 'periods', ('k', 'i', 'j')),
+    ('ssm', ('stress_period_data',), 'periods', ('k', 'i', 'j')),
+    ('uzf', ('stress_period_data',), 'periods', (None, 'i', 'j')),
+    ('tob', ('observation_data',), 'list', ('k', 'i', 'j')),
+    ('maw', ('well_info', 'static_data'), 'keyed', ('layer', 'row', 'col')),
+    ('lak', ('lakes',), 'keyed', ('layer', 'row', 'col')),
+    ('sfr', ('reaches',), 'keyed', ('layer', 'row', 'col')),
+    ('swr', ('reaches',), 'keyed', ('layer', 'row', 'col')),
+    ('fmp', ('well_data', 'wellinfo', 'well_dict'), 'grouped', ('layer', 'row', 'col')),
+]
+
+# Value fields of the packages whose periods may be given as grid arrays (see grid_arrays.is_grid_period)
+GRID_VALUE_FIELDS = {
+    'rch': ('recharge',),
+    'evt': ('surf', 'evtr'),
+    'uzf': ('finf',),
+    'ssm': ('itype', 'c'),
+}
+
+# Maximum number of offending cells listed per data block
+MAX_CELL_ERRORS = 10
+
+def _cell_chunks(data, name, layout):
+    """
+    Yield (context, labels, records) blocks of cell data; labels are row labels or None for positions.
+    """
+    if layout == 'periods':
+        for per, records in stress_period_items(data):
+            yield f'stress_period_data[{per}]', None, records
+    elif layout == 'list':
+        yield 'observation_data', None, data
+    elif layout == 'grouped':
+        for group_id, records in data.items():
+            yield f'{name}[{group_id}]', None, records
+    else:
+        records = as_records(data)
+        if records is not None:
+            yield name, None, records
+        else:
+            yield name, list(data.keys()), list(data.values())
+
+def _cell_column(records, field):
+    """
+    Return one index column as an integer array, or None if it is missing or not integral.
+    """
+    if is_columnar(records):
+        if field not in records.dtype.names or records[field].dtype.kind not in 'iu':
+            return None
+        return records[field]
+    try:
+        values = [record[field] for record in records]
+    except (KeyError, TypeError):
+        return None
+    if not all(isinstance(value, (int, np.integer)) for value in values):
+        return None
+    return np.array(values, dtype=np.int64)
+
+class GridBounds:
+    """
+    Model grid dimensions and active cells for vectorized cell index checks.
+    Cell indices are 1-based, as in the package writers.
+    active: optional boolean array of shape (nlay, nrow, ncol) from ibound or idomain.
+    """
+    def __init__(self, nlay, nrow, ncol, active=None):
+        self.nlay = int(nlay)
+        self.nrow = int(nrow)
+        self.ncol = int(ncol)
+        if active is not None:
+            active = np.asarray(active).astype(bool).reshape(self.nlay, self.nrow, self.ncol)
+        self.active = active
+
+    @classmethod
+    def from_model(cls, flopy_model):
+        """
+        Read nlay/nrow/ncol and ibound (or idomain) from a FloPy model once.
+        Returns None if the model has no structured discretization.
+        """
+        dis = getattr(flopy_model, 'dis', None)
+        shape = None
+        for source in (dis, getattr(flopy_model, 'modelgrid', None), flopy_model):
+            dims = [_array_value(getattr(source, name, None)) for name in ('nlay', 'nrow', 'ncol')]
+            if source is not None and all(isinstance(dim, (int, np.integer)) for dim in dims):
+                shape = dims
+                break
+        if shape is None:
+            return None
+        active = None
+        bas = getattr(flopy_model, 'bas6', None)
+        if bas is None:
+            bas = getattr(flopy_model, 'bas', None)
+        for source, name in ((bas, 'ibound'), (dis, 'idomain')):
+            values = _array_value(getattr(source, name, None)) if source is not None else None
+            if values is not None:
+                active = np.asarray(values) > 0 if name == 'idomain' else np.asarray(values) != 0
+                break
+        return cls(*shape, active=active)
+
+    def check(self, layer, row, col, context, labels=None):
+        """
+        Return error messages for cells outside the grid or inactive; layer may be None for 2-D data.
+        At most MAX_CELL_ERRORS cells are listed per call.
+        """
+        in_grid = (row >= 1) & (row <= self.nrow) & (col >= 1) & (col <= self.ncol)
+        if layer is not None:
+            in_grid &= (layer >= 1) & (layer <= self.nlay)
+        bad = np.flatnonzero(~in_grid)
+        problem = f"outside the model grid (nlay={self.nlay}, nrow={self.nrow}, ncol={self.ncol})"
+        if not bad.size and self.active is not None:
+            if layer is not None:
+                is_active = self.active[layer - 1, row - 1, col - 1]
+            else:
+                is_active = self.active.any(axis=0)[row - 1, col - 1]
+            bad = np.flatnonzero(~is_active)
+            problem = "an inactive cell (ibound/idomain is 0)"
+        errors = []
+        for idx in bad[:MAX_CELL_ERRORS]:
+            label = labels[idx] if labels is not None else idx
+            cell = (row[idx], col[idx]) if layer is None else (layer[idx], row[idx], col[idx])
+            errors.append(f"{context}[{label}]: cell {tuple(int(v) for v in cell)} is {problem}.")
+        if bad.size > MAX_CELL_ERRORS:
+            errors.append(f"{context}: {bad.size - MAX_CELL_ERRORS} more cells are {problem}.")
+        return errors
+
+    def check_grid_shape(self, records, context):
+        """
+        Return error messages for dense grid arrays of a period whose shape does not match the grid.
+        """
+        values = records.values() if isinstance(records, dict) else [records]
+        errors = []
+        for value in values:
+            value = load_grid(value)
+            shape = np.shape(value)
+            if len(shape) < 2:
+                continue
+            if shape[-2:] != (self.nrow, self.ncol) or (len(shape) == 3 and shape[0] != self.nlay):
+                errors.append(f"{context}: grid array shape {shape} does not match the model grid "
+                              f"(nlay={self.nlay}, nrow={self.nrow}, ncol={self.ncol}).")
+        return errors
+
+    def check_model(self, flopy_model, packages=None):
+        """
+        Check the cells of every cell-based package on a FloPy model in one pass; returns all error messages.
+        Blocks with missing or non-integer indices are skipped and left to the package writers to report.
+        packages: optional model attributes to limit the check to.
+        """
+        errors = []
+        for attr, data_attrs, layout, fields in CELL_SOURCES:
+            package = getattr(flopy_model, attr, None)
+            if package is None or (packages is not None and attr not in packages):
+                continue
+            name = next((name for name in data_attrs if getattr(package, name, None) is not None), None)
+            # Periods produced by a callable are only generated once, by the writer
+            if name is None or callable(getattr(package, name)):
+                continue
+            for context, labels, records in _cell_chunks(getattr(package, name), name, layout):
+                if is_grid_period(records, GRID_VALUE_FIELDS.get(attr, ())):
+                    errors.extend(self.check_grid_shape(records, f'{attr.upper()} {context}'))
+                    continue
+                if isinstance(records, dict) and layout == 'periods':
+                    # A period given as a single record
+                    records = [records]
+                columns = [None if field is None else _cell_column(records, field) for field in fields]
+                if any(column is None for field, column in zip(fields, columns) if field is not None):
+                    continue
+                errors.extend(self.check(*columns, context=f'{attr.upper()} {context}', labels=labels))
+        return errors
+
+def _array_value(value):
+    """
+    Unwrap FloPy Util2d/Util3d/MFArray objects to their 'array'; pass plain values through.
+    """
+    if value is not None and hasattr(value, 'array') and not isinstance(value, np.ndarray):
+        return value.array
+    return value
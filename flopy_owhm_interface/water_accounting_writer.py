@@ -3,44 +3,58 @@ Water accounting input file writer for OWHM.
 Allows user to specify custom accounting/reporting blocks or data.
 Performs input validation and provides clear error messages.
 """
+from .validation import ACCOUNT_TYPE_KINDS, ID_SOURCES, ValidationIndex, raise_if_errors
+from .package_file import PackageFile
 
-def _require_field(obj, field, context):
-    if field not in obj:
-        raise ValueError(f"Missing required field '{field}' in {context}.")
-    return obj[field]
-
-def write_water_accounting_input(accounting_data, output_path, valid_farm_ids=None):
+def write_water_accounting_input(accounting_data, output_path, valid_farm_ids=None, validation_index=None, float_precision=None):
     """
     Write a water accounting input file for OWHM.
     accounting_data: dict or custom structure with accounting/reporting info.
     Performs input validation and provides clear error messages.
     Optionally checks that farm IDs exist in valid_farm_ids.
+    validation_index: optional ValidationIndex; object IDs of FARM, WELL, REACH, SEGMENT and LAKE
+    records are checked against it. All records are validated before writing, and every
+    violation is reported together in one OWHMValidationError (a ValueError).
+    float_precision: significant digits for float values; None writes them as str() does.
     """
-    with open(output_path, 'w') as f:
-        f.write('# OWHM Water Accounting Input File (auto-generated)\n')
+    if validation_index is None and valid_farm_ids is not None:
+        validation_index = ValidationIndex(farm_ids=valid_farm_ids)
+    has_data = bool(accounting_data) and isinstance(accounting_data, dict)
+    errors = []
+    if has_data:
+        for acc_type, records in accounting_data.items():
+            positions = []
+            object_ids = []
+            for idx, rec in enumerate(records):
+                missing = [field for field in ('object_id', 'period', 'value') if field not in rec]
+                if missing:
+                    errors.extend(f"Missing required field '{field}' in {acc_type}[{idx}]." for field in missing)
+                    continue
+                object_id = rec['object_id']
+                period = rec['period']
+                value = rec['value']
+                if not isinstance(object_id, int):
+                    errors.append(f"object_id must be an integer in {acc_type}[{idx}]. Got: {object_id}")
+                else:
+                    positions.append(idx)
+                    object_ids.append(object_id)
+                if not isinstance(period, int):
+                    errors.append(f"period must be an integer in {acc_type}[{idx}]. Got: {period}")
+                if not isinstance(value, (int, float)):
+                    errors.append(f"value must be a number in {acc_type}[{idx}]. Got: {value}")
+            kind = ACCOUNT_TYPE_KINDS.get(acc_type.upper())
+            if kind is not None and validation_index is not None:
+                for pos, object_id in validation_index.unknown(kind, object_ids):
+                    errors.append(f"Water accounting {acc_type}[{positions[pos]}] refers to unknown "
+                                  f"{kind}_id {object_id} not in {ID_SOURCES[kind]}.")
+    raise_if_errors(errors)
+
+    with PackageFile(output_path, 'Water Accounting', float_precision) as f:
         # ACCOUNTING block
-        f.write('BEGIN ACCOUNTING\n')
-        f.write('  # ACCOUNT_TYPE   OBJECT_ID   PERIOD   VALUE   ETC\n')
-        if accounting_data and isinstance(accounting_data, dict):
-            for acc_type, records in accounting_data.items():
-                for idx, rec in enumerate(records):
-                    _require_field(rec, 'object_id', f'{acc_type}[{idx}]')
-                    _require_field(rec, 'period', f'{acc_type}[{idx}]')
-                    _require_field(rec, 'value', f'{acc_type}[{idx}]')
-                    object_id = rec['object_id']
-                    period = rec['period']
-                    value = rec['value']
-                    if not isinstance(object_id, int):
-                        raise ValueError(f"object_id must be an integer in {acc_type}[{idx}]. Got: {object_id}")
-                    if not isinstance(period, int):
-                        raise ValueError(f"period must be an integer in {acc_type}[{idx}]. Got: {period}")
-                    if not isinstance(value, (int, float)):
-                        raise ValueError(f"value must be a number in {acc_type}[{idx}]. Got: {value}")
-                    if acc_type.upper() == 'FARM' and valid_farm_ids is not None:
-                        if object_id not in valid_farm_ids:
-                            raise ValueError(f"Water accounting refers to unknown farm_id {object_id} not in FMP farm_dict.")
-                    f.write(f'  {acc_type}   {object_id}   {period}   {value}\n')
-        else:
-            f.write('  # TODO: Provide water accounting data\n')
-        f.write('END ACCOUNTING\n\n')
-        # TODO: Add more accounting/reporting blocks as needed (with validation) 
\ No newline at end of file
+        with f.block('ACCOUNTING', 'ACCOUNT_TYPE   OBJECT_ID   PERIOD   VALUE   ETC'):
+            if has_data:
+                f.rows((acc_type, rec['object_id'], rec['period'], rec['value'])
+                       for acc_type, records in accounting_data.items() for rec in records)
+            else:
+                f.line('# TODO: Provide water accounting data')
+        # TODO: Add more accounting/reporting blocks as needed (with validation)
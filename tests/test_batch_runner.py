@@ -0,0 +1,39 @@
+import pytest
+import sys
+from flopy_owhm_interface.batch_runner import run_ensemble
+
+@pytest.mark.skipif(sys.platform == 'win32', reason='uses a shebang script as the executable')
+def test_run_ensemble(tmp_path):
+    exe = tmp_path / 'fake_owhm.py'
+    exe.write_text(f'#!{sys.executable}\nimport os, sys\n'
+                   'if os.path.exists("FAIL"):\n    sys.exit(1)\n'
+                   'with open("SFR.CSV", "w") as f:\n    f.write("# comment\\nREACH,FLOW\\n1,2.5\\n")\n')
+    exe.chmod(0o755)
+    realizations = []
+    for name in ['r1', 'r2', 'bad']:
+        workspace = tmp_path / name
+        workspace.mkdir()
+        if name == 'bad':
+            (workspace / 'FAIL').write_text('')
+        realizations.append({'name': name, 'workspace': str(workspace)})
+    status, outputs = run_ensemble(str(exe), realizations, max_workers=2, retries=1)
+    status = status.set_index('name')
+    assert status.loc['r1', 'status'] == 'ok'
+    assert status.loc['bad', 'status'] == 'failed'
+    assert status.loc['bad', 'attempts'] == 2
+    assert sorted(outputs['sfr']['realization']) == ['r1', 'r2']
+
+@pytest.mark.skipif(sys.platform == 'win32', reason='uses a shebang script as the executable')
+def test_run_ensemble_records_worker_failures(tmp_path):
+    exe = tmp_path / 'fake_owhm.py'
+    exe.write_text(f'#!{sys.executable}\n')
+    exe.chmod(0o755)
+    # A model that cannot be pickled never reaches a worker; the other realizations still run
+    realizations = [{'name': 'unpicklable', 'workspace': str(tmp_path / 'a'), 'flopy_model': lambda: None},
+                    {'name': 'ok', 'workspace': str(tmp_path / 'b')}]
+    status, outputs = run_ensemble(str(exe), realizations, max_workers=2, read_outputs=False)
+    status = status.set_index('name')
+    assert status.loc['unpicklable', 'status'] == 'failed'
+    assert 'pickle' in status.loc['unpicklable', 'error'].lower()
+    assert status.loc['ok', 'status'] == 'ok'
+
@@ -0,0 +1,23 @@
+import pytest
+from benchmarks.run_benchmarks import run_benchmarks, make_report, compare
+from benchmarks.synthetic_model import SIZES, make_model
+
+def test_synthetic_model_is_reproducible():
+    first, _ = make_model('tiny')
+    second, _ = make_model('tiny')
+    assert first.ghb.stress_period_data == second.ghb.stress_period_data
+    assert len(first.sfr.reaches) == SIZES['tiny'].nreaches
+
+def test_run_benchmarks_and_compare(tmp_path):
+    results = run_benchmarks('tiny', repeat=1, patterns=['write:GHB', 'parse:sfr'], workspace=str(tmp_path))
+    assert set(results) == {'write:GHB', 'parse:sfr'}
+    assert results['write:GHB']['bytes'] > 0 and results['write:GHB']['peak_bytes'] > 0
+    baseline = make_report(results, 'tiny', False, 1)
+    current = make_report({name: dict(result, seconds=result['seconds'] + 1.0) for name, result in results.items()},
+                          'tiny', False, 1)
+    assert compare(baseline, baseline) == []
+    regressions = compare(baseline, current)
+    assert len(regressions) == 2
+    assert regressions[0].startswith('write:GHB: ')
+    with pytest.raises(ValueError):
+        compare(baseline, make_report(results, 'small', False, 1))
@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+from flopy_owhm_interface.binary_outputs import BudgetFile, HeadFile
+from flopy_owhm_interface.owhm_interface import OWHMInterface
+
+def write_heads(path, heads, real='<f4'):
+    # heads: {(kper, kstp): (nlay, nrow, ncol) array}, one record per layer as MF-OWHM writes them
+    with open(path, 'wb') as f:
+        for (kper, kstp), array in heads.items():
+            for k, layer in enumerate(array, start=1):
+                f.write(np.array([kstp, kper], '<i4').tobytes())
+                f.write(np.array([1.0, float(kper)], real).tobytes())
+                f.write(b'            HEAD')
+                f.write(np.array([layer.shape[1], layer.shape[0], k], '<i4').tobytes())
+                f.write(layer.astype(real).tobytes())
+
+def budget_header(f, text, kper, nlay, nrow, ncol, imeth=None):
+    f.write(np.array([1, kper], '<i4').tobytes())
+    f.write(text.rjust(16).encode())
+    f.write(np.array([ncol, nrow, nlay if imeth is None else -nlay], '<i4').tobytes())
+    if imeth is not None:
+        f.write(np.array([imeth], '<i4').tobytes())
+        f.write(np.array([1.0, 1.0, float(kper)], '<f4').tobytes())
+
+def test_head_file_index_and_views(tmp_path):
+    heads = {(kper, 1): np.arange(2 * 3 * 4, dtype=float).reshape(2, 3, 4) + 100 * kper for kper in (1, 2)}
+    path = tmp_path / 'model.hds'
+    write_heads(path, heads)
+    with HeadFile(str(path)) as hds:
+        assert hds.precision == 'single'
+        assert hds.times() == [(1, 1), (2, 1)]
+        assert hds.index['offset'][0] == 44 and list(hds.index['layer']) == [1, 2, 1, 2]
+        layer = hds.get_data(kper=2, layer=2)
+        np.testing.assert_array_equal(layer, heads[(2, 1)][1])
+        assert not layer.flags.owndata and not layer.flags.writeable
+        # Layers are evenly spaced records, so the 3-D array is a strided view too
+        full = hds.get_data(kper=1)
+        np.testing.assert_array_equal(full, heads[(1, 1)])
+        assert not full.flags.owndata
+        np.testing.assert_array_equal(hds.get_data(), heads[(2, 1)])
+        with pytest.raises(KeyError):
+            hds.get_data(kper=3)
+        del layer, full
+
+    write_heads(path, heads, real='<f8')
+    hds = OWHMInterface(owhm_exe_path='owhm').open_heads('model.hds', workspace=str(tmp_path))
+    assert hds.precision == 'double'
+    np.testing.assert_array_equal(hds.get_data(totim=1.0, layer=1), heads[(1, 1)][0])
+    hds.close()
+
+def test_budget_file_terms(tmp_path):
+    path = tmp_path / 'model.cbc'
+    storage = np.arange(2 * 2 * 3, dtype='<f4').reshape(2, 2, 3)
+    with open(path, 'wb') as f:
+        budget_header(f, 'STORAGE', 1, 2, 2, 3)
+        f.write(storage.tobytes())
+        budget_header(f, 'WELLS', 1, 2, 2, 3, imeth=2)
+        f.write(np.array([2], '<i4').tobytes())
+        f.write(np.array([(4, -10.0), (9, -5.0)], dtype=[('node', '<i4'), ('q', '<f4')]).tobytes())
+        budget_header(f, 'GHB', 1, 2, 2, 3, imeth=5)
+        f.write(np.array([2], '<i4').tobytes())
+        f.write(b'IFACE'.ljust(16))
+        f.write(np.array([1], '<i4').tobytes())
+        f.write(np.array([(7, 2.5, 6.0)], dtype=[('node', '<i4'), ('q', '<f4'), ('iface', '<f4')]).tobytes())
+    with BudgetFile(str(path)) as cbc:
+        assert cbc.terms() == ['STORAGE', 'WELLS', 'GHB']
+        assert list(cbc.index['imeth']) == [0, 2, 5]
+        np.testing.assert_array_equal(cbc.get_data('storage', kper=1), storage)
+        wells = cbc.get_data('WELLS')
+        assert wells['node'].tolist() == [4, 9] and wells['q'].tolist() == [-10.0, -5.0]
+        ghb = cbc.get_data(' GHB ', kper=1, kstp=1)
+        assert ghb.dtype.names == ('node', 'q', 'iface') and ghb['iface'][0] == 6.0
+        with pytest.raises(KeyError):
+            cbc.get_data('RIVER LEAKAGE')
+        del wells, ghb
+
+    path.write_bytes(b'not a budget file')
+    with pytest.raises(ValueError):
+        BudgetFile(str(path))
@@ -21,4 +21,41 @@ def test_write_chd_input(tmp_path):
         content = f.read()
     assert 'CHD' in content or 'BEGIN CHD' in content
     assert '100.0' in content
-    assert '110.0' in content 
\ No newline at end of file
+    assert '110.0' in content 
+
+def read_chd_periods(path):
+    # Split the CHD block on its PERIOD headers, resolving reuse markers to the previous period's rows
+    with open(path, 'r') as f:
+        lines = [line.strip() for line in f]
+    block = lines[lines.index('BEGIN CHD') + 2:lines.index('END CHD')]
+    periods = {}
+    for line in block:
+        if line.startswith('PERIOD '):
+            per = int(line.split()[1])
+            periods[per] = []
+            current = per
+        elif line == 'REUSE PREVIOUS PERIOD':
+            periods[current] = list(periods[current - 1])
+        else:
+            periods[current].append(line)
+    return periods
+
+def test_write_chd_input_reuses_repeated_periods(tmp_path):
+    chd = mock_chd_package()
+    chd.stress_period_data[1] = [dict(record) for record in chd.stress_period_data[0]]
+    chd.stress_period_data[2] = [{'k': 1, 'i': 1, 'j': 1, 'shead': 120.0, 'ehead': 90.0}]
+    output_file = tmp_path / 'CHD.dat'
+    write_chd_input(chd, str(output_file))
+    with open(output_file, 'r') as f:
+        content = f.read()
+    assert 'PERIOD' not in content and content.count('100.0') == 2
+    write_chd_input(chd, str(output_file), reuse_periods=True)
+    with open(output_file, 'r') as f:
+        content = f.read()
+    assert content.count('100.0') == 1
+    assert '  PERIOD 1\n  REUSE PREVIOUS PERIOD\n  PERIOD 2\n' in content
+    periods = read_chd_periods(output_file)
+    assert periods == {
+        per: [f"{r['k']}   {r['i']}   {r['j']}   {r['shead']}   {r['ehead']}" for r in records]
+        for per, records in chd.stress_period_data.items()
+    }
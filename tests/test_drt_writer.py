@@ -1,4 +1,5 @@
 import pytest
+import numpy as np
 from flopy_owhm_interface.drt_writer import write_drt_input
 
 def mock_drt_package():
@@ -21,4 +22,14 @@ def test_write_drt_input(tmp_path):
         content = f.read()
     assert 'DRT' in content or 'BEGIN DRT' in content
     assert '0.5' in content
-    assert '0.6' in content 
\ No newline at end of file
+    assert '0.6' in content 
+
+def test_write_drt_input_structured_array_reports_row(tmp_path):
+    drt = mock_drt_package()
+    drt.stress_period_data = {
+        0: np.array([(1, 1, 1, 10.0, 100.0, 0.5), (1, 2, 2, 12.0, 200.0, 1.5)],
+                    dtype=[('k', 'i4'), ('i', 'i4'), ('j', 'i4'),
+                           ('elev', 'f8'), ('cond', 'f8'), ('return_fraction', 'f8')]),
+    }
+    with pytest.raises(ValueError, match=r'stress_period_data\[0\]\[1\]'):
+        write_drt_input(drt, str(tmp_path / 'DRT.dat'))
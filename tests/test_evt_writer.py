@@ -23,4 +23,40 @@ def test_write_evt_input(tmp_path):
     assert 'BEGIN EVT' in content
     assert '1   1   1   100.0   0.01' in content
     assert '1   2   2   99.0   0.02' in content
-    assert 'END EVT' in content 
\ No newline at end of file
+    assert 'END EVT' in content 
+
+def test_write_evt_input_array_fill(tmp_path):
+    evt = mock_evt_package()
+    evt.stress_period_data[0].append({'k': 1, 'i': 1, 'j': 2, 'surf': 98.0, 'evtr': 0.03})
+    output_file = tmp_path / 'EVT.dat'
+    # Cell (1, 2, 1) has no surf, which cannot be filled with 0.0, so the period stays a list
+    write_evt_input(evt, str(output_file), grid_shape=(1, 2, 2))
+    with open(output_file, 'r') as f:
+        content = f.read()
+    assert 'ARRAY' not in content
+    assert '1   1   2   98.0   0.03' in content
+    with pytest.raises(ValueError, match='surf is missing'):
+        write_evt_input(evt, str(output_file), array_output='array', grid_shape=(1, 2, 2))
+    evt.stress_period_data[0].append({'k': 1, 'i': 2, 'j': 1, 'surf': 97.0, 'evtr': 0.0})
+    write_evt_input(evt, str(output_file), grid_shape=(1, 2, 2))
+    with open(output_file, 'r') as f:
+        content = f.read()
+    assert '  ARRAY SURF PERIOD 0 LAYER 1\n  INTERNAL 1.0 (FREE) -1\n100.0 98.0\n97.0 99.0\n' in content
+
+def test_write_evt_input_grid_fields(tmp_path):
+    import numpy as np
+    evt = mock_evt_package()
+    evt.stress_period_data = {0: {'surf': np.array([[100.0, 99.0]]), 'evtr': 0.01}}
+    output_file = tmp_path / 'EVT.dat'
+    write_evt_input(evt, str(output_file), array_output='list')
+    with open(output_file, 'r') as f:
+        content = f.read()
+    assert '  1   1   1   100.0   0.01\n  1   1   2   99.0   0.01\n' in content
+    # A bad streamed period fails the write without leaving a partial file behind
+    evt.stress_period_data = lambda: iter([(0, {'surf': np.array([[100.0, 99.0]]), 'evtr': np.array([[0.01, -1.0]])})])
+    with pytest.raises(ValueError, match='evtr'):
+        write_evt_input(evt, str(output_file), array_output='list')
+    with open(output_file, 'r') as f:
+        assert f.read() == content
+    assert sorted(os.listdir(tmp_path)) == ['EVT.dat']
+
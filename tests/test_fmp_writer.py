@@ -1,4 +1,6 @@
 import pytest
+import numpy as np
+import pandas as pd
 from flopy_owhm_interface.fmp_writer import write_fmp_input
 
 def mock_fmp_package():
@@ -20,4 +22,49 @@ def test_write_fmp_input(tmp_path):
         content = f.read()
     assert 'FMP' in content or 'BEGIN FMP' in content
     assert 'Farm1' in content
-    assert 'Farm2' in content 
\ No newline at end of file
+    assert 'Farm2' in content 
+
+def mock_fmp_demand_package(demand):
+    class MockFmp:
+        pass
+    fmp = MockFmp()
+    fmp.farm_dict = {1: {'name': 'Farm1', 'area': 100.0}, 2: {'name': 'Farm2', 'area': 200.0}}
+    fmp.stress_period_data = demand
+    return fmp
+
+def test_write_fmp_input_demand_dataframe(tmp_path):
+    demand = pd.DataFrame({2: [5.0, 6.0], 1: [1.5, 2.5]}, index=[0, 1])
+    fmp = mock_fmp_demand_package(demand)
+    output_file = tmp_path / 'FMP.dat'
+    write_fmp_input(fmp, str(output_file))
+    content = output_file.read_text()
+    block = content.split('BEGIN DEMAND\n')[1].split('END DEMAND')[0]
+    assert block.splitlines()[1:] == ['  0   1   1.5', '  0   2   5.0', '  1   1   2.5', '  1   2   6.0']
+
+def test_write_fmp_input_demand_array_negative(tmp_path):
+    fmp = mock_fmp_demand_package(np.array([[1.0, 2.0], [3.0, -4.0]]))
+    with pytest.raises(ValueError, match='farm 2 in stress period 1 must be non-negative'):
+        write_fmp_input(fmp, str(tmp_path / 'FMP.dat'))
+
+def test_write_fmp_input_demand_shards(tmp_path, monkeypatch):
+    import os
+    from flopy_owhm_interface import shards
+    fmp = mock_fmp_demand_package(np.array([[1.5, 5.0], [2.5, 6.0]]))
+    output_file = tmp_path / 'FMP.dat'
+    write_fmp_input(fmp, str(output_file), shard=True)
+    block = output_file.read_text().split('BEGIN DEMAND\n')[1].split('END DEMAND')[0]
+    assert block.splitlines()[1:] == ['  OPEN/CLOSE FMP_sp0.dat', '  OPEN/CLOSE FMP_sp1.dat']
+    assert (tmp_path / 'FMP_sp1.dat').read_text() == '  1   1   2.5\n  1   2   6.0\n'
+    # A failed shard write leaves the previous shards, no temporary files and the old manifest
+    manifest = (tmp_path / 'FMP.dat.shards.json').read_text()
+    def fail_replace(src, dst):
+        raise OSError('disk full')
+    with monkeypatch.context() as m:
+        m.setattr(shards.os, 'replace', fail_replace)
+        with pytest.raises(OSError, match='disk full'):
+            shards.write_shards(str(output_file), [(1, lambda f: f.write('partial\n'))])
+    assert (tmp_path / 'FMP_sp1.dat').read_text() == '  1   1   2.5\n  1   2   6.0\n'
+    assert (tmp_path / 'FMP.dat.shards.json').read_text() == manifest
+    assert not [name for name in os.listdir(tmp_path) if name.endswith('.tmp')]
+    write_fmp_input(fmp, str(output_file))
+    assert sorted(os.listdir(tmp_path)) == ['FMP.dat']
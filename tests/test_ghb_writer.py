@@ -19,4 +19,22 @@ def test_write_ghb_input(tmp_path):
         content = f.read()
     assert 'GHB' in content or 'BEGIN GHB' in content
     assert '1' in content
-    assert '2' in content 
\ No newline at end of file
+    assert '2' in content 
+
+def test_write_ghb_input_mflist(tmp_path):
+    import numpy as np
+    class MockMfList:
+        # FloPy MfList: periods of recarrays with 0-based cell indices
+        def __init__(self, data):
+            self.data = data
+    records = np.rec.fromrecords([(0, 0, 0, 100.0, 500.0), (1, 2, 3, 101.0, 600.0)],
+                                 names='k,i,j,bhead,cond')
+    ghb = mock_ghb_package()
+    ghb.stress_period_data = MockMfList({0: records})
+    output_file = tmp_path / 'GHB.dat'
+    write_ghb_input(ghb, str(output_file))
+    with open(output_file, 'r') as f:
+        content = f.read()
+    assert '  1   1   1   100.0   500.0\n  2   3   4   101.0   600.0\n' in content
+    assert records['k'].tolist() == [0, 1]
+
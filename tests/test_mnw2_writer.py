@@ -21,4 +21,29 @@ def test_write_mnw2_input(tmp_path):
         content = f.read()
     assert 'MNW2' in content or 'BEGIN MNW2' in content
     assert 'W1' in content
-    assert 'W2' in content 
\ No newline at end of file
+    assert 'W2' in content 
+
+def test_write_mnw2_input_shards(tmp_path):
+    import os
+    mnw2 = mock_mnw2_package()
+    mnw2.stress_period_data[1] = [{'wellid': 'W1', 'k': 1, 'i': 1, 'j': 1, 'qdes': 50.0}]
+    output_file = tmp_path / 'MNW2.dat'
+    write_mnw2_input(mnw2, str(output_file), shard=True)
+    with open(output_file, 'r') as f:
+        content = f.read()
+    assert '  OPEN/CLOSE MNW2_sp0.dat\n  OPEN/CLOSE MNW2_sp1.dat\n' in content
+    with open(tmp_path / 'MNW2_sp1.dat', 'r') as f:
+        assert f.read() == '  W1   1   1   1   50.0\n'
+    # Only the changed shard is rewritten; shards of removed periods are deleted
+    os.utime(tmp_path / 'MNW2_sp0.dat', ns=(0, 0))
+    mnw2.stress_period_data[1][0]['qdes'] = 60.0
+    write_mnw2_input(mnw2, str(output_file), shard=True)
+    assert os.stat(tmp_path / 'MNW2_sp0.dat').st_mtime_ns == 0
+    with open(tmp_path / 'MNW2_sp1.dat', 'r') as f:
+        assert f.read() == '  W1   1   1   1   60.0\n'
+    del mnw2.stress_period_data[1]
+    write_mnw2_input(mnw2, str(output_file), shard=True)
+    assert not (tmp_path / 'MNW2_sp1.dat').exists()
+    # Writing without shards removes the old shards and their manifest
+    write_mnw2_input(mnw2, str(output_file))
+    assert sorted(os.listdir(tmp_path)) == ['MNW2.dat']
@@ -0,0 +1,71 @@
+import os
+import pandas as pd
+import pytest
+from flopy_owhm_interface.output_cache import _cache_paths, cached_parse
+from flopy_owhm_interface.output_parsers import parse_sfr_output
+
+def test_cached_parse(tmp_path):
+    output_file = tmp_path / 'SFR.CSV'
+    output_file.write_text('# SFR output\nREACH,FLOW\n1,2.5\n2,3.5\n')
+    calls = []
+    def parser(path):
+        calls.append(path)
+        return parse_sfr_output(path)
+    first = cached_parse(parser, str(output_file))
+    second = cached_parse(parser, str(output_file))
+    assert len(calls) == 1
+    assert second.equals(first)
+    output_file.write_text('# SFR output\nREACH,FLOW\n1,2.5\n2,3.5\n3,4.5\n')
+    third = cached_parse(parser, str(output_file))
+    assert len(calls) == 2
+    assert len(third) == 3
+
+def test_cached_parse_corrupt_entry(tmp_path):
+    output_file = tmp_path / 'SFR.CSV'
+    output_file.write_text('# SFR output\nREACH,FLOW\n1,2.5\n')
+    calls = []
+    def parser(path):
+        calls.append(path)
+        return parse_sfr_output(path)
+    first = cached_parse(parser, str(output_file))
+    data_path, _ = _cache_paths(str(output_file), None)
+    with open(data_path, 'r+b') as f:
+        f.truncate(8)
+    # A truncated entry is a cache miss: reparsed and replaced
+    assert cached_parse(parser, str(output_file)).equals(first)
+    assert cached_parse(parser, str(output_file)).equals(first)
+    assert len(calls) == 2
+
+@pytest.mark.skipif(not hasattr(os, 'geteuid') or os.geteuid() == 0, reason='permissions are not enforced for root')
+def test_cached_parse_read_only_cache_dir(tmp_path, caplog):
+    output_file = tmp_path / 'SFR.CSV'
+    output_file.write_text('# SFR output\nREACH,FLOW\n1,2.5\n')
+    cache_dir = tmp_path / 'cache'
+    cache_dir.mkdir()
+    cache_dir.chmod(0o500)
+    try:
+        df = cached_parse(parse_sfr_output, str(output_file), cache_dir=str(cache_dir))
+    finally:
+        cache_dir.chmod(0o700)
+    assert df['FLOW'].tolist() == [2.5]
+    assert os.listdir(cache_dir) == []
+    assert 'Could not cache' in caplog.text
+
+def test_cached_parse_store_failure(tmp_path, caplog, monkeypatch):
+    output_file = tmp_path / 'SFR.CSV'
+    output_file.write_text('# SFR output\nREACH,FLOW\n1,2.5\n')
+    # A file in place of the cache directory cannot hold entries, even for root
+    cache_dir = tmp_path / 'cache'
+    cache_dir.write_text('')
+    df = cached_parse(parse_sfr_output, str(output_file), cache_dir=str(cache_dir))
+    assert df['FLOW'].tolist() == [2.5]
+    assert 'Could not cache' in caplog.text
+    def fail(self, path):
+        raise ValueError('cannot serialize')
+    monkeypatch.setattr(pd.DataFrame, 'to_pickle', fail)
+    monkeypatch.setattr(pd.DataFrame, 'to_parquet', fail)
+    caplog.clear()
+    df = cached_parse(parse_sfr_output, str(output_file), cache_dir=str(tmp_path / 'entries'))
+    assert df['FLOW'].tolist() == [2.5]
+    assert 'cannot serialize' in caplog.text
+    assert os.listdir(tmp_path / 'entries') == []
@@ -0,0 +1,34 @@
+import pytest
+import pandas as pd
+from flopy_owhm_interface.output_parsers import parse_sfr_output, read_owhm_csv
+
+def write_sfr_csv(path):
+    lines = ['# SFR output\n', 'REACH,SEGMENT,FLOW\n']
+    for reach in range(1, 11):
+        lines.append(f'{reach},{(reach + 1) // 2},{reach * 1.5}\n')
+        if reach == 5:
+            lines.append('! mid-file comment\n')
+    path.write_text(''.join(lines))
+
+def test_parse_sfr_output(tmp_path):
+    output_file = tmp_path / 'SFR.CSV'
+    write_sfr_csv(output_file)
+    df = parse_sfr_output(str(output_file))
+    assert list(df.columns) == ['REACH', 'SEGMENT', 'FLOW']
+    assert len(df) == 10
+    assert df['FLOW'].iloc[-1] == 15.0
+
+def test_parse_sfr_output_chunked(tmp_path):
+    output_file = tmp_path / 'SFR.CSV'
+    write_sfr_csv(output_file)
+    chunks = list(parse_sfr_output(str(output_file), usecols=['SEGMENT', 'FLOW'],
+                                   dtype={'SEGMENT': 'int32'}, chunksize=3))
+    assert [len(chunk) for chunk in chunks] == [3, 3, 3, 1]
+    df = pd.concat(chunks, ignore_index=True)
+    assert list(df.columns) == ['SEGMENT', 'FLOW']
+    assert df['SEGMENT'].dtype == 'int32'
+    assert df.groupby('SEGMENT')['FLOW'].sum().loc[5] == 28.5
+
+def test_read_owhm_csv_missing_file(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        read_owhm_csv(str(tmp_path / 'missing.csv'), chunksize=10)
@@ -1,5 +1,7 @@
 import pytest
+import asyncio
 import os
+import sys
 from flopy_owhm_interface.owhm_interface import OWHMInterface
 
 def mock_flopy_model():
@@ -27,4 +29,208 @@ def test_write_input_files(tmp_path):
         assert os.path.exists(fpath)
         with open(fpath, 'r') as f:
             content = f.read()
-        assert fname.split('.')[0] in content or f'BEGIN {fname.split(".")[0]}' in content 
\ No newline at end of file
+        assert fname.split('.')[0] in content or f'BEGIN {fname.split(".")[0]}' in content 
+
+def test_write_input_files_concurrent(tmp_path):
+    class MockModel:
+        pass
+    class MockEvt: stress_period_data = {0: [{'k': 1, 'i': 1, 'j': 1, 'surf': 100.0, 'evtr': 0.01}]}
+    class MockRch: stress_period_data = {0: [{'k': 1, 'i': 1, 'j': 1, 'recharge': 0.01}]}
+    model = MockModel()
+    model.evt = MockEvt()
+    model.rch = MockRch()
+    interface = OWHMInterface(owhm_exe_path='dummy_exe')
+    timings = interface.write_input_files(model, workspace=str(tmp_path), max_workers=2)
+    assert set(timings) == {'EVT', 'RCH'}
+    assert os.path.exists(tmp_path / 'EVT.dat')
+    assert os.path.exists(tmp_path / 'RCH.dat')
+
+def test_write_input_files_incremental(tmp_path):
+    class MockModel:
+        pass
+    class MockEvt: stress_period_data = {0: [{'k': 1, 'i': 1, 'j': 1, 'surf': 100.0, 'evtr': 0.01}]}
+    class MockRch: stress_period_data = {0: [{'k': 1, 'i': 1, 'j': 1, 'recharge': 0.01}]}
+    model = MockModel()
+    model.evt = MockEvt()
+    model.rch = MockRch()
+    interface = OWHMInterface(owhm_exe_path='dummy_exe')
+    first = interface.write_input_files(model, workspace=str(tmp_path), incremental=True)
+    assert set(first) == {'EVT', 'RCH'}
+    evt_mtime = os.stat(tmp_path / 'EVT.dat').st_mtime_ns
+    model.rch = MockRch()
+    model.rch.stress_period_data = {0: [{'k': 1, 'i': 1, 'j': 1, 'recharge': 0.05}]}
+    second = interface.write_input_files(model, workspace=str(tmp_path), incremental=True)
+    assert set(second) == {'RCH'}
+    assert os.stat(tmp_path / 'EVT.dat').st_mtime_ns == evt_mtime
+
+def test_write_input_files_incremental_grid_inputs(tmp_path):
+    import numpy as np
+    class MockModel:
+        pass
+    class MockRch:
+        pass
+    grid_file = tmp_path / 'rch_0.npy'
+    np.save(grid_file, np.array([[0.01, 0.02]]))
+    model = MockModel()
+    model.rch = MockRch()
+    model.rch.stress_period_data = {0: str(grid_file)}
+    interface = OWHMInterface(owhm_exe_path='dummy_exe')
+    write = lambda: set(interface.write_input_files(model, workspace=str(tmp_path), incremental=True))
+    assert write() == {'RCH'}
+    assert write() == set()
+    # .npy paths and memory-mapped arrays are fingerprinted by file version, not content
+    model.rch.stress_period_data = {0: np.load(grid_file, mmap_mode='r')}
+    assert write() == {'RCH'}
+    assert write() == set()
+    model.rch.stress_period_data = {0: np.load(grid_file, mmap_mode='r')[:, 1:]}
+    assert write() == {'RCH'}
+    np.save(grid_file, np.array([[0.03, 0.04]]))
+    os.utime(grid_file, ns=(0, os.stat(grid_file).st_mtime_ns + 10**9))
+    model.rch.stress_period_data = {0: np.load(grid_file, mmap_mode='r')[:, 1:]}
+    assert write() == {'RCH'}
+    # Callables are rewritten every time unless they carry an owhm_fingerprint
+    periods = lambda: iter([(0, np.array([[0.01, 0.02]]))])
+    model.rch.stress_period_data = periods
+    assert write() == {'RCH'}
+    assert write() == {'RCH'}
+    periods.owhm_fingerprint = 'v1'
+    assert write() == {'RCH'}
+    assert write() == set()
+
+def test_write_input_files_incremental_shards(tmp_path):
+    class MockModel:
+        pass
+    class MockChd: stress_period_data = {0: [{'k': 1, 'i': 1, 'j': 1, 'shead': 100.0, 'ehead': 90.0}],
+                                         1: [{'k': 1, 'i': 1, 'j': 1, 'shead': 90.0, 'ehead': 80.0}]}
+    model = MockModel()
+    model.chd = MockChd()
+    interface = OWHMInterface(owhm_exe_path='dummy_exe')
+    write = lambda shard: set(interface.write_input_files(model, workspace=str(tmp_path), incremental=True,
+                                                          shard=shard))
+    assert write(True) == {'CHD'}
+    assert write(True) == set()
+    # A deleted shard is regenerated
+    os.remove(tmp_path / 'CHD_sp1.dat')
+    assert write(True) == {'CHD'}
+    assert (tmp_path / 'CHD_sp1.dat').exists()
+    # Writing unsharded removes the shards and their manifest
+    assert write(False) == {'CHD'}
+    assert not (tmp_path / 'CHD_sp0.dat').exists() and not (tmp_path / 'CHD.dat.shards.json').exists()
+    assert write(False) == set()
+
+def test_write_input_files_reuse_periods(tmp_path):
+    class MockModel:
+        pass
+    class MockGhb: stress_period_data = {0: [{'k': 1, 'i': 1, 'j': 1, 'bhead': 100.0, 'cond': 500.0}],
+                                         1: [{'k': 1, 'i': 1, 'j': 1, 'bhead': 100.0, 'cond': 500.0}]}
+    model = MockModel()
+    model.ghb = MockGhb()
+    interface = OWHMInterface(owhm_exe_path='dummy_exe')
+    interface.write_input_files(model, workspace=str(tmp_path))
+    with open(tmp_path / 'GHB.dat', 'r') as f:
+        assert 'REUSE' not in f.read()
+    interface.write_input_files(model, workspace=str(tmp_path), reuse_periods=True)
+    with open(tmp_path / 'GHB.dat', 'r') as f:
+        content = f.read()
+    assert '  PERIOD 0\n  1   1   1   100.0   500.0\n  PERIOD 1\n  REUSE PREVIOUS PERIOD\n' in content
+
+@pytest.mark.skipif(sys.platform == 'win32', reason='uses a shebang script as the executable')
+def test_run_model_streams_output(tmp_path):
+    script = tmp_path / 'fake_owhm.py'
+    script.write_text(f'#!{sys.executable}\nimport sys\nfor n in range(3):\n    print(f"step {{n}}")\n'
+                      'print("warning", file=sys.stderr)\n')
+    script.chmod(0o755)
+    lines = []
+    interface = OWHMInterface(owhm_exe_path=str(script))
+    log_file = tmp_path / 'owhm.log'
+    interface.run_model(workspace=str(tmp_path), line_callback=lambda line, stream: lines.append((stream, line)),
+                        log_file=str(log_file))
+    assert ('stdout', 'step 2') in lines
+    assert ('stderr', 'warning') in lines
+    assert 'step 0' in log_file.read_text()
+
+@pytest.mark.skipif(sys.platform == 'win32', reason='uses a shebang script as the executable')
+def test_arun_model_concurrent_and_timeout(tmp_path, monkeypatch):
+    script = tmp_path / 'fake_owhm.py'
+    script.write_text(f'#!{sys.executable}\nimport os, sys, time\nprint("started", flush=True)\n'
+                      'time.sleep(float(os.environ.get("FAKE_OWHM_SLEEP", "0")))\n')
+    script.chmod(0o755)
+    interface = OWHMInterface(owhm_exe_path=str(script))
+    lines = []
+
+    async def main():
+        await asyncio.gather(*[interface.arun_model(workspace=str(tmp_path),
+                                                    line_callback=lambda line, stream: lines.append(line))
+                               for _ in range(3)])
+        monkeypatch.setenv('FAKE_OWHM_SLEEP', '30')
+        with pytest.raises(asyncio.TimeoutError):
+            await interface.arun_model(workspace=str(tmp_path), line_callback=lambda line, stream: None,
+                                       timeout=0.5)
+
+    asyncio.run(main())
+    assert lines == ['started'] * 3
+
+@pytest.mark.skipif(sys.platform == 'win32', reason='uses a shebang script as the executable')
+def test_arun_model_long_lines(tmp_path):
+    script = tmp_path / 'fake_owhm.py'
+    script.write_text(f'#!{sys.executable}\nprint("x" * (3 << 20))\nprint("done")\nprint("y" * (2 << 20), end="")\n')
+    script.chmod(0o755)
+    interface = OWHMInterface(owhm_exe_path=str(script))
+    lines = []
+    asyncio.run(interface.arun_model(workspace=str(tmp_path), line_callback=lambda line, stream: lines.append(line)))
+    assert [len(line) for line in lines] == [3 << 20, 4, 2 << 20]
+
+def test_read_outputs_lazy(tmp_path):
+    (tmp_path / 'SFR.CSV').write_text('# SFR output\nREACH,FLOW\n1,2.5\n')
+    interface = OWHMInterface(owhm_exe_path='dummy_exe')
+    results = interface.read_outputs(workspace=str(tmp_path), lazy=True)
+    assert results.available() == ['sfr']
+    assert results.loaded() == []
+    assert 'fmp' in results
+    assert results['sfr']['FLOW'].iloc[0] == 2.5
+    assert results.loaded() == ['sfr']
+    assert results['fmp'] is None
+
+def test_read_outputs_concurrent_with_dtypes(tmp_path):
+    (tmp_path / 'SFR.CSV').write_text('# SFR output\nREACH,FLOW\n1,2.5\n')
+    (tmp_path / 'LAK.CSV').write_text('LAKE,STAGE\n1,10.0\n')
+    interface = OWHMInterface(owhm_exe_path='dummy_exe')
+    results = interface.read_outputs(workspace=str(tmp_path), max_workers=4,
+                                     dtypes={'sfr': {'REACH': 'int16'}})
+    assert list(results) == ['fmp', 'maw', 'sfr', 'swr', 'lak', 'drn', 'res', 'accounting']
+    assert results['sfr']['REACH'].dtype == 'int16'
+    assert results['lak']['STAGE'].iloc[0] == 10.0
+    assert results['fmp'] is None
+
+def test_write_and_read_timing_report(tmp_path):
+    import json
+    class MockModel:
+        pass
+    class MockRch: stress_period_data = {0: [{'k': 1, 'i': 1, 'j': 1, 'recharge': 0.01},
+                                             {'k': 1, 'i': 2, 'j': 1, 'recharge': 0.02}]}
+    model = MockModel()
+    model.rch = MockRch()
+    seen = []
+    interface = OWHMInterface(owhm_exe_path='dummy_exe')
+    interface.write_input_files(model, workspace=str(tmp_path), timing_callback=seen.append)
+    timing = interface.write_report['RCH']
+    assert seen == [timing]
+    assert timing.records == 2
+    assert timing.bytes == os.path.getsize(tmp_path / 'RCH.dat')
+    assert timing.validation_seconds + timing.io_seconds == pytest.approx(timing.duration)
+    interface.write_report.to_chrome_trace(str(tmp_path / 'trace.json'))
+    events = json.loads((tmp_path / 'trace.json').read_text())['traceEvents']
+    assert [event['name'] for event in events] == ['RCH', 'validate', 'format+write']
+
+    (tmp_path / 'SFR.CSV').write_text('REACH,FLOW\n1,2.5\n2,3.0\n')
+    interface.read_outputs(workspace=str(tmp_path))
+    assert [t.name for t in interface.read_report] == ['SFR']
+    assert interface.read_report['SFR'].records == 2
+
+def test_import_defers_writers_and_pandas():
+    import subprocess
+    code = ('import sys; from flopy_owhm_interface import OWHMInterface; '
+            'print(sorted(m for m in sys.modules if m == "pandas" or m.endswith("_writer")))')
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    out = subprocess.run([sys.executable, '-c', code], cwd=root, capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == '[]'
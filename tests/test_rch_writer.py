@@ -1,4 +1,5 @@
 import pytest
+import numpy as np
 from flopy_owhm_interface.rch_writer import write_rch_input
 
 def mock_rch_package():
@@ -21,4 +22,76 @@ def test_write_rch_input(tmp_path):
         content = f.read()
     assert 'RCH' in content or 'BEGIN RCH' in content
     assert '0.01' in content
-    assert '0.02' in content 
\ No newline at end of file
+    assert '0.02' in content 
+
+def test_write_rch_input_structured_array(tmp_path):
+    rch = mock_rch_package()
+    rch.stress_period_data = {
+        0: np.array([(1, 1, 1, 0.01), (1, 2, 2, 0.02)],
+                    dtype=[('k', 'i4'), ('i', 'i4'), ('j', 'i4'), ('recharge', 'f8')]),
+    }
+    output_file = tmp_path / 'RCH.dat'
+    write_rch_input(rch, str(output_file))
+    with open(output_file, 'r') as f:
+        content = f.read()
+    assert '  1   1   1   0.01\n' in content
+    assert '  1   2   2   0.02\n' in content
+
+def test_write_rch_input_memory_mapped_grid(tmp_path):
+    grid_file = tmp_path / 'rch_0.npy'
+    np.save(grid_file, np.array([[0.01, np.nan], [0.0, 0.02]]))
+    rch = mock_rch_package()
+    rch.stress_period_data = {0: str(grid_file)}
+    output_file = tmp_path / 'RCH.dat'
+    write_rch_input(rch, str(output_file), array_output='list')
+    with open(output_file, 'r') as f:
+        content = f.read()
+    assert '  1   1   1   0.01\n  1   2   1   0.0\n  1   2   2   0.02\n' in content
+    assert '  1   1   2' not in content
+
+def test_write_rch_input_array_output(tmp_path):
+    rch = mock_rch_package()
+    rch.stress_period_data[0].append({'k': 1, 'i': 1, 'j': 2, 'recharge': 0.04})
+    rch.stress_period_data[1] = [{'k': 1, 'i': 1, 'j': 1, 'recharge': 0.03}]
+    output_file = tmp_path / 'RCH.dat'
+    write_rch_input(rch, str(output_file), grid_shape=(1, 2, 2))
+    with open(output_file, 'r') as f:
+        content = f.read()
+    # Period 0 covers most of the grid and is written as an array; period 1 stays a list
+    assert '  ARRAY RECHARGE PERIOD 0 LAYER 1\n  INTERNAL 1.0 (FREE) -1\n0.01 0.04\n0.0 0.02\n' in content
+    assert '  1   1   1   0.03\n' in content
+    write_rch_input(rch, str(output_file), array_output='external', grid_shape=(1, 2, 2))
+    with open(output_file, 'r') as f:
+        content = f.read()
+    assert '  OPEN/CLOSE RCH_recharge_1_1.txt 1.0 (FREE) -1\n' in content
+    with open(tmp_path / 'RCH_recharge_1_1.txt', 'r') as f:
+        assert f.read() == '0.03 0.0\n0.0 0.0\n'
+
+def test_write_rch_input_auto_coverage(tmp_path):
+    rch = mock_rch_package()
+    # Half of the grid is not most of it
+    output_file = tmp_path / 'RCH.dat'
+    write_rch_input(rch, str(output_file), grid_shape=(1, 2, 2))
+    with open(output_file, 'r') as f:
+        assert 'ARRAY' not in f.read()
+    # Every cell of layer 1 is only a quarter of a 4-layer grid
+    rch.stress_period_data[0] = [{'k': 1, 'i': i, 'j': j, 'recharge': 0.01} for i in (1, 2) for j in (1, 2)]
+    write_rch_input(rch, str(output_file), grid_shape=(4, 2, 2))
+    with open(output_file, 'r') as f:
+        assert 'ARRAY' not in f.read()
+    write_rch_input(rch, str(output_file), grid_shape=(1, 2, 2))
+    with open(output_file, 'r') as f:
+        assert '  ARRAY RECHARGE PERIOD 0 LAYER 1\n' in f.read()
+
+def test_write_rch_input_sparse_period_stays_list(tmp_path, monkeypatch):
+    from flopy_owhm_interface import grid_arrays
+    def no_scatter(*args, **kwargs):
+        raise AssertionError('sparse period was scattered into a dense grid')
+    monkeypatch.setattr(grid_arrays, 'records_to_grid', no_scatter)
+    rch = mock_rch_package()
+    output_file = tmp_path / 'RCH.dat'
+    write_rch_input(rch, str(output_file), grid_shape=(10, 1000, 1000))
+    with open(output_file, 'r') as f:
+        content = f.read()
+    assert 'ARRAY' not in content
+    assert '  1   1   1   0.01\n  1   2   2   0.02\n' in content
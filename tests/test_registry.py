@@ -0,0 +1,64 @@
+import pickle
+import pytest
+from flopy_owhm_interface.owhm_interface import OWHMInterface
+from flopy_owhm_interface.registry import (
+    LazyFunction, register_package, unregister_package, registered_packages, schedule,
+)
+
+order = []
+
+def write_base_input(package, output_path, **kwargs):
+    order.append('base')
+    with open(output_path, 'w') as f:
+        f.write(f'BASE {package.value}\n')
+
+def write_derived_input(package, output_path, **kwargs):
+    # Reads the file written by the package it depends on
+    with open(output_path.replace('DERIVED', 'BASE')) as f:
+        base = f.read()
+    order.append('derived')
+    with open(output_path, 'w') as f:
+        f.write(base.replace('BASE', 'DERIVED'))
+
+@pytest.fixture
+def custom_packages():
+    register_package('derived', 'DERIVED.dat', f'{__name__}:write_derived_input', depends=('base',))
+    register_package('base', 'BASE.dat', write_base_input)
+    order.clear()
+    yield
+    unregister_package('derived')
+    unregister_package('base')
+
+def test_builtin_packages_registered():
+    attrs = [spec.attr for spec in registered_packages()]
+    assert attrs[:3] == ['fmp', 'maw', 'sfr']
+    assert {spec.attr for spec in registered_packages() if spec.shardable} == {'ghb', 'chd', 'riv', 'drn', 'mnw2', 'fmp'}
+    writer = registered_packages()[0].writer
+    assert isinstance(pickle.loads(pickle.dumps(writer)), LazyFunction)
+    assert writer.__name__ == 'write_fmp_input'
+
+def test_register_package_and_schedule(tmp_path, custom_packages):
+    with pytest.raises(ValueError):
+        register_package('base', 'OTHER.dat', write_base_input)
+    assert schedule(['derived', 'base']) == ['base', 'derived']
+    assert schedule(['derived']) == ['derived']
+
+    class MockModel:
+        pass
+    class MockPackage:
+        value = 7
+    model = MockModel()
+    model.base = MockPackage()
+    model.derived = MockPackage()
+    model.rch = MockPackage()
+    interface = OWHMInterface(owhm_exe_path='dummy_exe')
+    timings = interface.write_input_files(model, workspace=str(tmp_path), max_workers=4,
+                                          packages=['derived', 'base'])
+    assert set(timings) == {'BASE', 'DERIVED'}
+    assert order == ['base', 'derived']
+    assert (tmp_path / 'DERIVED.dat').read_text() == 'DERIVED 7\n'
+    assert not (tmp_path / 'RCH.dat').exists()
+    with pytest.raises(ValueError):
+        interface.write_input_files(model, workspace=str(tmp_path), packages=['nope'])
+    with pytest.raises(ValueError):
+        interface.write_input_files(model, workspace=str(tmp_path), packages=['ghb'])
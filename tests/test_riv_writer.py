@@ -21,4 +21,17 @@ def test_write_riv_input(tmp_path):
         content = f.read()
     assert 'RIV' in content or 'BEGIN RIV' in content
     assert '10.0' in content
-    assert '12.0' in content 
\ No newline at end of file
+    assert '12.0' in content 
+
+def test_write_riv_input_float_precision(tmp_path):
+    import numpy as np
+    riv = mock_riv_package()
+    riv.stress_period_data[0][0]['stage'] = 10.123456789
+    riv.stress_period_data[1] = np.array([(1, 3, 3, 1.0 / 3.0, 50.0, 4.0)],
+                                         dtype=[('k', 'i4'), ('i', 'i4'), ('j', 'i4'),
+                                                ('stage', 'f8'), ('cond', 'f8'), ('rbot', 'f8')])
+    output_file = tmp_path / 'RIV.dat'
+    write_riv_input(riv, str(output_file), float_precision=4)
+    content = output_file.read_text()
+    assert '  1   1   1   10.12   100   5\n' in content
+    assert '  1   3   3   0.3333   50   4\n' in content
@@ -0,0 +1,76 @@
+import pytest
+from flopy_owhm_interface.sfr_network import SFRNetwork
+from flopy_owhm_interface.validation import OWHMValidationError
+from flopy_owhm_interface.sfr_writer import write_sfr_input
+
+def mock_segments():
+    # 1 -> 3 <- 2, 3 -> 4; 5 is an isolated segment
+    return {
+        4: {'upstream': 3, 'downstream': -1, 'length': 40.0},
+        3: {'upstream': 1, 'downstream': 4, 'length': 30.0},
+        2: {'upstream': -1, 'downstream': 3, 'length': 20.0},
+        1: {'upstream': -1, 'downstream': 3, 'length': 10.0},
+        5: {'upstream': -1, 'downstream': -1, 'length': 5.0},
+    }
+
+def test_sfr_network_topology():
+    network = SFRNetwork(mock_segments())
+    assert network.errors == []
+    order = network.routing_ids().tolist()
+    assert order.index(1) < order.index(3) < order.index(4)
+    assert order.index(2) < order.index(3)
+    assert sorted(network.upstream_of(3).tolist()) == [1, 2]
+    assert network.orphans.tolist() == [5]
+    assert network.n_components == 2
+    totals = network.accumulate({seg_id: seg['length'] for seg_id, seg in mock_segments().items()})
+    assert totals[network.position(4)] == 100.0
+
+def test_sfr_network_cycle():
+    segments = mock_segments()
+    segments[4]['downstream'] = 1
+    segments[2]['downstream'] = 9
+    class MockSfr:
+        pass
+    sfr = MockSfr()
+    sfr.segments = segments
+    sfr.reaches = {}
+    with pytest.raises(OWHMValidationError) as excinfo:
+        write_sfr_input(sfr, 'unused.dat')
+    assert len(excinfo.value.errors) == 2
+    assert 'downstream segment 9 referenced by segment 2' in str(excinfo.value)
+    assert 'cycle' in str(excinfo.value)
+
+def test_write_sfr_input_routing_order(tmp_path):
+    class MockSfr:
+        pass
+    sfr = MockSfr()
+    sfr.segments = mock_segments()
+    sfr.reaches = {1: {'segment': 4, 'layer': 1, 'row': 1, 'col': 1, 'length': 40.0}}
+    output_file = tmp_path / 'SFR.dat'
+    network = write_sfr_input(sfr, str(output_file))
+    block = output_file.read_text().split('BEGIN SEGMENTS\n')[1].split('END SEGMENTS')[0]
+    written = [int(line.split()[0]) for line in block.splitlines()[1:]]
+    assert written == network.routing_ids().tolist()
+    assert written.index(1) < written.index(3) < written.index(4)
+
+def test_sfr_network_topology_warnings(tmp_path, caplog):
+    segments = mock_segments()
+    # 7 -> 6 is a second network, apart from 1, 2 -> 3 -> 4
+    segments[6] = {'upstream': 7, 'downstream': -1, 'length': 6.0}
+    segments[7] = {'upstream': -1, 'downstream': -1, 'length': 7.0}
+    network = SFRNetwork(segments)
+    assert network.errors == []
+    assert network.warnings == ['Segments 5 are orphans: they are connected to no other segment.',
+                                'Segments form 2 disconnected networks, containing segments 4, 6 respectively.']
+    assert SFRNetwork(mock_segments()).warnings == ['Segments 5 are orphans: they are connected to no other segment.']
+    class MockSfr:
+        pass
+    sfr = MockSfr()
+    sfr.segments = segments
+    sfr.reaches = {}
+    write_sfr_input(sfr, str(tmp_path / 'SFR.dat'))
+    assert 'Segments 5 are orphans' in caplog.text and '2 disconnected networks' in caplog.text
+    with pytest.raises(OWHMValidationError) as excinfo:
+        write_sfr_input(sfr, str(tmp_path / 'SFR.dat'), strict_network=True)
+    assert len(excinfo.value.errors) == 2
+    assert 'orphans' in str(excinfo.value)
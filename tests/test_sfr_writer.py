@@ -1,4 +1,5 @@
 import pytest
+import numpy as np
 from flopy_owhm_interface.sfr_writer import write_sfr_input
 
 def mock_sfr_package():
@@ -19,4 +20,19 @@ def test_write_sfr_input(tmp_path):
         content = f.read()
     assert 'SFR' in content or 'BEGIN SFR' in content
     assert '1' in content
-    assert '2' in content 
\ No newline at end of file
+    assert '2' in content 
+
+def test_write_sfr_input_columnar_reaches(tmp_path):
+    class MockSfr:
+        pass
+    sfr = MockSfr()
+    sfr.segments = {1: {'upstream': -1, 'downstream': 2, 'length': 100.0},
+                    2: {'upstream': 1, 'downstream': -1, 'length': 200.0}}
+    dtype = [('segment', 'i4'), ('layer', 'i4'), ('row', 'i4'), ('col', 'i4'), ('length', 'f8')]
+    sfr.reaches = np.array([(1, 1, 1, 1, 50.0), (2, 1, 2, 2, 60.0)], dtype=dtype)
+    output_file = tmp_path / 'SFR.dat'
+    write_sfr_input(sfr, str(output_file))
+    assert '  2   2   1   2   2   60.0\n' in output_file.read_text()
+    sfr.reaches = np.array([(1, 1, 1, 1, 50.0), (3, 1, 2, 2, 60.0)], dtype=dtype)
+    with pytest.raises(ValueError, match=r'Segment not found in segments in reaches\[1\]'):
+        write_sfr_input(sfr, str(output_file))
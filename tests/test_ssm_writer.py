@@ -21,4 +21,19 @@ def test_write_ssm_input(tmp_path):
         content = f.read()
     assert 'SSM' in content or 'BEGIN SSM' in content
     assert '0.5' in content
-    assert '0.6' in content 
\ No newline at end of file
+    assert '0.6' in content 
+
+def test_write_ssm_input_grid_fields(tmp_path):
+    import numpy as np
+    ssm = mock_ssm_package()
+    ssm.stress_period_data = {0: {'itype': 1, 'c': np.array([[[0.5, np.nan], [0.0, 0.6]]])}}
+    output_file = tmp_path / 'SSM.dat'
+    write_ssm_input(ssm, str(output_file))
+    with open(output_file, 'r') as f:
+        content = f.read()
+    assert '  1   1   1   1   0.5\n  1   2   1   1   0.0\n  1   2   2   1   0.6\n' in content
+    assert '  1   1   2' not in content
+    ssm.stress_period_data = {0: {'itype': 1.5, 'c': np.zeros((1, 2))}}
+    with pytest.raises(ValueError, match='itype'):
+        write_ssm_input(ssm, str(output_file))
+
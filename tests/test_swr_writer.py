@@ -0,0 +1,57 @@
+import pytest
+import numpy as np
+import pandas as pd
+from flopy_owhm_interface.swr_writer import write_swr_input
+
+def mock_swr_package():
+    class MockSwr:
+        pass
+    swr = MockSwr()
+    swr.reaches = {
+        1: {'layer': 1, 'row': 1, 'col': 1, 'length': 100.0},
+        2: {'layer': 1, 'row': 1, 'col': 2, 'length': 150.0},
+    }
+    swr.connections = [{'reach1': 1, 'reach2': 2, 'type': 1}]
+    return swr
+
+def test_write_swr_input(tmp_path):
+    swr = mock_swr_package()
+    output_file = tmp_path / 'SWR.dat'
+    write_swr_input(swr, str(output_file))
+    content = output_file.read_text()
+    assert 'BEGIN REACHES' in content
+    assert '  2   1   1   2   150.0\n' in content
+    assert '  1   2   1\n' in content
+
+def test_write_swr_input_columnar(tmp_path):
+    swr = mock_swr_package()
+    swr.reaches = pd.DataFrame({'layer': [1, 1, 2], 'row': [1, 1, 3], 'col': [1, 2, 3], 'length': [100.0, 150.0, 75.0]})
+    swr.connections = np.array([(1, 2, 1), (2, 3, 1)], dtype=[('reach1', 'i4'), ('reach2', 'i4'), ('type', 'i4')])
+    output_file = tmp_path / 'SWR.dat'
+    write_swr_input(swr, str(output_file))
+    content = output_file.read_text()
+    assert '  3   2   3   3   75.0\n' in content
+    assert '  2   3   1\n' in content
+
+def test_write_swr_input_columnar_unknown_reach(tmp_path):
+    swr = mock_swr_package()
+    swr.connections = np.array([(1, 2, 1), (2, 7, 1)], dtype=[('reach1', 'i4'), ('reach2', 'i4'), ('type', 'i4')])
+    with pytest.raises(ValueError, match=r'reach2 not found in reaches in connections\[1\]'):
+        write_swr_input(swr, str(tmp_path / 'SWR.dat'))
+
+def test_write_swr_input_connection_array(tmp_path):
+    swr = mock_swr_package()
+    swr.reaches[3] = {'layer': 2, 'row': 3, 'col': 3, 'length': 75.0}
+    output_file = tmp_path / 'SWR.dat'
+    swr.connections = np.array([[1, 2, 2], [2, 3, 1]])
+    write_swr_input(swr, str(output_file))
+    assert '  1   2   2\n  2   3   1\n' in output_file.read_text()
+    swr.connections = np.array([[1, 2], [2, 3]])
+    write_swr_input(swr, str(output_file))
+    assert '  1   2   1\n  2   3   1\n' in output_file.read_text()
+    swr.connections = np.array([[1, 4]])
+    with pytest.raises(ValueError, match=r'reach2 not found in reaches in connections\[0\]'):
+        write_swr_input(swr, str(output_file))
+    swr.connections = np.array([[1.0, 2.0]])
+    with pytest.raises(ValueError, match='Connection array must be integer'):
+        write_swr_input(swr, str(output_file))
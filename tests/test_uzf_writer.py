@@ -21,4 +21,14 @@ def test_write_uzf_input(tmp_path):
         content = f.read()
     assert 'UZF' in content or 'BEGIN UZF' in content
     assert '0.1' in content
-    assert '0.2' in content 
\ No newline at end of file
+    assert '0.2' in content 
+
+def test_write_uzf_input_streamed_periods(tmp_path):
+    import numpy as np
+    uzf = mock_uzf_package()
+    uzf.stress_period_data = lambda: ((per, np.full((1, 2), 0.5 * (per + 1))) for per in range(2))
+    output_file = tmp_path / 'UZF.dat'
+    write_uzf_input(uzf, str(output_file), array_output='list')
+    with open(output_file, 'r') as f:
+        content = f.read()
+    assert '  1   1   0.5\n  1   2   0.5\n  1   1   1.0\n  1   2   1.0\n' in content
@@ -0,0 +1,65 @@
+import pytest
+import numpy as np
+from flopy_owhm_interface.validation import GridBounds, OWHMValidationError, ValidationIndex
+from flopy_owhm_interface.water_accounting_writer import write_water_accounting_input
+
+def mock_model():
+    class MockModel:
+        pass
+    class MockFmp: farm_dict = {1: {'name': 'Farm1', 'area': 100.0}, 2: {'name': 'Farm2', 'area': 50.0}}
+    class MockLak: lakes = {7: {'layer': 1, 'row': 1, 'col': 1, 'area': 10.0}}
+    m = MockModel()
+    m.fmp = MockFmp()
+    m.lak = MockLak()
+    return m
+
+def test_validation_index_from_model():
+    index = ValidationIndex.from_model(mock_model())
+    assert index.has('farm') and index.has('lake')
+    assert not index.has('reach')
+    assert index.unknown('farm', np.array([1, 3, 2, 4])) == [(1, 3), (3, 4)]
+    assert index.unknown('reach', [99]) == []
+
+def test_water_accounting_reports_all_violations(tmp_path):
+    index = ValidationIndex.from_model(mock_model())
+    accounting = {
+        'FARM': [{'object_id': 1, 'period': 0, 'value': 1.0},
+                 {'object_id': 5, 'period': 0, 'value': 1.0},
+                 {'object_id': 6, 'period': 0, 'value': 1.0}],
+        'LAKE': [{'object_id': 8, 'period': 'x', 'value': 1.0}],
+    }
+    output_file = tmp_path / 'ACCOUNTING.dat'
+    with pytest.raises(OWHMValidationError) as excinfo:
+        write_water_accounting_input(accounting, str(output_file), validation_index=index)
+    assert len(excinfo.value.errors) == 4
+    assert 'FARM[2] refers to unknown farm_id 6' in str(excinfo.value)
+    assert not output_file.exists()
+
+def test_grid_bounds_checks_cell_packages():
+    class MockDis: nlay, nrow, ncol = 1, 3, 3
+    class MockBas: ibound = np.array([[[1, 1, 1], [1, 0, 1], [1, 1, 1]]])
+    class MockGhb:
+        stress_period_data = {0: np.array([(1, 1, 1, 1.0, 1.0), (1, 4, 1, 1.0, 1.0)],
+                                          dtype=[('k', int), ('i', int), ('j', int), ('bhead', float), ('cond', float)])}
+    class MockLak: lakes = {7: {'layer': 1, 'row': 2, 'col': 2, 'area': 10.0}}
+    class MockModel: pass
+    m = MockModel()
+    m.dis, m.bas6, m.ghb, m.lak = MockDis(), MockBas(), MockGhb(), MockLak()
+    grid = GridBounds.from_model(m)
+    assert grid.active.shape == (1, 3, 3)
+    errors = grid.check_model(m)
+    assert errors == ["GHB stress_period_data[0][1]: cell (1, 4, 1) is outside the model grid (nlay=1, nrow=3, ncol=3).",
+                      "LAK lakes[7]: cell (1, 2, 2) is an inactive cell (ibound/idomain is 0)."]
+
+def test_grid_bounds_checks_dict_periods():
+    class MockDis: nlay, nrow, ncol = 1, 2, 2
+    class MockRch: stress_period_data = {0: {'k': 1, 'i': 3, 'j': 1, 'recharge': 0.01},
+                                         1: {'recharge': np.zeros((3, 2))}}
+    class MockModel: pass
+    m = MockModel()
+    m.dis, m.rch = MockDis(), MockRch()
+    errors = GridBounds.from_model(m).check_model(m)
+    assert errors == ["RCH stress_period_data[0][0]: cell (1, 3, 1) is outside the model grid (nlay=1, nrow=2, ncol=2).",
+                      "RCH stress_period_data[1]: grid array shape (3, 2) does not match the model grid "
+                      "(nlay=1, nrow=2, ncol=2)."]
+